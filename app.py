@@ -1,17 +1,33 @@
+from startup import profiler  # pertama, agar impor lainnya ikut terukur
+import csv
+import hashlib
 import sys
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton, QHBoxLayout, QVBoxLayout, 
     QGroupBox, QFormLayout, QComboBox, QFileDialog, QMessageBox, QTableWidget, 
-    QTableWidgetItem, QProgressBar, QFrame, QSplitter, QTabWidget, QScrollArea, QSlider
+    QTableWidgetItem, QProgressBar, QFrame, QSplitter, QTabWidget, QScrollArea, QSlider, QCheckBox, QTableView
 )
 from PyQt5.QtCore import Qt
+profiler.mark("impor Qt")
 from fuzzy_engine import FuzzyFloodEngine
+from result_cache import ResultCache
+from instrumentation import EngineInstrumentation
+from history import EvaluationHistory
+from engine_config import load_engine, uses_default_variables
+from status import FLOOD_LEVELS, flood_status, depth_status
 from ui.styles import STYLESHEET
-from ui.widgets import PlotCanvas
+from ui.models import RuleTableModel
+from ui.lazy import LazyTab
+from ui.workers import InferenceTask, UncertaintyTask
+from uncertainty import NoiseModel
+from engine_config import default_cache_dir
 import os
+profiler.mark("impor modul aplikasi")
 
 VERSION = "1.2.0"
+UNCERTAINTY_SAMPLES = 200000
+UNCERTAINTY_LEVEL = 0.9
 
 def resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller bundle."""
@@ -22,13 +38,59 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 class MainWindow(QWidget):
-    def __init__(self):
+    startup_finished = QtCore.pyqtSignal()
+
+    def __init__(self, config_path=None, cache_size=0):
         super().__init__()
         self.setWindowTitle(f"Sistem Deteksi Banjir Fuzzy v{VERSION} - Muhammad Iqbal Ramadhan (231011400285)")
         self.setMinimumSize(1200, 800)
         self.setStyleSheet(STYLESHEET)
-        self.engine = FuzzyFloodEngine()
+        self.instrumentation = EngineInstrumentation()  # dipakai bersama engine hasil hot reload
+        # Cache hasil hanya bila diminta (--cache N): kuncinya input terkuantisasi, sehingga nilai yang
+        # tampil bisa berasal dari input tetangga terdekat, bukan input persis yang diketik
+        self.cache_size = cache_size
+        self.engine = FuzzyFloodEngine(cache=self._new_cache(), instrumentation=self.instrumentation)
+        self.has_result = False
+        self.history = EvaluationHistory(self.engine.rules)  # semua perhitungan sesi ini, termasuk mode live
+        profiler.mark("engine")
+
+        # Hot reload konfigurasi engine (JSON)
+        self.config_path = None
+        self.config_watcher = QtCore.QFileSystemWatcher(self)
+        self.config_watcher.fileChanged.connect(self._on_config_changed)
+        self.config_watcher.directoryChanged.connect(self._on_config_changed)
+        self.reload_timer = QtCore.QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(300)  # tunggu editor selesai menulis file
+        self.reload_timer.timeout.connect(self.reload_config)
+
+        # Mode live: input yang berubah dihitung ulang di thread pool setelah jeda singkat (debounce).
+        # Satu thread saja; permintaan yang tersusul token lebih baru dilewati atau hasilnya dibuang.
+        self.live_pool = QtCore.QThreadPool(self)
+        self.live_pool.setMaxThreadCount(1)
+        self.live_token = 0
+        self.live_timer = QtCore.QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(30)
+        self.live_timer.timeout.connect(self._submit_live)
+
+        # Ketidakpastian (Monte Carlo) dihitung di thread terpisah setelah hasil utama tampil.
+        # Engine MC tanpa cache (sampel acak hanya akan membanjiri LRU), dibuat ulang bila engine berganti.
+        self.mc_pool = QtCore.QThreadPool(self)
+        self.mc_pool.setMaxThreadCount(1)
+        self.mc_token = 0
+        self.mc_engine = None
+        self.mc_source = None
+
+        # Grafik dibangun saat tab Visualisasi pertama kali tampil; hasil yang datang lebih dulu disimpan di sini
+        self.plot1 = self.plot2 = None
+        self.pending_plot = None
+        self.started = False
+
         self._build_ui()
+        if config_path:
+            self.watch_config(config_path)
+        profiler.mark("membangun jendela")
 
     def _build_ui(self):
         main_layout = QHBoxLayout(self)
@@ -114,6 +176,26 @@ class MainWindow(QWidget):
         self.du_slider.valueChanged.connect(self._on_du_slider_changed)
         self.du_input.textChanged.connect(self._on_du_input_changed)
 
+        self.live_check = QCheckBox("Mode Live (hitung saat slider digeser)")
+        self.live_check.setChecked(True)
+        layout.addWidget(self.live_check)
+        for widget in (self.cr_slider, self.wl_slider, self.du_slider):
+            widget.valueChanged.connect(self._schedule_live)
+        for widget in (self.cr_input, self.wl_input, self.du_input):
+            widget.textChanged.connect(self._schedule_live)
+
+        self.mc_check = QCheckBox("Ketidakpastian input (Monte Carlo)")
+        self.mc_check.setToolTip(f"{UNCERTAINTY_SAMPLES:,} sampel acak di sekitar input; "
+                                 f"pita {UNCERTAINTY_LEVEL:.0%} tampil di kartu Risiko Banjir")
+        self.mc_check.toggled.connect(self._on_uncertainty_toggled)
+        layout.addWidget(self.mc_check)
+        self.noise_input = QLineEdit("normal:10% normal:0.1 normal:1")
+        self.noise_input.setToolTip("Model noise CR, WL, DU dipisah spasi: none | normal:s | uniform:s | "
+                                    "lognormal:s; akhiran % berarti relatif terhadap nilai input")
+        self.noise_input.setEnabled(False)
+        self.noise_input.editingFinished.connect(self._schedule_uncertainty)
+        layout.addWidget(self.noise_input)
+
         # Buttons
         btn_layout = QVBoxLayout()
         self.btn_calc = QPushButton("HITUNG ANALISIS")
@@ -124,9 +206,29 @@ class MainWindow(QWidget):
         self.btn_export = QPushButton("Ekspor Laporan (CSV)")
         self.btn_export.setCursor(Qt.PointingHandCursor)
         self.btn_export.clicked.connect(self.export_csv)
+
+        self.btn_history = QPushButton("Ekspor Riwayat (CSV/NPZ)")
+        self.btn_history.setCursor(Qt.PointingHandCursor)
+        self.btn_history.clicked.connect(self.export_history)
+
+        self.btn_config = QPushButton("Muat Konfigurasi (JSON)")
+        self.btn_config.setCursor(Qt.PointingHandCursor)
+        self.btn_config.clicked.connect(self.choose_config)
+
+        self.config_label = QLabel("Konfigurasi: bawaan")
+        self.config_label.setWordWrap(True)
+        self.config_label.setStyleSheet("color: #5c5f77; font-size: 11px;")
         
         btn_layout.addWidget(self.btn_calc)
         btn_layout.addWidget(self.btn_export)
+        btn_layout.addWidget(self.btn_history)
+        btn_layout.addWidget(self.btn_config)
+        btn_layout.addWidget(self.config_label)
+
+        self.instr_label = QLabel(self.instrumentation.summary())
+        self.instr_label.setWordWrap(True)
+        self.instr_label.setStyleSheet("color: #5c5f77; font-size: 11px;")
+        btn_layout.addWidget(self.instr_label)
         layout.addLayout(btn_layout)
 
         layout.addStretch()
@@ -139,13 +241,12 @@ class MainWindow(QWidget):
         logo_layout = QHBoxLayout()
         logo_layout.setAlignment(Qt.AlignCenter)
         
+        # Gambar logo dimuat setelah jendela tampil (_load_logos); tinggi dipesan agar tata letak tidak bergeser
         logo_unpam = QLabel()
-        pix_unpam = QtGui.QPixmap(resource_path("logo_unpam.png")).scaledToHeight(50, Qt.SmoothTransformation)
-        logo_unpam.setPixmap(pix_unpam)
-        
+        logo_unpam.setFixedHeight(50)
         logo_ku = QLabel()
-        pix_ku = QtGui.QPixmap(resource_path("logoku.png")).scaledToHeight(50, Qt.SmoothTransformation)
-        logo_ku.setPixmap(pix_ku)
+        logo_ku.setFixedHeight(50)
+        self.logos = [(logo_unpam, "logo_unpam.png"), (logo_ku, "logoku.png")]
         
         logo_layout.addWidget(logo_unpam)
         logo_layout.addSpacing(10)
@@ -184,6 +285,10 @@ class MainWindow(QWidget):
         self.flood_bar.setTextVisible(False)
         self.flood_bar.setStyleSheet("QProgressBar::chunk { background-color: #1e66f5; }")
         self.flood_card.layout().addWidget(self.flood_bar)
+        self.flood_band = QLabel()
+        self.flood_band.setStyleSheet("color: #5c5f77; font-size: 12px;")
+        self.flood_band.setVisible(False)
+        self.flood_card.layout().addWidget(self.flood_band)
         
         # Depth Card
         self.depth_card = self._create_result_card("Kedalaman Air", "N/A", "Menunggu...")
@@ -212,28 +317,115 @@ class MainWindow(QWidget):
         # 3. Tabs for Details (Plots & Rules)
         self.tabs = QTabWidget()
         
-        # Tab 1: Visualizations
-        plot_tab = QWidget()
-        plot_layout = QHBoxLayout(plot_tab)
-        self.plot1 = PlotCanvas(self, width=5, height=3)
-        self.plot2 = PlotCanvas(self, width=5, height=3)
-        plot_layout.addWidget(self.plot1)
-        plot_layout.addWidget(self.plot2)
-        self.tabs.addTab(plot_tab, "Visualisasi")
+        # Tab 1: Visualizations (matplotlib diimpor saat tab pertama kali tampil)
+        self.plot_tab = LazyTab(self._create_plot_tab, armed=False)
+        self.plot_tab.created.connect(self._on_plots_created)
+        self.tabs.addTab(self.plot_tab, "Visualisasi")
 
         # Tab 2: Rule Inference
         rule_tab = QWidget()
         rule_layout = QVBoxLayout(rule_tab)
-        self.rule_table = QTableWidget(0, 4)
-        self.rule_table.setHorizontalHeaderLabels(["ID", "Anteseden (CR, WL, DU)", "Kekuatan Firing", "Konsekuen"])
+        mode_row = QHBoxLayout()
+        mode_row.addWidget(QLabel("Tampilkan:"))
+        self.rule_mode = QComboBox()
+        self.rule_mode.addItems(["Rule aktif", "Semua rule (matriks firing)", "Akumulasi evaluasi"])
+        self.rule_mode.currentIndexChanged.connect(
+            lambda i: self.rule_model.set_mode(RuleTableModel.MODES[i]))
+        mode_row.addWidget(self.rule_mode)
+        self.btn_clear_rules = QPushButton("Bersihkan")
+        self.btn_clear_rules.setCursor(Qt.PointingHandCursor)
+        self.btn_clear_rules.clicked.connect(lambda: self.rule_model.clear())
+        mode_row.addWidget(self.btn_clear_rules)
+        mode_row.addStretch()
+        rule_layout.addLayout(mode_row)
+
+        self.rule_model = RuleTableModel(self)
+        self.rule_table = QTableView()
+        self.rule_table.setModel(self.rule_model)
+        self.rule_table.verticalHeader().setVisible(False)
+        self.rule_table.verticalHeader().setDefaultSectionSize(24)  # tinggi tetap, tanpa ukur isi tiap baris
         self.rule_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Stretch)
         rule_layout.addWidget(self.rule_table)
         self.tabs.addTab(rule_tab, "Mesin Inferensi Aturan")
 
+        # Tab 3: Control surface & sensitivity
+        self.surface_tab = LazyTab(self._create_surface_tab, armed=False)
+        self.tabs.addTab(self.surface_tab, "Permukaan Kontrol")
+
         layout.addWidget(self.tabs, 1)
 
         return container
 
+    def _create_plot_tab(self):
+        from ui.widgets import PlotCanvas
+        tab = QWidget()
+        plot_layout = QHBoxLayout(tab)
+        plot_layout.setContentsMargins(0, 0, 0, 0)
+        self.plot1 = PlotCanvas(tab, width=5, height=3)
+        self.plot2 = PlotCanvas(tab, width=5, height=3)
+        plot_layout.addWidget(self.plot1)
+        plot_layout.addWidget(self.plot2)
+        return tab
+
+    def _create_surface_tab(self):
+        from ui.explorer import SurfaceExplorer
+        return SurfaceExplorer(lambda: self.engine)
+
+    def _on_plots_created(self, _tab):
+        if self.pending_plot is not None:
+            self._update_plots(self.pending_plot)
+            self.pending_plot = None
+        if not self.started:
+            profiler.mark("grafik Visualisasi")
+            self._end_startup()
+
+    # Startup: jendela tergambar dulu; logo, grafik dan laporan fase start menyusul di event loop
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if profiler.elapsed("jendela tergambar") is None:
+            profiler.mark("jendela tergambar")
+            QtCore.QTimer.singleShot(0, self._after_first_paint)
+
+    def _after_first_paint(self):
+        self._load_logos()
+        profiler.mark("logo")
+        for tab in (self.plot_tab, self.surface_tab):
+            tab.arm()
+        if self.plot_tab.widget is None and not self.plot_tab.isVisible():
+            self._end_startup()  # tab Visualisasi tidak aktif; grafik dibangun saat dibuka
+
+    def _end_startup(self):
+        self.started = True
+        profiler.write(os.path.join(default_cache_dir(), "startup.log"))
+        self.startup_finished.emit()
+
+    def _load_logos(self):
+        for label, name in self.logos:
+            label.setPixmap(self._logo_pixmap(name, label.height()))
+
+    @staticmethod
+    def _logo_pixmap(name, height):
+        """
+        Logo yang sudah diperkecil, disimpan di direktori cache berdasarkan hash isi file:
+        logoku.png berukuran ribuan piksel dan decode-nya saja memakan ratusan ms.
+        """
+        src = resource_path(name)
+        try:
+            with open(src, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()[:12]
+        except OSError:
+            return QtGui.QPixmap()
+        cached = os.path.join(default_cache_dir(), f"logo-{digest}-{height}.png")
+        pix = QtGui.QPixmap(cached)
+        if pix.isNull():
+            pix = QtGui.QPixmap(src).scaledToHeight(height, Qt.SmoothTransformation)
+            try:
+                os.makedirs(os.path.dirname(cached), exist_ok=True)
+                pix.save(cached)
+            except OSError:
+                pass  # cache hanya optimasi
+        return pix
+
     def _create_result_card(self, title, value, status):
         frame = QFrame()
         frame.setStyleSheet("""
@@ -329,19 +521,49 @@ class MainWindow(QWidget):
         except ValueError:
             pass
 
+    def _read_inputs(self):
+        return float(self.cr_input.text()), float(self.wl_input.text()), float(self.du_input.text())
+
     def calculate(self):
         try:
-            cr = float(self.cr_input.text())
-            wl = float(self.wl_input.text())
-            du = float(self.du_input.text())
+            cr, wl, du = self._read_inputs()
         except ValueError:
             QMessageBox.warning(self, "Kesalahan Input", "Harap masukkan nilai numerik yang valid.")
             return
 
+        self.live_token += 1  # hasil live yang masih berjalan tidak boleh menimpa hasil ini
         # Fuzzy Computation
-        mu_cr, mu_wl, mu_du = self.engine.fuzzify_sample(cr, wl, du)
-        active = self.engine.evaluate_rules(mu_cr, mu_wl, mu_du)
-        agg = self.engine.aggregate_and_defuzz(active)
+        self._apply_result((cr, wl, du), self.engine.infer(cr, wl, du))
+
+    # Live mode (background worker)
+    def _schedule_live(self, *_):
+        if self.live_check.isChecked():
+            self.live_timer.start()
+
+    def _submit_live(self):
+        try:
+            inputs = self._read_inputs()
+        except ValueError:
+            return  # teks sedang diketik, tunggu sampai valid
+        self.live_token += 1
+        task = InferenceTask(self.live_token, self.engine, inputs, lambda: self.live_token)
+        task.signals.finished.connect(self._on_live_result)
+        task.signals.failed.connect(self._on_live_failed)
+        self.live_pool.start(task)
+
+    def _on_live_result(self, token, inputs, agg):
+        if token == self.live_token:
+            self._apply_result(inputs, agg)
+
+    def _on_live_failed(self, token, message):
+        if token == self.live_token:
+            self.rec_label.setText(f"Perhitungan gagal: {message}")
+
+    def _apply_result(self, inputs, agg):
+        if self.history.rules != self.engine.rules:
+            self.history.reset(self.engine.rules)  # kolom firing mengikuti rule base yang baru
+        self.history.record_result(inputs, agg)
+        active = agg["active"]
         
         flood_val = agg["flood_val"]
         depth_val = agg["depth_val"]
@@ -350,6 +572,111 @@ class MainWindow(QWidget):
         self._update_results(flood_val, depth_val)
         self._update_plots(agg)
         self._update_rules(active)
+        self.instr_label.setText(self.instrumentation.summary())
+        self.has_result = True
+        self._schedule_uncertainty()
+
+    # Monte Carlo uncertainty band (background worker)
+    def _on_uncertainty_toggled(self, checked):
+        self.noise_input.setEnabled(checked)
+        self.flood_band.setVisible(checked)
+        if checked:
+            self._schedule_uncertainty()
+        else:
+            self.mc_token += 1  # tugas yang masih berjalan berhenti di blok berikutnya
+
+    def _schedule_uncertainty(self):
+        if not self.mc_check.isChecked() or not self.has_result:
+            return
+        try:
+            inputs = self._read_inputs()
+            noise = [NoiseModel.parse(s) for s in self.noise_input.text().split()]
+            if len(noise) != len(inputs):
+                raise ValueError("Isi tiga model noise: CR, WL, DU")
+        except ValueError as e:
+            self.flood_band.setText(f"Ketidakpastian: {e}")
+            return
+        if self.mc_source is not self.engine:
+            # centroid grid diganti centroid eksak (analytic) yang ~3x lebih cepat untuk jutaan sampel
+            defuzz = "analytic" if self.engine.defuzz == "centroid" else self.engine.defuzz
+            self.mc_engine = FuzzyFloodEngine(defuzz=defuzz, config=self.engine.to_config())
+            self.mc_source = self.engine
+        self.mc_token += 1
+        self.flood_band.setText("Ketidakpastian: menghitung...")
+        task = UncertaintyTask(self.mc_token, self.mc_engine, inputs, noise, UNCERTAINTY_SAMPLES,
+                               lambda: self.mc_token)
+        task.signals.finished.connect(self._on_uncertainty_result)
+        task.signals.failed.connect(self._on_uncertainty_failed)
+        self.mc_pool.start(task)
+
+    def _on_uncertainty_result(self, token, result):
+        if token != self.mc_token:
+            return
+        band = result.band("flood_val", UNCERTAINTY_LEVEL)
+        if band is None:
+            self.flood_band.setText("Ketidakpastian: tidak ada sampel dengan rule aktif")
+            return
+        limit = FLOOD_LEVELS[1][0]
+        p = result.exceedance("flood_val", limit)
+        self.flood_band.setText(f"Pita {UNCERTAINTY_LEVEL:.0%}: {band[0]:.2f} – {band[1]:.2f} · "
+                                f"P(≥{limit:g}) {p:.1%}")
+
+    def _on_uncertainty_failed(self, token, message):
+        if token == self.mc_token:
+            self.flood_band.setText(f"Ketidakpastian gagal: {message}")
+
+    # Engine configuration (JSON) with hot reload
+    def choose_config(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Muat Konfigurasi Engine", os.getcwd(), "File JSON (*.json)")
+        if path:
+            self.watch_config(path)
+
+    def watch_config(self, path):
+        path = os.path.abspath(path)
+        if self.config_watcher.files():
+            self.config_watcher.removePaths(self.config_watcher.files())
+        if self.config_watcher.directories():
+            self.config_watcher.removePaths(self.config_watcher.directories())
+        self.config_path = path
+        # Direktori juga dipantau karena editor sering mengganti file (hapus + tulis ulang)
+        self.config_watcher.addPath(os.path.dirname(path))
+        if os.path.exists(path):
+            self.config_watcher.addPath(path)
+        self.reload_config()
+
+    def _on_config_changed(self, _path):
+        if self.config_path:
+            self.reload_timer.start()
+
+    def _new_cache(self):
+        return ResultCache(max_size=self.cache_size) if self.cache_size > 0 else None
+
+    def reload_config(self):
+        if not self.config_path or not os.path.exists(self.config_path):
+            return
+        if self.config_path not in self.config_watcher.files():
+            self.config_watcher.addPath(self.config_path)
+
+        stamp = QtCore.QTime.currentTime().toString("HH:mm:ss")
+        name = os.path.basename(self.config_path)
+        try:
+            engine = load_engine(self.config_path, cache=self._new_cache(),
+                                 instrumentation=self.instrumentation)
+            if not uses_default_variables(engine.to_config()):
+                raise ValueError("GUI membutuhkan input CR, WL, DU dan output Flood, Depth")
+        except (OSError, ValueError) as e:
+            # Engine lama tetap dipakai sampai file valid kembali
+            self.config_label.setText(f"Konfigurasi {name} tidak valid ({stamp}): {e}")
+            self.config_label.setStyleSheet("color: #d20f39; font-size: 11px;")
+            return
+        self.config_label.setText(f"Konfigurasi: {name} (dimuat {stamp})")
+        self.config_label.setStyleSheet("color: #5c5f77; font-size: 11px;")
+        if engine.signature() == self.engine.signature():
+            return
+
+        self.engine = engine  # penggantian referensi tunggal, atomik bagi pemanggil berikutnya
+        if self.has_result:
+            self.calculate()
 
     def _update_results(self, flood_val, depth_val):
         # Flood
@@ -383,16 +710,10 @@ class MainWindow(QWidget):
         self.rec_label.setText(rec_text)
 
     def _get_flood_status(self, val):
-        if val is None: return "Tidak Diketahui", "#9ca0b0"
-        if val < 30: return "AMAN", "#40a02b" # Green
-        if val < 60: return "WASPADA", "#df8e1d" # Yellow
-        return "BAHAYA", "#d20f39" # Red
+        return flood_status(val)
 
     def _get_depth_status(self, val):
-        if val is None: return "Tidak Diketahui", "#9ca0b0"
-        if val < 1.0: return "RENDAH", "#40a02b"
-        if val < 2.0: return "SEDANG", "#df8e1d"
-        return "TINGGI", "#d20f39"
+        return depth_status(val)
 
     def _recommendation(self, flood_val, depth_val):
         if flood_val is None: return "Data tidak mencukupi."
@@ -403,74 +724,83 @@ class MainWindow(QWidget):
         return "🚨 BAHAYA BANJIR! Segera lakukan evakuasi ke tempat tinggi. Matikan aliran listrik dan ikuti arahan petugas."
 
     def _update_plots(self, agg):
-        # Plot Flood
-        ax1 = self.plot1.axes
-        ax1.clear()
-        ax1.set_title("Agregasi Risiko Banjir", color='#4c4f69')
-        ax1.plot(self.engine.x_flood, agg["agg_flood"], label="Teragregasi", color='#d20f39', linewidth=2)
-        for k, v in self.engine.flood_mfs.items():
-            ax1.plot(self.engine.x_flood, v, '--', alpha=0.3, label=k)
-        
-        if agg["flood_val"] is not None:
-            ax1.axvline(x=agg["flood_val"], color='#40a02b', linestyle='-', linewidth=2, label='Hasil')
-            
-        ax1.legend(loc='upper center', bbox_to_anchor=(0.5, -0.12), ncol=3, fontsize='small', facecolor='#e6e9ef', edgecolor='#bcc0cc')
-        self.plot1.figure.tight_layout()
-        self.plot1.draw()
-
-        # Plot Depth
-        ax2 = self.plot2.axes
-        ax2.clear()
-        ax2.set_title("Agregasi Kedalaman Air", color='#4c4f69')
-        ax2.plot(self.engine.x_depth, agg["agg_depth"], label="Teragregasi", color='#1e66f5', linewidth=2)
-        for k, v in self.engine.depth_mfs.items():
-            ax2.plot(self.engine.x_depth, v, '--', alpha=0.3, label=k)
-            
-        if agg["depth_val"] is not None:
-            ax2.axvline(x=agg["depth_val"], color='#40a02b', linestyle='-', linewidth=2, label='Hasil')
-            
-        ax2.legend(loc='upper center', bbox_to_anchor=(0.5, -0.12), ncol=3, fontsize='small', facecolor='#e6e9ef', edgecolor='#bcc0cc')
-        self.plot2.figure.tight_layout()
-        self.plot2.draw()
+        if self.plot1 is None:
+            self.pending_plot = agg  # digambar saat tab Visualisasi dibangun
+            return
+        # Kurva MF statis hanya digambar ulang bila engine berganti; update cukup blit agregasi dan hasil
+        self.plot1.set_static("Agregasi Risiko Banjir", self.engine.x_flood, self.engine.flood_mfs, '#d20f39')
+        self.plot1.update_result(agg["agg_flood"], agg["flood_val"])
+
+        self.plot2.set_static("Agregasi Kedalaman Air", self.engine.x_depth, self.engine.depth_mfs, '#1e66f5')
+        self.plot2.update_result(agg["agg_depth"], agg["depth_val"])
 
     def _update_rules(self, active):
-        self.rule_table.setRowCount(0)
-        for r in active:
-            row = self.rule_table.rowCount()
-            self.rule_table.insertRow(row)
-            
-            ant = f"CH:{r['antecedent'][0]}, KA:{r['antecedent'][1]}, DR:{r['antecedent'][2]}"
-            cons = f"Banjir:{r['flood']} / Kedalaman:{r['depth']}"
-            
-            self.rule_table.setItem(row, 0, QTableWidgetItem(str(r['id'])))
-            self.rule_table.setItem(row, 1, QTableWidgetItem(ant))
-            self.rule_table.setItem(row, 2, QTableWidgetItem(f"{r['firing']:.3f}"))
-            self.rule_table.setItem(row, 3, QTableWidgetItem(cons))
+        self.rule_model.set_rules(self.engine.rules)
+        self.rule_model.add_evaluation(active)
+
+    def closeEvent(self, event):
+        self.live_timer.stop()
+        self.live_token += 1
+        self.live_pool.clear()
+        self.live_pool.waitForDone(2000)
+        self.mc_token += 1
+        self.mc_pool.clear()
+        self.mc_pool.waitForDone(2000)
+        super().closeEvent(event)
 
     def export_csv(self):
         path, _ = QFileDialog.getSaveFileName(self, "Simpan Analisis", os.getcwd(), "File CSV (*.csv)")
         if not path: return
         
         try:
-            with open(path, "w") as f:
-                f.write("ID,Antecedent,Firing,Consequent\n")
-                for r in range(self.rule_table.rowCount()):
-                    rid = self.rule_table.item(r, 0).text()
-                    ant = self.rule_table.item(r, 1).text()
-                    firing = self.rule_table.item(r, 2).text()
-                    cons = self.rule_table.item(r, 3).text()
-                    f.write(f"{rid},{ant},{firing},{cons}\n")
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(self.rule_model.export_headers())
+                writer.writerows(
+                    [f"{v:.3f}" if isinstance(v, float) else v for v in row]
+                    for row in self.rule_model.rows()
+                )
             QMessageBox.information(self, "Berhasil", f"Data tersimpan di {path}")
         except Exception as e:
             QMessageBox.critical(self, "Kesalahan", str(e))
 
+    def export_history(self):
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Simpan Riwayat", os.getcwd(), "File CSV (*.csv);;NumPy terkompresi (*.npz)")
+        if not path: return
+
+        try:
+            if path.endswith(".npz") or (selected.startswith("NumPy") and not path.endswith(".csv")):
+                n = self.history.export_npz(path)
+            else:
+                n = self.history.export_csv(path)
+            QMessageBox.information(self, "Berhasil", f"{n} evaluasi tersimpan di {path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Kesalahan", str(e))
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
+    profiler.mark("QApplication")
     
     # Set global font
     font = QtGui.QFont("Segoe UI", 10)
     app.setFont(font)
     
-    w = MainWindow()
+    # Opsional: python app.py --config basin.json
+    config_path = None
+    if "--config" in sys.argv[1:-1]:
+        config_path = sys.argv[sys.argv.index("--config") + 1]
+
+    # Opsional: --cache N mengaktifkan cache LRU hasil (input dibulatkan, lihat result_cache.py)
+    cache_size = 0
+    if "--cache" in sys.argv[1:-1]:
+        cache_size = int(sys.argv[sys.argv.index("--cache") + 1])
+
+    # Opsional: --startup-report mencetak fase start, --quit-after-startup keluar setelahnya (pengukuran)
+    w = MainWindow(config_path, cache_size)
+    if "--startup-report" in sys.argv[1:]:
+        w.startup_finished.connect(lambda: print(profiler.summary()))
+    if "--quit-after-startup" in sys.argv[1:]:
+        w.startup_finished.connect(app.quit)
     w.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""
+Benchmark engine dan jalur update GUI, dengan baseline tersimpan dan gerbang regresi.
+
+Contoh:
+    python benchmark.py run --output hasil.json
+    python benchmark.py compare benchmarks/baseline.json hasil.json --tolerance 0.25
+    python benchmark.py run --compare benchmarks/baseline.json      # run + compare sekaligus
+    python benchmark.py run --output benchmarks/baseline.json       # perbarui baseline
+
+Setiap putaran benchmark diselingi putaran kerja referensi (loop Python murni dan sort NumPy); compare
+memakai median rasio benchmark/referensi, sehingga perbedaan kecepatan mesin dan gangguan selama run
+sebagian besar tertutup. Sidik host (CPU, jumlah core, versi Python/NumPy) yang berbeda dari baseline hanya
+menghasilkan peringatan, kecuali dengan --strict; untuk gerbang yang ketat, buat baseline di host CI.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# Input dengan 8 rule aktif (dua label aktif per variabel), kasus terberat jalur skalar
+SAMPLE = (73.0, 1.55, 5.5)
+
+
+def _loops(func: Callable[[], object], target: float) -> int:
+    """Jumlah pemanggilan agar satu putaran berlangsung minimal `target` detik."""
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - t0 >= target or number >= 1 << 20:
+            return number
+        number *= 2
+
+
+def _timed(func: Callable[[], object], number: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - t0) / number
+
+
+def _reference() -> Callable[[], None]:
+    """Unit kerja referensi: loop Python murni ditambah sort NumPy, mewakili kedua jenis beban engine."""
+    data = np.random.default_rng(0).random(20000)
+
+    def reference():
+        total = 0
+        for i in range(2000):
+            total += i * i
+        np.sort(data)
+
+    return reference
+
+
+def measure(func: Callable[[], object], min_time: float = 1.0, repeat: int = 9,
+            reference: Optional[Callable[[], object]] = None) -> Tuple[float, Optional[float]]:
+    """
+    Detik per pemanggilan `func` sebagai median dari `repeat` putaran (satu putaran >= min_time / repeat).
+    Bila `reference` diberikan, setiap putaran diikuti satu putaran referensi dan dikembalikan juga median
+    rasio func/referensi; rasio dari putaran yang berdampingan ini tidak terpengaruh host yang melambat
+    atau bertambah cepat selama run. GC dimatikan selama pengukuran seperti timeit.
+    """
+    target = min_time / repeat
+    gc_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        number = _loops(func, target)
+        ref_number = _loops(reference, target) if reference else 0
+        times, ratios = [], []
+        for _ in range(repeat):
+            sec = _timed(func, number)
+            times.append(sec)
+            if reference:
+                ratios.append(sec / _timed(reference, ref_number))
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return float(np.median(times)), (float(np.median(ratios)) if reference else None)
+
+
+def host_fingerprint() -> Dict[str, object]:
+    """Ciri host yang memengaruhi waktu absolut; baseline dari host lain hanya sebanding secara kasar."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu = next((line.split(":", 1)[1].strip() for line in f if line.startswith("model name")), cpu)
+    except OSError:
+        pass
+    return {
+        "machine": platform.machine(),
+        "cpu": cpu,
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def engine_benchmarks(batch_size: int) -> Dict[str, Callable[[], object]]:
+    engine = FuzzyFloodEngine()
+    analytic = FuzzyFloodEngine(defuzz="analytic")
+    memberships = engine.fuzzify_sample(*SAMPLE)
+    active = engine.evaluate_rules(*memberships)
+    params = engine.CR_params["sedang"]
+
+    rng = np.random.default_rng(0)
+    cr = rng.uniform(0, 300, batch_size)
+    wl = rng.uniform(0, 5, batch_size)
+    du = rng.uniform(0, 24, batch_size)
+
+    def single():
+        m = engine.fuzzify_sample(*SAMPLE)
+        engine.aggregate_and_defuzz(engine.evaluate_rules(*m))
+
+    return {
+        "scalar_trapmf": lambda: engine.scalar_trapmf(SAMPLE[0], params),
+        "trapmf": lambda: engine.trapmf(engine.x_flood, engine.Flood_params["Waspada"]),
+        "fuzzify_sample": lambda: engine.fuzzify_sample(*SAMPLE),
+        "evaluate_rules": lambda: engine.evaluate_rules(*memberships),
+        "aggregate_and_defuzz": lambda: engine.aggregate_and_defuzz(active),
+        "end_to_end_single": single,
+        "batch_centroid": lambda: engine.infer_batch(cr, wl, du),
+        "batch_analytic": lambda: analytic.infer_batch(cr, wl, du),
+    }
+
+
+def gui_benchmarks() -> Dict[str, Callable[[], object]]:
+    """Jalur update GUI di platform Qt offscreen; kosong bila PyQt5/matplotlib tidak tersedia."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt5.QtWidgets import QApplication
+        import app as gui
+    except ImportError as e:
+        print(f"Benchmark GUI dilewati: {e}", file=sys.stderr)
+        return {}
+
+    qapp = QApplication.instance() or QApplication(sys.argv)
+    window = gui.MainWindow()
+    window.resize(1200, 800)
+    window.show()
+    window.tabs.setCurrentIndex(0)
+    window.plot_tab.ensure()  # grafik dibangun lazy saat tab pertama kali tampil
+    result = window.engine.infer(*SAMPLE)
+    qapp.processEvents()
+
+    return {
+        "gui_update_results": lambda: window._update_results(result["flood_val"], result["depth_val"]),
+        "gui_update_plots": lambda: window._update_plots(result),
+        "gui_update_rules": lambda: window._update_rules(result["active"]),
+        "_keepalive": lambda: (qapp, window),  # jangan sampai window di-garbage-collect
+    }
+
+
+def run(include_gui: bool = True, batch_size: int = 20000, min_time: float = 1.0,
+        only: Optional[List[str]] = None) -> Dict:
+    benches = engine_benchmarks(batch_size)
+    if include_gui:
+        benches.update(gui_benchmarks())
+
+    reference = _reference()
+    results = {}
+    for name, func in benches.items():
+        if name.startswith("_") or (only and not any(o in name for o in only)):
+            continue
+        sec, relative = measure(func, min_time, reference=reference)
+        entry = {"seconds_per_op": sec, "ops_per_s": 1.0 / sec, "relative": relative}
+        if name.startswith("batch_"):
+            entry["samples_per_s"] = batch_size / sec
+        results[name] = entry
+        print(f"{name:<24} {sec * 1e6:>12.2f} us/op", file=sys.stderr)
+    calibration, _ = measure(reference, min_time)
+    print(f"{'_reference':<24} {calibration * 1e6:>12.2f} us/op", file=sys.stderr)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "batch_size": batch_size,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "calibration": calibration,
+            "host": host_fingerprint(),
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: Dict, current: Dict, tolerance: float) -> List[Dict]:
+    """
+    Membandingkan detik per operasi; rasio di atas 1 + tolerance dianggap regresi.
+    Bila kedua hasil memiliki waktu relatif terhadap referensi, rasio dihitung dari waktu relatif itu;
+    jika hanya kalibrasi global yang ada, waktu dibagi kalibrasi masing-masing.
+    """
+    base_cal = baseline.get("meta", {}).get("calibration")
+    cur_cal = current.get("meta", {}).get("calibration")
+    scale = base_cal / cur_cal if base_cal and cur_cal else 1.0
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        if base.get("relative") and cur.get("relative"):
+            ratio = cur["relative"] / base["relative"]
+        else:
+            ratio = cur["seconds_per_op"] / base["seconds_per_op"] * scale
+        rows.append({
+            "name": name,
+            "baseline": base["seconds_per_op"],
+            "current": cur["seconds_per_op"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + tolerance,
+        })
+    return rows
+
+
+def host_mismatch(baseline: Dict, current: Dict) -> List[str]:
+    """Field sidik host yang berbeda; baseline lama tanpa sidik selalu dianggap berbeda."""
+    base = baseline.get("meta", {}).get("host")
+    cur = current.get("meta", {}).get("host") or host_fingerprint()
+    if base is None:
+        return ["host"]
+    return [k for k in cur if base.get(k) != cur[k]]
+
+
+def print_comparison(rows: List[Dict], tolerance: float, baseline: Dict, current: Dict,
+                     strict: bool = False) -> bool:
+    """Mencetak tabel; mengembalikan False bila ada regresi yang harus menggagalkan gerbang."""
+    if not (baseline.get("meta", {}).get("calibration") and current.get("meta", {}).get("calibration")):
+        print("Peringatan: kalibrasi tidak tersedia, waktu absolut dibandingkan apa adanya.")
+    print(f"{'benchmark':<24} {'baseline':>12} {'sekarang':>12} {'rasio':>7}")
+    for r in rows:
+        flag = "  REGRESI" if r["regression"] else ""
+        print(f"{r['name']:<24} {r['baseline'] * 1e6:>10.2f}us {r['current'] * 1e6:>10.2f}us "
+              f"{r['ratio']:>7.2f}{flag}")
+    failed = [r["name"] for r in rows if r["regression"]]
+    if failed:
+        print(f"\n{len(failed)} benchmark lebih lambat dari toleransi {tolerance:.0%}: {', '.join(failed)}")
+    else:
+        print(f"\nTidak ada regresi (toleransi {tolerance:.0%}).")
+    mismatch = host_mismatch(baseline, current)
+    if failed and mismatch and not strict:
+        print(f"Peringatan: baseline dibuat di host lain (beda: {', '.join(mismatch)}); regresi tidak "
+              f"menggagalkan gerbang. Buat ulang baseline di host ini atau pakai --strict.")
+        return True
+    return not failed
+
+
+def _load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FuzzyFloodEngine dan GUI.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_run = sub.add_parser("run")
+    p_run.add_argument("--output", help="tulis hasil ke file JSON")
+    p_run.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, metavar="BASELINE",
+                       help=f"bandingkan dengan baseline (default: {os.path.relpath(DEFAULT_BASELINE)})")
+    p_run.add_argument("--tolerance", type=float, default=0.25)
+    p_run.add_argument("--strict", action="store_true", help="gagal juga bila host berbeda dari baseline")
+    p_run.add_argument("--no-gui", action="store_true", help="lewati benchmark GUI")
+    p_run.add_argument("--batch-size", type=int, default=20000)
+    p_run.add_argument("--min-time", type=float, default=1.0, help="detik pengukuran minimum per benchmark")
+    p_run.add_argument("--only", nargs="*", help="hanya benchmark yang namanya memuat salah satu teks ini")
+
+    p_cmp = sub.add_parser("compare")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--tolerance", type=float, default=0.25)
+    p_cmp.add_argument("--strict", action="store_true", help="gagal juga bila host berbeda dari baseline")
+
+    args = parser.parse_args(argv)
+    if args.cmd == "run":
+        current = run(not args.no_gui, args.batch_size, args.min_time, args.only)
+        if args.output:
+            os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+            with open(args.output, "w") as f:
+                json.dump(current, f, indent=2)
+        if args.compare:
+            baseline = _load(args.compare)
+            ok = print_comparison(compare(baseline, current, args.tolerance), args.tolerance,
+                                  baseline, current, args.strict)
+            return 0 if ok else 1
+        return 0
+
+    baseline, current = _load(args.baseline), _load(args.current)
+    ok = print_comparison(compare(baseline, current, args.tolerance), args.tolerance,
+                          baseline, current, args.strict)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,25 @@
+import argparse
 import os
 import subprocess
 import sys
 import platform
 
+# Modul yang tidak dipakai GUI; dikeluarkan pada profil onedir agar bundle lebih kecil dan start lebih cepat
+EXCLUDES = [
+    "tkinter", "pydoc", "doctest", "lib2to3", "pdb",  # unittest tetap: dipakai pyparsing (matplotlib)
+    "IPython", "jupyter_client", "notebook", "pandas", "scipy",
+    "matplotlib.backends.backend_tkagg", "matplotlib.backends.backend_tkcairo",
+    "matplotlib.backends.backend_gtk3agg", "matplotlib.backends.backend_gtk4agg",
+    "matplotlib.backends.backend_wxagg", "matplotlib.backends.backend_webagg",
+    "PyQt5.QtWebEngineWidgets", "PyQt5.QtWebEngineCore", "PyQt5.QtWebEngine",
+    "PyQt5.QtQml", "PyQt5.QtQuick", "PyQt5.QtMultimedia", "PyQt5.QtBluetooth",
+    "PyQt5.QtSql", "PyQt5.QtTest", "PyQt5.QtDesigner", "PyQt5.QtNetwork",
+]
+
+# onefile: satu executable, tetapi diekstrak ke folder sementara setiap kali dijalankan.
+# onedir: folder berisi executable dan pustaka, tanpa ekstraksi dan tanpa UPX -> start jauh lebih cepat.
+PROFILES = ("onefile", "onedir")
+
 def install_pyinstaller():
     print("Checking for PyInstaller...")
     try:
@@ -12,8 +29,8 @@ def install_pyinstaller():
         print("PyInstaller not found. Installing...")
         subprocess.check_call([sys.executable, "-m", "pip", "install", "pyinstaller"])
 
-def build_linux():
-    print("\n--- Building for Linux ---")
+def build_linux(profile="onefile"):
+    print(f"\n--- Building for Linux ({profile}) ---")
     # Clean previous build
     if os.path.exists("dist"):
         import shutil
@@ -25,24 +42,39 @@ def build_linux():
     cmd = [
         "pyinstaller",
         "--name=FloodDetectionApp",
-        "--onefile",
+        f"--{profile}",
         "--windowed",
         "--add-data=logo_unpam.png:.",
         "--add-data=logoku.png:.",
         "--add-data=ui:ui",  # Include ui package if needed, though imports usually handle it
-        "app.py"
     ]
+    if profile == "onedir":
+        cmd += ["--noupx"] + [f"--exclude-module={m}" for m in EXCLUDES]
+    cmd.append("app.py")
     
     # On Linux, separator is :
     # On Windows, separator is ;
     
     print(f"Running command: {' '.join(cmd)}")
     subprocess.check_call(cmd)
-    print("Linux build complete. Executable is in dist/FloodDetectionApp")
+    location = "dist/FloodDetectionApp/FloodDetectionApp" if profile == "onedir" else "dist/FloodDetectionApp"
+    print(f"Linux build complete. Executable is in {location}")
 
-def create_windows_spec():
-    print("\n--- Creating Windows Spec File ---")
-    spec_content = r"""# -*- mode: python ; coding: utf-8 -*-
+def create_windows_spec(profile="onefile"):
+    print(f"\n--- Creating Windows Spec File ({profile}) ---")
+    if profile == "onedir":
+        path = "FloodDetectionApp_Windows_onedir.spec"
+        spec_content = ONEDIR_SPEC.replace("EXCLUDES", repr(EXCLUDES))
+    else:
+        path = "FloodDetectionApp_Windows.spec"
+        spec_content = ONEFILE_SPEC
+    with open(path, "w") as f:
+        f.write(spec_content)
+
+    print(f"Windows spec file created: {path}")
+    print(f"To build on Windows, run: pyinstaller {path}")
+
+ONEFILE_SPEC = r"""# -*- mode: python ; coding: utf-8 -*-
 
 block_cipher = None
 
@@ -85,20 +117,70 @@ exe = EXE(
     entitlements_file=None,
 )
 """
-    with open("FloodDetectionApp_Windows.spec", "w") as f:
-        f.write(spec_content)
-    
-    print("Windows spec file created: FloodDetectionApp_Windows.spec")
-    print("To build on Windows, run: pyinstaller FloodDetectionApp_Windows.spec")
+
+ONEDIR_SPEC = r"""# -*- mode: python ; coding: utf-8 -*-
+
+block_cipher = None
+
+a = Analysis(
+    ['app.py'],
+    pathex=[],
+    binaries=[],
+    datas=[('logo_unpam.png', '.'), ('logoku.png', '.'), ('ui', 'ui')],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=EXCLUDES,
+    win_no_prefer_redirects=False,
+    win_private_assemblies=False,
+    cipher=block_cipher,
+    noarchive=False,
+)
+pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='FloodDetectionApp',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.zipfiles,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='FloodDetectionApp',
+)
+"""
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build executable FloodDetectionApp dengan PyInstaller.")
+    parser.add_argument("--profile", choices=PROFILES, default="onefile",
+                        help="onefile (satu file, ekstraksi setiap start) atau onedir (folder, start cepat)")
+    args = parser.parse_args()
+
     install_pyinstaller()
     
     if platform.system() == "Linux":
-        build_linux()
-        create_windows_spec()
+        build_linux(args.profile)
+        create_windows_spec(args.profile)
     elif platform.system() == "Windows":
-        print("Detected Windows. Please run: pyinstaller FloodDetectionApp_Windows.spec")
-        create_windows_spec()
+        spec = "FloodDetectionApp_Windows_onedir.spec" if args.profile == "onedir" else "FloodDetectionApp_Windows.spec"
+        print(f"Detected Windows. Please run: pyinstaller {spec}")
+        create_windows_spec(args.profile)
     else:
         print(f"Unsupported platform: {platform.system()}")
@@ -0,0 +1,200 @@
+"""
+Permukaan kontrol dan sensitivitas: dua input disapu pada grid padat sementara input ketiga tetap.
+
+Keanggotaan input terpisah per sumbu, sehingga untuk pasangan input yang disapu cukup disimpan
+Q[k, l] = max rule (konsekuen k, label input tetap l) dari min(mu_x, mu_y). Mengubah nilai input tetap
+hanya menghitung ulang max_l min(mu_tetap[l], Q[k, l]) dan defuzzifikasi (FuzzyFloodEngine.defuzz_strength).
+
+Contoh:
+    python control_surface.py cr wl --fixed 8 --shape 300 500
+"""
+import argparse
+import sys
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+from surface import DOMAIN
+
+INPUTS = ("cr", "wl", "du")
+OUTPUTS = ("flood", "depth")
+
+
+class ControlSurface:
+    """
+    engine: FuzzyFloodEngine yang dievaluasi.
+    shape: ukuran grid bawaan (titik sumbu y, titik sumbu x).
+    max_results: jumlah hasil sapuan yang disimpan (LRU).
+    """
+
+    def __init__(self, engine: FuzzyFloodEngine, shape: Tuple[int, int] = (300, 500),
+                 domain=DOMAIN, max_results: int = 32):
+        self.engine = engine
+        self.shape = tuple(shape)
+        self.domain = dict(zip(INPUTS, (tuple(d) for d in domain)))
+        self.max_results = max_results
+        self._pairs: Dict[Tuple, Dict[str, np.ndarray]] = {}
+        self._results: "OrderedDict[Tuple, Dict]" = OrderedDict()
+        self.stats = {"pair_builds": 0, "evaluations": 0, "hits": 0}
+
+    def axis(self, name: str, n: int) -> np.ndarray:
+        lo, hi = self.domain[name]
+        return np.linspace(lo, hi, n)
+
+    def _memberships(self, name: str, vals: np.ndarray) -> np.ndarray:
+        params = {"cr": self.engine.CR_params, "wl": self.engine.WL_params, "du": self.engine.DU_params}[name]
+        return np.stack([self.engine.batch_trapmf(vals, p) for p in params.values()], axis=-1)
+
+    def _pair(self, x: str, y: str, nx: int, ny: int) -> Dict[str, np.ndarray]:
+        """Q per output berbentuk (label konsekuen, label input tetap, ny, nx); hanya bergantung pada sumbu."""
+        key = (x, y, nx, ny)
+        pair = self._pairs.get(key)
+        if pair is not None:
+            return pair
+
+        comp = self.engine.compiled_rules()
+        ant = comp.antecedents
+        ix, iy = INPUTS.index(x), INPUTS.index(y)
+        iz = 3 - ix - iy
+        mu_x = self._memberships(x, self.axis(x, nx))  # (nx, Lx)
+        mu_y = self._memberships(y, self.axis(y, ny))  # (ny, Ly)
+        n_fixed = len(comp.cr_labels if iz == 0 else comp.wl_labels if iz == 1 else comp.du_labels)
+
+        pair = {}
+        for out, consequents, n_out in (("flood", comp.flood, len(comp.flood_labels)),
+                                        ("depth", comp.depth, len(comp.depth_labels))):
+            q = np.zeros((n_out, n_fixed, ny, nx))
+            for r in range(ant.shape[0]):
+                k, l = consequents[r], ant[r, iz]
+                np.maximum(q[k, l], np.minimum(mu_y[:, ant[r, iy], None], mu_x[None, :, ant[r, ix]]), out=q[k, l])
+            pair[out] = q
+        pair["fixed"] = INPUTS[iz]
+        self._pairs[key] = pair
+        self.stats["pair_builds"] += 1
+        return pair
+
+    def _evaluate(self, pair: Dict[str, np.ndarray], fixed_value: float) -> Dict[str, np.ndarray]:
+        mu_z = self._memberships(pair["fixed"], np.array([fixed_value]))[0]  # (Lz,)
+        result = {}
+        for out in OUTPUTS:
+            q = pair[out]
+            n_out, _, ny, nx = q.shape
+            strength = np.zeros((ny * nx, n_out))
+            for k in range(n_out):
+                s = np.zeros((ny, nx))
+                for l, h in enumerate(mu_z):
+                    if h > 0:
+                        np.maximum(s, np.minimum(q[k, l], h), out=s)
+                strength[:, k] = s.ravel()
+            result[out] = self.engine.defuzz_strength(out, strength).reshape(ny, nx)
+        self.stats["evaluations"] += 1
+        return result
+
+    def _evaluate_direct(self, x: str, y: str, z: str, nx: int, ny: int, fixed_value: float) -> Dict[str, np.ndarray]:
+        grid_x, grid_y = np.meshgrid(self.axis(x, nx), self.axis(y, ny))
+        values = {x: grid_x, y: grid_y, z: fixed_value}
+        batch = self.engine.infer_batch(values["cr"], values["wl"], values["du"], chunk_size=8192)
+        self.stats["evaluations"] += 1
+        return {"flood": batch["flood_val"], "depth": batch["depth_val"]}
+
+    def sweep(self, x: str, y: str, fixed_value: float, shape: Optional[Tuple[int, int]] = None) -> Dict:
+        """
+        Menyapu input `x` (kolom) dan `y` (baris) pada seluruh domain dengan input ketiga = `fixed_value`.
+        Mengembalikan sumbu, array flood/depth berbentuk (ny, nx) dan nama input tetap.
+        """
+        if x == y or x not in INPUTS or y not in INPUTS:
+            raise ValueError(f"Dua input berbeda dari {INPUTS} diperlukan, didapat {x!r}, {y!r}")
+        ny, nx = shape or self.shape
+        key = (x, y, nx, ny, float(fixed_value))
+        hit = self._results.get(key)
+        if hit is not None:
+            self._results.move_to_end(key)
+            self.stats["hits"] += 1
+            return hit
+
+        if self.engine.defuzz == "sugeno":
+            # Sugeno menjumlahkan firing per label, jadi tabel max Q tidak berlaku: evaluasi langsung
+            z = next(k for k in INPUTS if k not in (x, y))
+            result = self._evaluate_direct(x, y, z, nx, ny, float(fixed_value))
+        else:
+            pair = self._pair(x, y, nx, ny)
+            z = pair["fixed"]
+            result = self._evaluate(pair, float(fixed_value))
+        result.update({
+            "x": self.axis(x, nx), "y": self.axis(y, ny),
+            "x_input": x, "y_input": y,
+            "fixed_input": z, "fixed_value": float(fixed_value),
+        })
+        self._results[key] = result
+        if len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+        return result
+
+    def sensitivity(self, x: str, y: str, fixed_value: float, shape: Optional[Tuple[int, int]] = None,
+                    step: float = 0.01) -> Dict:
+        """
+        Gradien beda hingga setiap output terhadap ketiga input di seluruh grid sapuan.
+        Input tetap didiferensiasi dengan beda pusat selebar `step` x rentang domainnya (satu sisi di tepi).
+        "summary" berisi rata-rata |gradien| x rentang input: perubahan output per satu rentang penuh input.
+        """
+        base = self.sweep(x, y, fixed_value, shape)
+        z = base["fixed_input"]
+        lo, hi = self.domain[z]
+        h = step * (hi - lo)
+        z0, z1 = max(lo, fixed_value - h), min(hi, fixed_value + h)
+        below = self.sweep(x, y, z0, shape) if z0 != fixed_value else base
+        above = self.sweep(x, y, z1, shape) if z1 != fixed_value else base
+
+        grads: Dict[str, Dict[str, np.ndarray]] = {}
+        summary: Dict[str, Dict[str, float]] = {}
+        for out in OUTPUTS:
+            gy, gx = np.gradient(base[out], base["y"], base["x"])
+            gz = (above[out] - below[out]) / (z1 - z0)
+            grads[out] = {x: gx, y: gy, z: gz}
+            summary[out] = {}
+            for name, g in grads[out].items():
+                a, b = self.domain[name]
+                finite = np.abs(g[np.isfinite(g)])
+                summary[out][name] = float(finite.mean() * (b - a)) if finite.size else float("nan")
+        return {"gradients": grads, "summary": summary, "surface": base}
+
+    def clear(self):
+        self._pairs.clear()
+        self._results.clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sapu dua input dan laporkan permukaan kontrol serta sensitivitas.")
+    parser.add_argument("x", choices=INPUTS)
+    parser.add_argument("y", choices=INPUTS)
+    parser.add_argument("--fixed", type=float, required=True, help="nilai input ketiga")
+    parser.add_argument("--shape", type=int, nargs=2, default=[300, 500], metavar=("NY", "NX"))
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+    args = parser.parse_args(argv)
+    if args.x == args.y:
+        parser.error("x dan y harus input yang berbeda")
+
+    explorer = ControlSurface(FuzzyFloodEngine(defuzz=args.defuzz), tuple(args.shape))
+    t0 = time.perf_counter()
+    res = explorer.sweep(args.x, args.y, args.fixed)
+    t1 = time.perf_counter()
+    sens = explorer.sensitivity(args.x, args.y, args.fixed)
+    t2 = time.perf_counter()
+
+    ny, nx = args.shape
+    print(f"Sapuan {args.x} x {args.y} ({ny}x{nx}), {res['fixed_input']} = {args.fixed}: {(t1 - t0) * 1000:.0f} ms; "
+          f"sensitivitas: {(t2 - t1) * 1000:.0f} ms")
+    for out in OUTPUTS:
+        vals = res[out]
+        print(f"{out:<6} min {np.nanmin(vals):8.3f}  max {np.nanmax(vals):8.3f}  "
+              f"tanpa rule aktif {np.isnan(vals).mean():.1%}")
+        print("       sensitivitas (per rentang input): "
+              + ", ".join(f"{k} {v:.3f}" for k, v in sens["summary"][out].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
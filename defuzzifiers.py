@@ -0,0 +1,102 @@
+"""
+Metode defuzzifikasi tervektorisasi, dipilih per engine lewat FuzzyFloodEngine(defuzz=...).
+
+Dua jenis fungsi:
+- GRID: f(x, agg) -> (N,), dengan agg hasil clipping + agregasi max berbentuk (N, len(x)).
+- STRENGTH: f(centers, strength) -> (N,), langsung dari kekuatan per label konsekuen (N, jumlah label)
+  dan nilai wakil tiap label, tanpa universe output.
+Semua fungsi mengembalikan NaN untuk baris tanpa label aktif. Metode lain bisa ditambah dengan register().
+"""
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+GRID = "grid"
+STRENGTH = "strength"
+
+_METHODS: Dict[str, Tuple[str, Callable[[np.ndarray, np.ndarray], np.ndarray]]] = {}
+
+
+def register(name: str, kind: str, func: Callable[[np.ndarray, np.ndarray], np.ndarray]):
+    if kind not in (GRID, STRENGTH):
+        raise ValueError(f"Jenis defuzzifier tidak dikenal: {kind}")
+    _METHODS[name] = (kind, func)
+
+
+def get(name: str) -> Tuple[str, Callable[[np.ndarray, np.ndarray], np.ndarray]]:
+    try:
+        return _METHODS[name]
+    except KeyError:
+        raise ValueError(f"Metode defuzzifikasi tidak dikenal: {name}")
+
+
+def names() -> Tuple[str, ...]:
+    return tuple(_METHODS)
+
+
+def centroid(x: np.ndarray, agg: np.ndarray) -> np.ndarray:
+    """Centroid diskrit per baris."""
+    total = agg.sum(axis=1)
+    out = np.full(agg.shape[0], np.nan)
+    ok = total > 0
+    out[ok] = (agg[ok] @ x) / total[ok]
+    return out
+
+
+def bisector(x: np.ndarray, agg: np.ndarray) -> np.ndarray:
+    """Titik yang membagi luas agregasi menjadi dua sama besar (interpolasi linear di antara titik grid)."""
+    cum = np.cumsum(agg, axis=1)
+    half = cum[:, -1] / 2
+    out = np.full(agg.shape[0], np.nan)
+    ok = half > 0
+    cum, half, rows = cum[ok], half[ok], agg[ok]
+    i = np.argmax(cum >= half[:, None], axis=1)
+    before = np.where(i > 0, cum[np.arange(i.size), i - 1], 0.0)
+    frac = (half - before) / rows[np.arange(i.size), i]
+    prev = x[np.maximum(i - 1, 0)]
+    out[ok] = np.where(i > 0, prev + frac * (x[i] - prev), x[0])
+    return out
+
+
+def _maximum_mask(agg: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    peak = agg.max(axis=1)
+    mask = agg >= (peak - 1e-12)[:, None]
+    return mask, peak > 0
+
+
+def mean_of_maximum(x: np.ndarray, agg: np.ndarray) -> np.ndarray:
+    mask, ok = _maximum_mask(agg)
+    out = np.full(agg.shape[0], np.nan)
+    out[ok] = (mask[ok] @ x) / mask[ok].sum(axis=1)
+    return out
+
+
+def smallest_of_maximum(x: np.ndarray, agg: np.ndarray) -> np.ndarray:
+    mask, ok = _maximum_mask(agg)
+    out = np.full(agg.shape[0], np.nan)
+    out[ok] = x[np.argmax(mask[ok], axis=1)]
+    return out
+
+
+def largest_of_maximum(x: np.ndarray, agg: np.ndarray) -> np.ndarray:
+    mask, ok = _maximum_mask(agg)
+    out = np.full(agg.shape[0], np.nan)
+    out[ok] = x[x.size - 1 - np.argmax(mask[ok][:, ::-1], axis=1)]
+    return out
+
+
+def weighted_average(centers: np.ndarray, strength: np.ndarray) -> np.ndarray:
+    """Rata-rata nilai wakil label dengan bobot kekuatannya."""
+    total = strength.sum(axis=1)
+    out = np.full(strength.shape[0], np.nan)
+    ok = total > 0
+    out[ok] = (strength[ok] @ centers) / total[ok]
+    return out
+
+
+register("centroid", GRID, centroid)
+register("bisector", GRID, bisector)
+register("mom", GRID, mean_of_maximum)
+register("som", GRID, smallest_of_maximum)
+register("lom", GRID, largest_of_maximum)
+register("weighted_average", STRENGTH, weighted_average)
@@ -0,0 +1,239 @@
+"""
+Konfigurasi engine dari file JSON, dengan cache artefak terkompilasi di disk berdasarkan hash isi.
+
+Format file (sama dengan FuzzyFloodEngine.to_config()):
+    {
+      "inputs":  {"CR": {"rendah": [a, b, c, d], ...}, "WL": {...}, "DU": {...}},
+      "outputs": {"Flood": {"Aman": [a, b, c, d], ...}, "Depth": {...}},
+      "rules":   [["rendah", "rendah", "rendah", "Aman", "Rendah"], ...],
+      "universe": {"flood": [0, 100, 1001], "depth": [0, 3, 301]}
+    }
+Jumlah variabel input/output bebas: setiap rule berisi satu label per input lalu satu label per output,
+sesuai urutan di "inputs" dan "outputs"; kunci "universe" adalah nama output dalam huruf kecil.
+
+Contoh:
+    python engine_config.py export basin_ciliwung.json
+    python engine_config.py check basin_ciliwung.json
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+
+# Variabel engine bawaan (dipakai GUI); config lain boleh memakai variabel berbeda
+INPUT_NAMES = ("CR", "WL", "DU")
+OUTPUT_NAMES = ("Flood", "Depth")
+
+
+def default_cache_dir() -> str:
+    """Direktori cache artefak (XDG_CACHE_HOME atau ~/.cache)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "flood-detection-app")
+
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool) and math.isfinite(v)
+
+
+def _check_mfs(where: str, mfs: Any):
+    if not isinstance(mfs, dict) or not mfs:
+        raise ValueError(f"{where}: harus berupa objek label -> [a, b, c, d] yang tidak kosong")
+    for label, params in mfs.items():
+        if not isinstance(params, (list, tuple)) or len(params) != 4:
+            raise ValueError(f"{where}.{label}: trapesium harus berisi 4 angka")
+        if not all(_is_number(v) for v in params):
+            raise ValueError(f"{where}.{label}: parameter harus numerik")
+        if not (params[0] <= params[1] <= params[2] <= params[3]):
+            raise ValueError(f"{where}.{label}: harus memenuhi a <= b <= c <= d, didapat {list(params)}")
+
+
+def validate_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Memeriksa struktur config; melempar ValueError dengan pesan yang menunjuk bagian yang salah."""
+    if not isinstance(config, dict):
+        raise ValueError("Config harus berupa objek JSON")
+    for section in ("inputs", "outputs"):
+        block = config.get(section)
+        if not isinstance(block, dict) or not block:
+            raise ValueError(f"Bagian '{section}' tidak ada atau kosong")
+        for name in block:
+            _check_mfs(f"{section}.{name}", block[name])
+    output_names = list(config["outputs"])
+    if len({n.lower() for n in output_names}) != len(output_names):
+        raise ValueError("outputs: nama variabel harus unik tanpa membedakan huruf besar/kecil")
+    clash = sorted({n for n in config["inputs"] if n.lower() in {o.lower() for o in output_names}})
+    if clash:
+        raise ValueError(f"Nama variabel dipakai di inputs dan outputs sekaligus: {', '.join(clash)}")
+
+    rules = config.get("rules")
+    if not isinstance(rules, list) or not rules:
+        raise ValueError("Bagian 'rules' harus berupa daftar yang tidak kosong")
+    names = list(config["inputs"]) + output_names
+    label_sets = [config["inputs"][n] for n in config["inputs"]] + [config["outputs"][n] for n in output_names]
+    for i, rule in enumerate(rules, start=1):
+        if not isinstance(rule, (list, tuple)) or len(rule) != len(names):
+            raise ValueError(f"rules[{i}]: harus berisi {len(names)} label ({', '.join(names)})")
+        for name, labels, label in zip(names, label_sets, rule):
+            if not isinstance(label, str):
+                raise ValueError(f"rules[{i}]: label untuk {name} harus berupa teks, didapat {label!r}")
+            if label not in labels:
+                raise ValueError(f"rules[{i}]: label '{label}' tidak dikenal untuk {name}")
+
+    universe = config.get("universe", {})
+    if not isinstance(universe, dict):
+        raise ValueError("universe: harus berupa objek nama_output -> [min, max, jumlah_titik]")
+    for name, spec in universe.items():
+        if name not in [n.lower() for n in output_names]:
+            raise ValueError(f"universe.{name}: bukan nama output (huruf kecil)")
+        if not isinstance(spec, (list, tuple)) or len(spec) != 3 or not all(_is_number(v) for v in spec):
+            raise ValueError(f"universe.{name}: harus berisi 3 angka [min, max, jumlah_titik]")
+        if not spec[0] < spec[1]:
+            raise ValueError(f"universe.{name}: min harus lebih kecil dari max, didapat {list(spec)}")
+        if isinstance(spec[2], float) and not spec[2].is_integer() or spec[2] < 2:
+            raise ValueError(f"universe.{name}: jumlah_titik harus bilangan bulat >= 2, didapat {spec[2]}")
+
+    singletons = config.get("singletons", {})
+    if not isinstance(singletons, dict):
+        raise ValueError("singletons: harus berupa objek nama_output -> {label: nilai}")
+    for name, values in singletons.items():
+        if name not in output_names or not isinstance(values, dict):
+            raise ValueError(f"singletons.{name}: harus objek label -> nilai untuk {', '.join(output_names)}")
+        for label, value in values.items():
+            if label not in config["outputs"][name]:
+                raise ValueError(f"singletons.{name}: label '{label}' tidak dikenal")
+            if not _is_number(value):
+                raise ValueError(f"singletons.{name}.{label}: harus berupa angka")
+    return config
+
+
+def uses_default_variables(config: Dict[str, Any]) -> bool:
+    """True bila config memakai variabel bawaan (CR, WL, DU -> Flood, Depth) yang dibutuhkan GUI."""
+    return tuple(config["inputs"]) == INPUT_NAMES and tuple(config["outputs"]) == OUTPUT_NAMES
+
+
+def synthetic_config(n_inputs: int = 6, n_labels: int = 5, seed: int = 0) -> Dict[str, Any]:
+    """
+    Config sintetis berukuran besar untuk uji skala: n_inputs input dengan n_labels label trapesium
+    yang saling tumpang tindih pada [0, 1], rule lengkap (n_labels ** n_inputs) dan satu output "Risk".
+    Konsekuen mengikuti rata-rata peringkat label antecedent, ditambah sedikit acak.
+    """
+    rng = np.random.default_rng(seed)
+    step = 1.0 / (n_labels - 1)
+    labels = [f"L{i}" for i in range(n_labels)]
+    mfs = {}
+    for i, label in enumerate(labels):
+        c = i * step
+        mfs[label] = [round(max(0.0, c - step), 6) if i else 0.0, round(max(0.0, c - step / 4), 6) if i else 0.0,
+                      round(min(1.0, c + step / 4), 6) if i < n_labels - 1 else 1.0,
+                      round(min(1.0, c + step), 6) if i < n_labels - 1 else 1.0]
+    out_labels = [f"R{i}" for i in range(n_labels)]
+    grid = np.indices([n_labels] * n_inputs).reshape(n_inputs, -1).T
+    rank = np.clip(np.round(grid.mean(axis=1) + rng.normal(0, 0.3, grid.shape[0])), 0, n_labels - 1).astype(int)
+    return {
+        "inputs": {f"X{j}": dict(mfs) for j in range(n_inputs)},
+        "outputs": {"Risk": {label: [i * 100 / n_labels, (i + 0.25) * 100 / n_labels,
+                                     (i + 0.75) * 100 / n_labels, (i + 1) * 100 / n_labels]
+                             for i, label in enumerate(out_labels)}},
+        "rules": [[labels[k] for k in row] + [out_labels[r]] for row, r in zip(grid.tolist(), rank.tolist())],
+        "universe": {"risk": [0, 100, 1001]},
+    }
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Hash SHA-256 dari isi config dalam bentuk JSON kanonik."""
+    raw = json.dumps(config, sort_keys=True, separators=(",", ":"), default=float).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        try:
+            config = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: JSON tidak valid ({e})")
+    return validate_config(config)
+
+
+def save_config(config: Dict[str, Any], path: str):
+    """Menyimpan config secara atomik (tulis ke file sementara lalu rename)."""
+    validate_config(config)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def build_engine(config: Dict[str, Any], cache_dir: Optional[str] = None,
+                 **engine_kwargs) -> Tuple[FuzzyFloodEngine, bool]:
+    """
+    Membuat engine dari config yang sudah divalidasi.
+    Artefak terkompilasi (MF output dan indeks rule) diambil dari `<cache_dir>/<hash>.npz` bila ada,
+    jika tidak dihitung lalu disimpan. Mengembalikan (engine, dari_cache).
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    profile = engine_kwargs.get("profile")
+    path = os.path.join(cache_dir, f"{config_hash(config)}{'.' + profile if profile else ''}.npz")
+    try:
+        with np.load(path) as data:
+            artifacts = {k: data[k] for k in data.files}
+        return FuzzyFloodEngine(config=config, artifacts=artifacts, **engine_kwargs), True
+    except Exception:
+        # File cache hilang, terpotong atau rusak (BadZipFile, EOFError, ...) dianggap miss lalu ditulis ulang
+        pass
+
+    engine = FuzzyFloodEngine(config=config, **engine_kwargs)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez(f, **engine.compile_artifacts())
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache hanya optimasi; engine tetap bisa dipakai
+    return engine, False
+
+
+def load_engine(path: str, cache_dir: Optional[str] = None, **engine_kwargs) -> FuzzyFloodEngine:
+    """Membaca, memvalidasi dan membangun engine dari file JSON."""
+    engine, _ = build_engine(load_config(path), cache_dir, **engine_kwargs)
+    return engine
+
+
+def surface_path(engine: FuzzyFloodEngine, cache_dir: Optional[str] = None) -> str:
+    """Lokasi tabel surface.py untuk engine ini di direktori cache (dikunci oleh signature engine)."""
+    return os.path.join(cache_dir or default_cache_dir(), f"{engine.signature()}.surface.npy")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Kelola file konfigurasi engine fuzzy (JSON).")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_export = sub.add_parser("export", help="tulis parameter bawaan engine ke file JSON")
+    p_export.add_argument("path")
+    p_check = sub.add_parser("check", help="validasi file dan siapkan cache artefak")
+    p_check.add_argument("path")
+    p_check.add_argument("--cache-dir", default=None)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "export":
+            save_config(FuzzyFloodEngine().to_config(), args.path)
+            print(f"Konfigurasi bawaan tersimpan di {args.path}")
+        else:
+            config = load_config(args.path)
+            _, cached = build_engine(config, args.cache_dir)
+            print(f"{args.path}: valid ({len(config['rules'])} rule), hash {config_hash(config)[:12]}, "
+                  f"artefak {'dari cache' if cached else 'baru dibuat'}")
+    except (OSError, ValueError) as e:
+        print(f"Kesalahan: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,153 @@
+import hashlib
+import itertools
+import json
 import numpy as np
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, TYPE_CHECKING
+
+import defuzzifiers
+
+if TYPE_CHECKING:
+    from instrumentation import EngineInstrumentation
+    from result_cache import ResultCache
+
+class CompiledRules:
+    """
+    Rule base dalam bentuk array indeks bilangan bulat, untuk sembarang jumlah variabel input dan output.
+    Rule dikelompokkan per label konsekuen sehingga agregasi cukup satu max per label output.
+    Rule untuk satu kombinasi label input ditemukan tanpa memindai seluruh rule: lewat rule_map
+    (tuple indeks label -> rule) untuk satu sampel, atau kunci bilangan bulat terurut (indeks label dalam
+    basis campuran) dengan searchsorted untuk banyak sampel (lihat lookup()).
+    Atribut per variabel tetap tersedia dengan nama huruf kecil, mis. cr_labels, flood, flood_groups.
+    """
+
+    def __init__(self, rules: List[Tuple], input_labels: Dict[str, List[str]], output_labels: Dict[str, List[str]]):
+        self.input_names, self.output_names = list(input_labels), list(output_labels)
+        self.input_labels = [list(v) for v in input_labels.values()]
+        self.output_labels = [list(v) for v in output_labels.values()]
+        self.output_index = [{k: i for i, k in enumerate(labels)} for labels in self.output_labels]
+
+        lookups = [{k: i for i, k in enumerate(labels)} for labels in self.input_labels + self.output_labels]
+        width = len(lookups)
+        try:
+            idx = np.array([[lookups[j][r[j]] for j in range(width)] for r in rules], dtype=np.intp)
+        except (KeyError, IndexError) as e:
+            raise ValueError(f"Rule memakai label yang tidak dikenal: {e}")
+        if any(len(r) != width for r in rules):
+            raise ValueError(f"Setiap rule harus berisi {width} label")
+        self._set_indices(idx.reshape(-1, width))
+
+    @classmethod
+    def from_indices(cls, indices: np.ndarray, input_labels: Dict[str, List[str]],
+                     output_labels: Dict[str, List[str]]) -> "CompiledRules":
+        """Membangun ulang dari array indeks (R, jumlah variabel) yang sudah tersimpan, tanpa mencari label."""
+        comp = cls([], input_labels, output_labels)
+        comp._set_indices(np.asarray(indices, dtype=np.intp).reshape(-1, len(input_labels) + len(output_labels)))
+        return comp
+
+    def _set_indices(self, idx: np.ndarray):
+        n_in = len(self.input_labels)
+        self.indices = idx
+        self.antecedents = idx[:, :n_in]
+        self.consequents = idx[:, n_in:]
+        self.groups = [[np.flatnonzero(self.consequents[:, j] == k) for k in range(len(labels))]
+                       for j, labels in enumerate(self.output_labels)]
+
+        # Kunci antecedent: sum_i label_i * stride_i, diurutkan untuk pencarian biner
+        sizes = [len(labels) for labels in self.input_labels]
+        self.strides = np.array([int(np.prod(sizes[i + 1:])) for i in range(n_in)], dtype=np.int64)
+        keys = self.antecedents.astype(np.int64) @ self.strides
+        self.key_order = np.argsort(keys, kind="stable")
+        self.sorted_keys = keys[self.key_order]
+        self.unique_keys = bool(np.all(np.diff(self.sorted_keys) > 0))
+        # Indeks tuple label antecedent -> daftar rule, untuk jalur skalar (evaluate_rules)
+        self.rule_map: Dict[Tuple[int, ...], List[int]] = {}
+        for i, ant in enumerate(map(tuple, self.antecedents.tolist())):
+            self.rule_map.setdefault(ant, []).append(i)
+
+        for name, labels in zip(self.input_names, self.input_labels):
+            setattr(self, f"{name.lower()}_labels", labels)
+        for j, (name, labels) in enumerate(zip(self.output_names, self.output_labels)):
+            key = name.lower()
+            setattr(self, f"{key}_labels", labels)
+            setattr(self, f"{key}_index", self.output_index[j])
+            setattr(self, key, self.consequents[:, j])
+            setattr(self, f"{key}_groups", self.groups[j])
+
+    def lookup(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rule untuk setiap kunci antecedent di `keys`: mengembalikan (indeks rule, posisi kunci asalnya).
+        Kunci tanpa rule dilewati; antecedent yang dipakai beberapa rule menghasilkan beberapa pasangan.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        if self.sorted_keys.size == 0:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+        left = np.searchsorted(self.sorted_keys, keys, side="left")
+        if self.unique_keys:
+            hit = self.sorted_keys[np.minimum(left, self.sorted_keys.size - 1)] == keys
+            return self.key_order[left[hit]], np.flatnonzero(hit)
+        counts = np.searchsorted(self.sorted_keys, keys, side="right") - left
+        src = np.repeat(np.arange(keys.size), counts)
+        offset = np.arange(src.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.key_order[np.repeat(left, counts) + offset], src
+
 
 class FuzzyFloodEngine:
     """
     Engine Fuzzy Logic untuk deteksi banjir.
     Menggunakan metode Mamdani dengan fungsi keanggotaan Trapesium.
+    Bawaannya 3 input (CR, WL, DU) dan 2 output (Flood, Depth); config bisa mendefinisikan sembarang
+    jumlah variabel. Parameter tiap variabel disimpan di atribut `<Nama>_params` (mis. CR_params),
+    universe dan MF output di `x_<nama>` dan `<nama>_mfs` (mis. x_flood, flood_mfs).
     """
 
-    def __init__(self):
+    DEFUZZ_METHODS = (("centroid", "analytic")
+                      + tuple(m for m in defuzzifiers.names() if m != "centroid") + ("sugeno",))
+
+    # Profil resolusi/presisi: jumlah titik universe output, tipe float grid agregasi, dan ukuran blok
+    # bawaan infer_batch (agregasi per blok berukuran chunk_size x jumlah titik). "balanced" = grid bawaan.
+    # Output tanpa entri "<nama>_points" memakai jumlah titik dari config.
+    PROFILES = {
+        "fast": {"flood_points": 101, "depth_points": 31, "dtype": "float32", "chunk_size": 8192},
+        "balanced": {"flood_points": 1001, "depth_points": 301, "dtype": "float64", "chunk_size": 2048},
+        "reference": {"flood_points": 10001, "depth_points": 3001, "dtype": "float64", "chunk_size": 256},
+    }
+
+    # Di atas jumlah rule ini infer_batch tidak membentuk matriks firing penuh (N, jumlah rule),
+    # tetapi hanya mengevaluasi kombinasi label input yang aktif (lihat _sparse_label_strength)
+    SPARSE_MIN_RULES = 64
+
+    def __init__(self, defuzz: str = "centroid", cache: Optional["ResultCache"] = None,
+                 config: Optional[Dict[str, Any]] = None, artifacts: Optional[Dict[str, np.ndarray]] = None,
+                 instrumentation: Optional["EngineInstrumentation"] = None, profile: Optional[str] = None):
+        """
+        defuzz: "centroid" (centroid diskrit di atas x_flood/x_depth), "analytic" (centroid eksak dari
+        integral tertutup, tanpa grid), metode lain dari defuzzifiers.py ("bisector", "mom", "som", "lom",
+        "weighted_average"), atau "sugeno" (Sugeno orde nol: rata-rata nilai singleton tiap label konsekuen
+        dengan bobot jumlah firing rule-nya, tanpa universe output).
+        cache: ResultCache opsional untuk infer() dan infer_batch().
+        config: definisi engine (format to_config()) yang menggantikan parameter bawaan di bawah.
+        artifacts: hasil precompute dari compile_artifacts() untuk config yang sama (lihat engine_config.py).
+        instrumentation: EngineInstrumentation opsional untuk statistik waktu per tahap (lihat instrumentation.py).
+        profile: nama profil di PROFILES; mengganti jumlah titik universe output (batas min/max tetap dari
+        config), tipe float grid dan ukuran blok batch. None = universe dari config/bawaan dengan float64.
+        Kalibrasi akurasi vs kecepatan tiap profil: profile_report.py.
+        """
+        if defuzz == "analytic":
+            self._defuzz_kind, self._defuzz_func = "analytic", None
+        elif defuzz == "sugeno":
+            self._defuzz_kind, self._defuzz_func = defuzzifiers.STRENGTH, defuzzifiers.weighted_average
+        else:
+            self._defuzz_kind, self._defuzz_func = defuzzifiers.get(defuzz)
+        if profile is not None and profile not in self.PROFILES:
+            raise ValueError(f"Profil engine tidak dikenal: {profile}")
+        self.defuzz = defuzz
+        self.profile = profile
+        self.cache = cache
+        self.instrumentation = instrumentation
+
+        self.input_names = ["CR", "WL", "DU"]
+        self.output_names = ["Flood", "Depth"]
+
         # Input MFs Parameters
         self.CR_params = {
             "rendah": [0, 0, 50, 100],
@@ -71,13 +211,118 @@ class FuzzyFloodEngine:
             ( "tinggi","tinggi","tinggi", "Bahaya","Tinggi")
         ]
 
-        # Universe arrays for plotting/defuzz
-        self.x_flood = np.linspace(0, 100, 1001)
-        self.x_depth = np.linspace(0, 3, 301)
+        # Universe (min, max, jumlah titik) for plotting/defuzz
+        universe = {"flood": [0, 100, 1001], "depth": [0, 3, 301]}
+
+        if config is not None:
+            self.input_names = list(config["inputs"])
+            self.output_names = list(config["outputs"])
+            for name, mfs in list(config["inputs"].items()) + list(config["outputs"].items()):
+                setattr(self, f"{name}_params", {k: list(v) for k, v in mfs.items()})
+            self.rules = [tuple(r) for r in config["rules"]]
+            universe.update(config.get("universe", {}))
+        self._custom_singletons = (config or {}).get("singletons")
+        self._param_attrs = [name + "_params" for name in self.input_names + self.output_names]
+        if cache is not None and len(cache.resolution) != len(self.input_names):
+            raise ValueError(f"Resolusi cache harus berisi {len(self.input_names)} nilai (satu per input)")
+
+        settings = self.PROFILES[profile] if profile is not None else {}
+        self.dtype = np.dtype(settings.get("dtype", "float64"))
+        self.chunk_size = settings.get("chunk_size", 2048)
+
+        # Universe arrays for plotting/defuzz; output tanpa universe di config memakai rentang MF-nya
+        self.output_keys = [name.lower() for name in self.output_names]
+        self.universes: Dict[str, np.ndarray] = {}
+        for key, params in zip(self.output_keys, self.output_params.values()):
+            spec = universe.get(key) or [min(p[0] for p in params.values()), max(p[3] for p in params.values()), 1001]
+            n = settings.get(f"{key}_points", spec[2])
+            self.universes[key] = np.linspace(*spec[:2], int(n), dtype=self.dtype)
+            setattr(self, f"x_{key}", self.universes[key])
+
+        # Nilai tegas per label konsekuen untuk metode berbasis kekuatan (weighted_average, sugeno);
+        # bawaan centroid MF label tersebut, bisa diganti lewat config["singletons"]
+        for name, key in zip(self.output_names, self.output_keys):
+            setattr(self, f"{name}_singletons", self._singletons(self.output_params[name], self.universes[key], name))
+
+        # Rule base terkompilasi; dikompilasi ulang otomatis bila rules atau label berubah
+        self._compiled = None
+        self._compiled_key = None
+        self._subset_cache: Dict[str, List[Tuple]] = {}
+
+        self.output_mfs: Dict[str, Dict[str, np.ndarray]] = {}
+        if artifacts is not None and all(
+                f"{key}_mfs" in artifacts and artifacts[f"{key}_mfs"].shape[-1] == self.universes[key].size
+                for key in self.output_keys):
+            for key, params in zip(self.output_keys, self.output_params.values()):
+                self.output_mfs[key] = dict(zip(params, artifacts[f"{key}_mfs"].astype(self.dtype, copy=False)))
+            labels = self._label_lists()
+            self._compiled = CompiledRules.from_indices(artifacts["rule_indices"], *self._label_dicts(labels))
+            self._compiled_key = (list(self.rules), labels)
+        else:
+            # Precompute output MFs (arrays)
+            for key, params in zip(self.output_keys, self.output_params.values()):
+                x = self.universes[key]
+                self.output_mfs[key] = {k: self.trapmf(x, v).astype(self.dtype, copy=False) for k, v in params.items()}
+            self.compiled_rules()
+        for key in self.output_keys:
+            setattr(self, f"{key}_mfs", self.output_mfs[key])
+
+    @property
+    def input_params(self) -> Dict[str, Dict[str, List[float]]]:
+        """Parameter MF per variabel input, berurutan sesuai urutan input di rule."""
+        return {name: getattr(self, f"{name}_params") for name in self.input_names}
+
+    @property
+    def output_params(self) -> Dict[str, Dict[str, List[float]]]:
+        return {name: getattr(self, f"{name}_params") for name in self.output_names}
+
+    def _singletons(self, params: Dict[str, List[float]], x: np.ndarray, name: str) -> Dict[str, float]:
+        values = {k: float(self.analytic_centroid([p], np.ones((1, 1)), x[0], x[-1])[0]) for k, p in params.items()}
+        values.update((self._custom_singletons or {}).get(name, {}))
+        return values
 
-        # Precompute output MFs (arrays)
-        self.flood_mfs = {k: self.trapmf(self.x_flood, v) for k, v in self.Flood_params.items()}
-        self.depth_mfs = {k: self.trapmf(self.x_depth, v) for k, v in self.Depth_params.items()}
+    def _label_lists(self) -> List[List[str]]:
+        """Label setiap variabel input lalu output (dipanggil di setiap evaluasi, jadi dibuat seringan mungkin)."""
+        return [list(getattr(self, attr)) for attr in self._param_attrs]
+
+    def _label_dicts(self, labels: List[List[str]]) -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+        n_in = len(self.input_names)
+        return dict(zip(self.input_names, labels[:n_in])), dict(zip(self.output_names, labels[n_in:]))
+
+    def compiled_rules(self) -> CompiledRules:
+        """Bentuk terkompilasi dari self.rules, divalidasi ulang terhadap isi rules dan label saat ini."""
+        labels = self._label_lists()
+        if self._compiled is None or self._compiled_key != (self.rules, labels):
+            self._compiled = CompiledRules(self.rules, *self._label_dicts(labels))
+            self._compiled_key = (list(self.rules), labels)
+        return self._compiled
+
+    def to_config(self) -> Dict[str, Any]:
+        """Definisi engine sebagai dict yang bisa disimpan ke JSON (lihat engine_config.py)."""
+        config = {
+            "inputs": self.input_params,
+            "outputs": self.output_params,
+            "rules": [list(r) for r in self.rules],
+            "universe": {key: [float(x[0]), float(x[-1]), int(x.size)] for key, x in self.universes.items()},
+        }
+        if self._custom_singletons:
+            config["singletons"] = self._custom_singletons
+        return config
+
+    def compile_artifacts(self) -> Dict[str, np.ndarray]:
+        """Hasil precompute yang bisa disimpan dan dipakai ulang lewat argumen `artifacts`."""
+        comp = self.compiled_rules()
+        artifacts = {f"{key}_mfs": np.stack(list(mfs.values())) for key, mfs in self.output_mfs.items()}
+        artifacts["rule_indices"] = comp.indices
+        return artifacts
+
+    def signature(self) -> str:
+        """Hash isi parameter MF, rule, universe dan metode defuzzifikasi; berubah bila engine diubah."""
+        content = {"config": self.to_config(), "defuzz": self.defuzz}
+        if self.dtype != np.float64:
+            content["dtype"] = self.dtype.name
+        raw = json.dumps(content, sort_keys=True, default=float).encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
 
     @staticmethod
     def trapmf(x: np.ndarray, params: List[float]) -> np.ndarray:
@@ -117,57 +362,567 @@ class FuzzyFloodEngine:
             return 0.0 if c != d else (1.0 if val == d else 0.0)
         return 0.0
 
-    def fuzzify_sample(self, cr: float, wl: float, du: float) -> Tuple[Dict, Dict, Dict]:
-        """Menghitung derajat keanggotaan untuk input."""
-        mu_cr = {k: self.scalar_trapmf(cr, p) for k, p in self.CR_params.items()}
-        mu_wl = {k: self.scalar_trapmf(wl, p) for k, p in self.WL_params.items()}
-        mu_du = {k: self.scalar_trapmf(du, p) for k, p in self.DU_params.items()}
-        return mu_cr, mu_wl, mu_du
+    @staticmethod
+    def batch_trapmf(vals: np.ndarray, params: List[float]) -> np.ndarray:
+        """Versi vektor dari scalar_trapmf (aturan tepi yang sama) untuk banyak sampel."""
+        a, b, c, d = params
+        vals = np.asarray(vals, dtype=float)
+        y = np.zeros_like(vals)
+
+        # rising
+        if b - a != 0:
+            idx = (vals > a) & (vals <= b)
+            y[idx] = (vals[idx] - a) / (b - a)
+
+        # top
+        y[(vals > b) & (vals < c)] = 1.0
+
+        # falling
+        if d - c != 0:
+            idx = (vals >= c) & (vals < d)
+            y[idx] = (d - vals[idx]) / (d - c)
+
+        # bahu tegak (a == b atau c == d) bernilai 1 tepat di titiknya
+        if a == b:
+            y[vals == a] = 1.0
+        if c == d:
+            y[vals == d] = 1.0
+        return y
+
+    def fuzzify_sample(self, *values: float) -> Tuple[Dict, ...]:
+        """Menghitung derajat keanggotaan untuk input (satu nilai per variabel input, mis. cr, wl, du)."""
+        self._check_arity(values)
+        return tuple({k: self.scalar_trapmf(v, p) for k, p in getattr(self, attr).items()}
+                     for v, attr in zip(values, self._param_attrs))
+
+    def _check_arity(self, values: Tuple):
+        if len(values) != len(self.input_names):
+            raise ValueError(f"Engine membutuhkan {len(self.input_names)} input ({', '.join(self.input_names)}), "
+                             f"didapat {len(values)}")
+
+    def evaluate_rules(self, *memberships: Dict) -> List[Dict]:
+        """
+        Mengevaluasi rule base berdasarkan derajat keanggotaan input.
+        Hanya kombinasi label dengan keanggotaan > 0 yang dibentuk (dengan partisi trapesium umumnya
+        paling banyak 2 label per input), lalu rule-nya dicari lewat indeks antecedent.
+        """
+        comp = self.compiled_rules()
+        index, degree = [], []
+        for m, labels in zip(memberships, comp.input_labels):
+            nz, mus = [], []
+            for i, k in enumerate(labels):
+                if m[k] > 0:
+                    nz.append(i)
+                    mus.append(m[k])
+            index.append(nz)
+            degree.append(mus)
 
-    def evaluate_rules(self, mu_cr: Dict, mu_wl: Dict, mu_du: Dict) -> List[Dict]:
-        """Mengevaluasi rule base berdasarkan derajat keanggotaan input."""
+        fired = []
+        rule_map = comp.rule_map
+        for combo, mus in zip(itertools.product(*index), itertools.product(*degree)):
+            rules = rule_map.get(combo)
+            if rules is not None:
+                # Menggunakan operator AND (min)
+                f = float(min(mus))
+                for r in rules:
+                    fired.append((r, f))
+        fired.sort()
+
+        n_in = len(comp.input_labels)
         active = []
-        for i, r in enumerate(self.rules, start=1):
-            cr_l, wl_l, du_l, flood_c, depth_c = r
-            # Menggunakan operator AND (min)
-            firing = min(mu_cr[cr_l], mu_wl[wl_l], mu_du[du_l])
-            if firing > 0:
-                active.append({
-                    "id": i, 
-                    "antecedent": (cr_l, wl_l, du_l),
-                    "firing": firing, 
-                    "flood": flood_c, 
-                    "depth": depth_c
-                })
+        for i, f in fired:
+            rule = self.rules[i]
+            entry = {"id": i + 1, "antecedent": tuple(rule[:n_in]), "firing": f}
+            for key, label in zip(self.output_keys, rule[n_in:]):
+                entry[key] = label
+            active.append(entry)
         return active
 
-    def aggregate_and_defuzz(self, active_rules: List[Dict]) -> Dict[str, Any]:
-        """Agregasi output dan defuzzifikasi (Centroid)."""
-        agg_flood = np.zeros_like(self.x_flood)
-        agg_depth = np.zeros_like(self.x_depth)
-        
+    def _active_label_strength(self, active_rules: List[Dict]) -> Dict[str, np.ndarray]:
+        """Kekuatan maksimum (mode sugeno: jumlah) per label konsekuen dari daftar rule aktif, per output."""
+        comp = self.compiled_rules()
+        combine = (lambda a, b: a + b) if self.defuzz == "sugeno" else max
+        strengths = [[0.0] * len(labels) for labels in comp.output_labels]
+        outputs = list(zip(self.output_keys, comp.output_index, strengths))
         for ar in active_rules:
-            f_label = ar["flood"]
-            d_label = ar["depth"]
-            firing = ar["firing"]
-            
-            # Komposisi rule (clipping/min) dan Agregasi (max)
-            agg_flood = np.maximum(agg_flood, np.minimum(self.flood_mfs[f_label], firing))
-            agg_depth = np.maximum(agg_depth, np.minimum(self.depth_mfs[d_label], firing))
-            
+            for key, index, strength in outputs:
+                k = index[ar[key]]
+                strength[k] = combine(strength[k], ar["firing"])
+        return {key: np.array(strength) for key, strength in zip(self.output_keys, strengths)}
+
+    def singleton_values(self, output: str) -> np.ndarray:
+        """Nilai singleton label konsekuen sebuah output (mis. "flood"), berurutan sesuai label."""
+        name = self.output_names[self.output_keys.index(output)]
+        values = getattr(self, f"{name}_singletons")
+        return np.array([values[k] for k in self.output_params[name]], dtype=float)
+
+    def aggregate_and_defuzz(self, active_rules: List[Dict]) -> Dict[str, Any]:
+        """Agregasi output dan defuzzifikasi (metode sesuai self.defuzz)."""
+        return self._defuzzify(self._aggregate(active_rules))
+
+    def _aggregate(self, active_rules: List[Dict]) -> Dict[str, Any]:
+        """
+        Kekuatan per label konsekuen, plus array agregasi untuk metode berbasis grid.
+        Mode analytic dan metode berbasis kekuatan tidak membentuk array agregasi (agg_<output> None).
+        """
+        strengths = self._active_label_strength(active_rules)
+        agg = {"strength": strengths}
+        for key in self.output_keys:
+            agg[f"agg_{key}"] = None
+        if self._defuzz_kind != defuzzifiers.GRID:
+            return agg
+
+        # Komposisi rule (clipping/min) dan Agregasi (max), satu kali per label konsekuen
+        for key in self.output_keys:
+            out = np.zeros_like(self.universes[key])
+            for mf, h in zip(self.output_mfs[key].values(), strengths[key]):
+                if h > 0:
+                    np.maximum(out, np.minimum(mf, h), out=out)
+            agg[f"agg_{key}"] = out
+        return agg
+
+    def _defuzzify(self, agg: Dict[str, Any]) -> Dict[str, Any]:
+        if self.defuzz == "analytic":
+            return self._analytic_defuzz(agg["strength"])
+        if self.defuzz != "centroid":
+            return self._method_defuzz(agg)
+
         # Defuzzifikasi Centroid
-        flood_val = None
-        depth_val = None
-        
-        if agg_flood.sum() > 0:
-            flood_val = float((self.x_flood * agg_flood).sum() / agg_flood.sum())
-        
-        if agg_depth.sum() > 0:
-            depth_val = float((self.x_depth * agg_depth).sum() / agg_depth.sum())
-            
-        return {
-            "agg_flood": agg_flood, 
-            "agg_depth": agg_depth,
-            "flood_val": flood_val, 
-            "depth_val": depth_val
-        }
+        result = {}
+        for key in self.output_keys:
+            out = agg[f"agg_{key}"]
+            result[f"agg_{key}"] = out
+            result[f"{key}_val"] = float((self.universes[key] * out).sum() / out.sum()) if out.sum() > 0 else None
+        return result
+
+    def _method_defuzz(self, agg: Dict[str, Any]) -> Dict[str, Any]:
+        """Jalur skalar untuk metode dari defuzzifiers.py, lewat fungsi tervektorisasi dengan N = 1."""
+        result = {}
+        for key in self.output_keys:
+            if self._defuzz_kind == defuzzifiers.GRID:
+                val = self._defuzz_func(self.universes[key], agg[f"agg_{key}"][None, :])[0]
+            else:
+                val = self._defuzz_func(self.singleton_values(key), agg["strength"][key][None, :])[0]
+            result[f"agg_{key}"] = agg[f"agg_{key}"]
+            result[f"{key}_val"] = None if np.isnan(val) else float(val)
+        return result
+
+    def _analytic_defuzz(self, strengths: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        """Centroid eksak untuk jalur skalar; tidak ada array agregasi yang dibentuk."""
+        result = {}
+        for key, params in zip(self.output_keys, self.output_params.values()):
+            x = self.universes[key]
+            val = self.analytic_centroid(list(params.values()), strengths[key][None, :], x[0], x[-1])[0]
+            result[f"agg_{key}"] = None
+            result[f"{key}_val"] = None if np.isnan(val) else float(val)
+        return result
+
+    @classmethod
+    def analytic_centroid(cls, params: List[List[float]], strength: np.ndarray, lo: float, hi: float) -> np.ndarray:
+        """
+        Centroid eksak dari gabungan (max) trapesium yang dipotong pada `strength` (N, jumlah label).
+        Gabungan tersebut linear sepotong-sepotong; titik patahnya adalah sudut trapesium,
+        perpotongan antar sisi miring, dan perpotongan sisi miring dengan tinggi potongan.
+        Di antara dua titik patah, luas dan momen dihitung dalam bentuk tertutup.
+        """
+        strength = np.asarray(strength, dtype=float)
+        n = strength.shape[0]
+
+        # Sisi miring tiap trapesium sebagai garis y = m*x + q
+        slopes = []
+        for a, b, c, d in params:
+            if b > a:
+                slopes.append((1.0 / (b - a), -a / (b - a)))
+            if d > c:
+                slopes.append((-1.0 / (d - c), d / (d - c)))
+
+        fixed = [lo, hi] + [v for p in params for v in p]
+        for i, (m1, q1) in enumerate(slopes):
+            for m2, q2 in slopes[i + 1:]:
+                if m1 != m2:
+                    fixed.append((q2 - q1) / (m1 - m2))
+
+        # Perpotongan sisi miring dengan garis datar y = tinggi potongan (per sampel)
+        cut = [(strength - q) / m for m, q in slopes]
+        xs = np.concatenate([np.broadcast_to(np.array(fixed), (n, len(fixed)))] + cut, axis=1)
+        xs = np.sort(np.clip(xs, lo, hi), axis=1)
+
+        x0, x1 = xs[:, :-1], xs[:, 1:]
+        dx = x1 - x0
+        xm = (x0 + x1) / 2
+
+        # Di dalam segmen gabungan linear, jadi cukup dievaluasi di titik tengah dan kuartil
+        def union(x):
+            y = np.zeros_like(x)
+            for k, p in enumerate(params):
+                np.maximum(y, np.minimum(cls.batch_trapmf(x, p), strength[:, k:k + 1]), out=y)
+            return y
+
+        ym = union(xm)
+        slope_term = union(x1 - dx / 4) - union(x0 + dx / 4)  # = kemiringan * dx / 2
+
+        area = (dx * ym).sum(axis=1)
+        moment = (dx * xm * ym + slope_term * dx ** 2 / 6).sum(axis=1)
+
+        out = np.full(n, np.nan)
+        ok = area > 0
+        out[ok] = moment[ok] / area[ok]
+        return out
+
+    def infer(self, *values: float) -> Dict[str, Any]:
+        """
+        Fuzzifikasi, evaluasi rule, agregasi dan defuzzifikasi untuk satu input (mis. infer(cr, wl, du)).
+        Hasil berisi "<output>_val" dan "agg_<output>" per output (mis. flood_val, agg_flood).
+        Bila cache aktif, input dibulatkan ke resolusi cache dan hasilnya disimpan.
+        """
+        self._check_arity(values)
+        if self.instrumentation is not None:
+            self.instrumentation.record_call("infer")
+        if self.cache is None or not np.isfinite(values).all():
+            return self._infer_uncached(*values)
+        key = ("full",) + self.cache.quantize(*values)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._infer_uncached(*self.cache.dequantize(key[1:]))
+            self.cache.put(key, result)
+        return result
+
+    def _infer_uncached(self, *values: float) -> Dict[str, Any]:
+        if self.instrumentation is not None:
+            return self._infer_instrumented(*values)
+        memberships = self.fuzzify_sample(*values)
+        active = self.evaluate_rules(*memberships)
+        result = self.aggregate_and_defuzz(active)
+        result["memberships"] = memberships
+        result["active"] = active
+        return result
+
+    def _infer_instrumented(self, *values: float) -> Dict[str, Any]:
+        """Sama dengan _infer_uncached, dengan pencatatan waktu per tahap."""
+        inst = self.instrumentation
+        t0 = inst.clock()
+        memberships = self.fuzzify_sample(*values)
+        t1 = inst.clock()
+        active = self.evaluate_rules(*memberships)
+        t2 = inst.clock()
+        agg = self._aggregate(active)
+        t3 = inst.clock()
+        result = self._defuzzify(agg)
+        t4 = inst.clock()
+
+        inst.record_stage("infer", "fuzzify", t1 - t0)
+        inst.record_stage("infer", "rules", t2 - t1)
+        inst.record_stage("infer", "aggregate", t3 - t2)
+        inst.record_stage("infer", "defuzz", t4 - t3)
+        inst.record_active(len(active))
+        result["memberships"] = memberships
+        result["active"] = active
+        return result
+
+    def fuzzify_batch(self, *values: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Derajat keanggotaan untuk N sampel sekaligus, per input berbentuk (N, jumlah label)."""
+        return tuple(np.stack([self.batch_trapmf(v, p) for p in params.values()], axis=1)
+                     for v, params in zip(values, self.input_params.values()))
+
+    def firing_matrix(self, *mu: np.ndarray) -> np.ndarray:
+        """Kekuatan firing semua rule untuk N sampel, berbentuk (N, jumlah rule)."""
+        ant = self.compiled_rules().antecedents
+        firing = mu[0][:, ant[:, 0]]
+        for i in range(1, len(mu)):
+            firing = np.minimum(firing, mu[i][:, ant[:, i]])
+        return firing
+
+    def infer_batch(self, *values, chunk_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Inferensi Mamdani untuk N sampel sekaligus, mis. infer_batch(cr, wl, du) dengan array NumPy.
+        Fuzzifikasi, firing dan agregasi dilakukan per blok `chunk_size` sampel (bawaan dari profil)
+        agar memori tetap terbatas.
+        Sampel tanpa rule aktif bernilai NaN (setara None pada jalur skalar).
+        Bila cache aktif, hanya kombinasi input (terkuantisasi) yang belum ada di cache yang dihitung.
+        """
+        self._check_arity(values)
+        values = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in values))
+        shape = values[0].shape
+        values = [v.ravel() for v in values]
+        chunk_size = chunk_size or self.chunk_size
+        if self.instrumentation is not None:
+            self.instrumentation.record_call("infer_batch", values[0].size)
+        if self.cache is None:
+            outputs = self._infer_batch_uncached(values, chunk_size)
+        else:
+            outputs = self._infer_batch_cached(values, chunk_size)
+        return {f"{key}_val": out.reshape(shape) for key, out in zip(self.output_keys, outputs)}
+
+    def _infer_batch_cached(self, values: List[np.ndarray], chunk_size: int) -> List[np.ndarray]:
+        n_out = len(self.output_keys)
+        out = np.full((values[0].size, n_out), np.nan)
+        finite = np.logical_and.reduce([np.isfinite(v) for v in values])
+        keys = self.cache.quantize_array(*(v[finite] for v in values))
+        uniq, inverse = np.unique(keys, axis=0, return_inverse=True)
+
+        vals = np.empty((len(uniq), n_out))
+        missing = []
+        for i, key in enumerate(map(tuple, uniq.tolist())):
+            hit = self.cache.get(("value",) + key)
+            if hit is None:
+                missing.append(i)
+            else:
+                vals[i] = hit
+
+        if missing:
+            q = uniq[missing] * np.array(self.cache.resolution)
+            computed = self._infer_batch_uncached(list(q.T), chunk_size)
+            for j, col in enumerate(computed):
+                vals[missing, j] = col
+            for i in missing:
+                self.cache.put(("value",) + tuple(uniq[i].tolist()), tuple(vals[i].tolist()))
+
+        out[finite] = vals[inverse.reshape(-1)]
+        return list(out.T)
+
+    def _infer_batch_uncached(self, values: List[np.ndarray], chunk_size: int) -> List[np.ndarray]:
+        comp = self.compiled_rules()
+
+        inst = self.instrumentation
+        reduce = "sum" if self.defuzz == "sugeno" else "max"
+        sparse = comp.indices.shape[0] > self.SPARSE_MIN_RULES
+        centers = [self.singleton_values(key) for key in self.output_keys]
+        out_params = [list(p.values()) for p in self.output_params.values()]
+
+        n = values[0].size
+        outputs = [np.full(n, np.nan) for _ in self.output_keys]
+        for start in range(0, n, chunk_size):
+            sl = slice(start, min(start + chunk_size, n))
+            m = sl.stop - sl.start
+            if inst is not None:
+                t0 = inst.clock()
+            mu = self.fuzzify_batch(*(v[sl] for v in values))
+            if inst is not None:
+                t1 = inst.clock()
+            if sparse:
+                strengths, active_counts = self._sparse_label_strength(mu, reduce)
+            else:
+                firing = self.firing_matrix(*mu)
+                # max(min(mf, f1), min(mf, f2)) == min(mf, max(f1, f2)): cukup satu kekuatan per label konsekuen
+                strengths = [self._label_strength(firing, groups, reduce, self.dtype) for groups in comp.groups]
+            if inst is not None:
+                t2 = inst.clock()
+
+            if self.defuzz == "analytic":
+                if inst is not None:
+                    t3 = inst.clock()
+                for out, key, params, strength in zip(outputs, self.output_keys, out_params, strengths):
+                    x = self.universes[key]
+                    out[sl] = self.analytic_centroid(params, strength, x[0], x[-1])
+            elif self._defuzz_kind == defuzzifiers.GRID:
+                aggs = [self._clip_aggregate(self.universes[key], self.output_mfs[key], strength)
+                        for key, strength in zip(self.output_keys, strengths)]
+                if inst is not None:
+                    t3 = inst.clock()
+                for out, key, agg in zip(outputs, self.output_keys, aggs):
+                    out[sl] = self._defuzz_func(self.universes[key], agg)
+            else:
+                if inst is not None:
+                    t3 = inst.clock()
+                for out, center, strength in zip(outputs, centers, strengths):
+                    out[sl] = self._defuzz_func(center, strength)
+
+            if inst is not None:
+                t4 = inst.clock()
+                inst.record_stage("infer_batch", "fuzzify", t1 - t0, m)
+                inst.record_stage("infer_batch", "rules", t2 - t1, m)
+                inst.record_stage("infer_batch", "aggregate", t3 - t2, m)
+                inst.record_stage("infer_batch", "defuzz", t4 - t3, m)
+                inst.record_active(active_counts if sparse else np.count_nonzero(firing > 0, axis=1))
+
+        return outputs
+
+    def _sparse_label_strength(self, mu: Tuple[np.ndarray, ...], reduce: str) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Kekuatan per label konsekuen tanpa matriks firing penuh: per input diambil k label dengan keanggotaan
+        terbesar (k = jumlah label aktif terbanyak dalam blok), kombinasinya dibentuk per sampel, dan rule
+        dicari lewat CompiledRules.lookup. Mengembalikan kekuatan per output dan jumlah rule aktif per sampel.
+        """
+        comp = self.compiled_rules()
+        n = mu[0].shape[0]
+        keys = np.zeros((n, 1), dtype=np.int64)
+        firing = np.ones((n, 1))
+        for m, stride in zip(mu, comp.strides):
+            k = max(1, int(np.count_nonzero(m > 0, axis=1).max(initial=0)))
+            top = np.argsort(-m, axis=1, kind="stable")[:, :k]
+            keys = (keys[:, :, None] + top[:, None, :] * stride).reshape(n, -1)
+            firing = np.minimum(firing[:, :, None], np.take_along_axis(m, top, axis=1)[:, None, :]).reshape(n, -1)
+
+        row, col = np.nonzero(firing > 0)
+        rule_idx, src = comp.lookup(keys[row, col])
+        sample, f = row[src], firing[row, col][src]
+
+        combine = np.add if reduce == "sum" else np.maximum
+        strengths = []
+        for j, labels in enumerate(comp.output_labels):
+            strength = np.zeros((n, len(labels)), dtype=self.dtype)
+            combine.at(strength, (sample, comp.consequents[rule_idx, j]), f)
+            strengths.append(strength)
+        return strengths, np.bincount(sample, minlength=n)
+
+    @staticmethod
+    def _label_strength(firing: np.ndarray, groups: List[np.ndarray], reduce: str = "max",
+                        dtype=np.float64) -> np.ndarray:
+        """Kekuatan per label output (maksimum, atau jumlah bila reduce="sum"), berbentuk (N, jumlah label)."""
+        strength = np.zeros((firing.shape[0], len(groups)), dtype=dtype)
+        for k, group in enumerate(groups):
+            if group.size:
+                strength[:, k] = getattr(firing[:, group], reduce)(axis=1)
+        return strength
+
+    @staticmethod
+    def _clip_aggregate(x: np.ndarray, mfs: Dict[str, np.ndarray], strength: np.ndarray) -> np.ndarray:
+        """Clipping dan agregasi (max) untuk satu blok sampel, berbentuk (N, len(x))."""
+        agg = np.zeros((strength.shape[0], x.size), dtype=x.dtype)
+        for k, mf in enumerate(mfs.values()):
+            np.maximum(agg, np.minimum(mf, strength[:, k:k + 1]), out=agg)
+        return agg
+
+    # Centroid diskrit per baris; NaN bila agregasi kosong
+    _centroid_rows = staticmethod(defuzzifiers.centroid)
+
+    def defuzz_strength(self, output: str, strength: np.ndarray) -> np.ndarray:
+        """
+        Nilai tegas dari kekuatan per label konsekuen, `strength` berbentuk (N, jumlah label),
+        untuk sebuah output (mis. "flood" atau "depth"). NaN bila tidak ada label yang aktif.
+        Untuk centroid dan analytic hasilnya sama dengan jalur clipping + agregasi + centroid (diskrit, atau
+        analytic_centroid) hingga galat pembulatan, tanpa membentuk agregasi per sampel (lihat _subset_tables).
+        Metode lain memakai fungsi dari defuzzifiers.py; untuk sugeno `strength` adalah jumlah firing per label.
+        """
+        x, mfs = self.universes[output], self.output_mfs[output]
+        params = self.output_params[self.output_names[self.output_keys.index(output)]]
+        strength = np.asarray(strength, dtype=float)
+        if self._defuzz_kind == defuzzifiers.STRENGTH:
+            return self._defuzz_func(self.singleton_values(output), strength)
+        if self.defuzz not in ("centroid", "analytic"):
+            # Baris kekuatan sering berulang (dataran MF input), jadi agregasi hanya untuk baris unik, per blok
+            strength = np.ascontiguousarray(strength)
+            rows = strength.view(np.dtype((np.void, strength.dtype.itemsize * strength.shape[1]))).ravel()
+            _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+            unique = strength[first]
+            vals = np.empty(unique.shape[0])
+            for start in range(0, unique.shape[0], 2048):
+                block = unique[start:start + 2048]
+                vals[start:start + 2048] = self._defuzz_func(x, self._clip_aggregate(x, mfs, block))
+            return vals[inverse.reshape(-1)]
+        if len(params) > 10:  # 2^L subset terlalu banyak, pakai jalur per sampel
+            if self.defuzz == "analytic":
+                return self.analytic_centroid(list(params.values()), strength, x[0], x[-1])
+            return self._centroid_rows(x, self._clip_aggregate(x, mfs, strength))
+
+        area = np.zeros(strength.shape[0])
+        moment = np.zeros(strength.shape[0])
+        if self.defuzz == "analytic":
+            subsets, seg_subset, sign, x0, x1, g0, slope = self._subset_segments(
+                output, list(params.values()), x[0], x[-1])
+            h_subset = np.stack([strength[:, labels].min(axis=1) for labels in subsets], axis=1)
+            h = h_subset[:, seg_subset]  # (N, jumlah segmen)
+            # min(g, h) linear di kedua sisi titik potong g = h di dalam segmen
+            with np.errstate(divide="ignore", invalid="ignore"):
+                xc = np.where(slope != 0, x0 + (h - g0) / slope, x0)
+            xc = np.clip(xc, x0, x1)
+            y0 = np.minimum(g0, h)
+            yc = np.minimum(g0 + slope * (xc - x0), h)
+            y1 = np.minimum(g0 + slope * (x1 - x0), h)
+            area = ((xc - x0) * (y0 + yc) + (x1 - xc) * (yc + y1)) @ sign / 2
+            moment = ((xc - x0) * (x0 * (2 * y0 + yc) + xc * (y0 + 2 * yc))
+                      + (x1 - xc) * (xc * (2 * yc + y1) + x1 * (yc + 2 * y1))) @ sign / 6
+        else:
+            for labels, sign, g, cum_g, cum_x, cum_xg, total_x in self._subset_tables(output, x, mfs):
+                h = strength[:, labels].min(axis=1)
+                m = np.searchsorted(g, h, side="left")  # titik grid dengan g < h
+                area += sign * (cum_g[m] + h * (g.size - m))
+                moment += sign * (cum_xg[m] + h * (total_x - cum_x[m]))
+
+        out = np.full(strength.shape[0], np.nan)
+        ok = area > 0
+        out[ok] = moment[ok] / area[ok]
+        return out
+
+    def _subset_tables(self, output: str, x: np.ndarray, mfs: Dict[str, np.ndarray]) -> List[Tuple]:
+        """
+        Tabel untuk defuzz_strength. Dengan inklusi-eksklusi,
+        max_k min(mf_k, h_k) = sum_S (-1)^(|S|+1) min(g_S, h_S), dengan g_S = min MF dalam subset S
+        dan h_S = min kekuatan dalam S. Jumlah sum_x min(g_S, h) dan sum_x x*min(g_S, h) untuk
+        sembarang h dihitung dari nilai g_S terurut dan jumlah kumulatifnya (satu searchsorted).
+        Subset yang MF-nya tidak beririsan (g_S = 0) dilewati.
+        """
+        tables = self._subset_cache.get(output)
+        if tables is not None:
+            return tables
+        curves = list(mfs.values())
+        tables = []
+        for size in range(1, len(curves) + 1):
+            for labels in itertools.combinations(range(len(curves)), size):
+                g = np.min([curves[k] for k in labels], axis=0)
+                if not g.any():
+                    continue
+                order = np.argsort(g, kind="stable")
+                gs, xs = g[order], x[order]
+                zero = np.zeros(1)
+                tables.append((
+                    list(labels),
+                    1.0 if size % 2 else -1.0,
+                    gs,
+                    np.concatenate([zero, np.cumsum(gs)]),
+                    np.concatenate([zero, np.cumsum(xs)]),
+                    np.concatenate([zero, np.cumsum(xs * gs)]),
+                    float(x.sum()),
+                ))
+        self._subset_cache[output] = tables
+        return tables
+
+    def _subset_segments(self, output: str, params: List[List[float]], lo: float, hi: float) -> Tuple:
+        """
+        Padanan kontinu _subset_tables untuk mode analytic: g_S (min trapesium dalam S) linear di antara
+        titik patahnya (sudut trapesium dan perpotongan sisi miring). Segmen semua subset digabung menjadi
+        satu array (x0, x1, g0, slope) beserta indeks subset dan tanda inklusi-eksklusi per segmen.
+        """
+        key = output + ":analytic"
+        tables = self._subset_cache.get(key)
+        if tables is not None:
+            return tables
+        subsets, seg_subset, sign, x0s, x1s, g0s, slopes = [], [], [], [], [], [], []
+        for size in range(1, len(params) + 1):
+            for labels in itertools.combinations(range(len(params)), size):
+                subset = [params[k] for k in labels]
+                lines = []
+                for a, b, c, d in subset:
+                    if b > a:
+                        lines.append((1.0 / (b - a), -a / (b - a)))
+                    if d > c:
+                        lines.append((-1.0 / (d - c), d / (d - c)))
+                points = [lo, hi] + [v for p in subset for v in p]
+                for i, (m1, q1) in enumerate(lines):
+                    for m2, q2 in lines[i + 1:]:
+                        if m1 != m2:
+                            points.append((q2 - q1) / (m1 - m2))
+                xs = np.unique(np.clip(points, lo, hi))
+                x0, x1 = xs[:-1], xs[1:]
+                dx = x1 - x0
+
+                # Nilai ujung dari titik kuartil, agar tepi tegak (a == b atau c == d) tidak ikut terbaca
+                def g(v):
+                    return np.min([self.batch_trapmf(v, p) for p in subset], axis=0)
+                g_q1, g_q3 = g(x0 + dx / 4), g(x1 - dx / 4)
+                g0 = np.clip(g_q1 - (g_q3 - g_q1) / 2, 0.0, 1.0)
+                g1 = np.clip(g_q3 + (g_q3 - g_q1) / 2, 0.0, 1.0)
+                keep = (g0 > 0) | (g1 > 0)  # segmen dengan g = 0 tidak menyumbang luas
+                if not keep.any():
+                    continue
+                subsets.append(list(labels))
+                seg_subset.append(np.full(keep.sum(), len(subsets) - 1))
+                sign.append(np.full(keep.sum(), 1.0 if size % 2 else -1.0))
+                x0s.append(x0[keep])
+                x1s.append(x1[keep])
+                g0s.append(g0[keep])
+                slopes.append(((g1 - g0) / dx)[keep])
+        tables = (subsets, np.concatenate(seg_subset), np.concatenate(sign), np.concatenate(x0s),
+                  np.concatenate(x1s), np.concatenate(g0s), np.concatenate(slopes))
+        self._subset_cache[key] = tables
+        return tables
@@ -0,0 +1,127 @@
+"""
+Riwayat evaluasi dalam ring buffer berbasis array (input, firing semua rule, output, waktu).
+Ekspor dilakukan sekaligus per blok: CSV lewat modul csv (quoting benar) atau .npz biner terkompresi.
+"""
+import csv
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from status import DEPTH_LEVELS, FLOOD_LEVELS, classify_array
+
+INPUT_COLUMNS = ["cr", "wl", "du"]
+OUTPUT_COLUMNS = ["flood_val", "depth_val"]
+
+# Firing di CSV dibulatkan ke 4 desimal; teksnya diambil dari tabel ini (jauh lebih cepat dari format per sel)
+FIRING_DECIMALS = 4
+_FIRING_TEXT = np.array([str(round(i / 10 ** FIRING_DECIMALS, FIRING_DECIMALS))
+                         for i in range(10 ** FIRING_DECIMALS + 1)], dtype=object)
+
+
+class EvaluationHistory:
+    """
+    capacity: jumlah evaluasi maksimum; bila penuh, evaluasi terlama ditimpa.
+    rules: rule base engine (tuple label) untuk nama kolom firing; reset() bila rule base berganti.
+    Firing disimpan float32 agar ringkas (27 rule x 100.000 evaluasi ~ 10 MB).
+    """
+
+    def __init__(self, rules: Sequence[Tuple], capacity: int = 100000):
+        self.capacity = capacity
+        self.reset(rules)
+
+    def reset(self, rules: Optional[Sequence[Tuple]] = None):
+        if rules is not None:
+            self.rules = list(rules)
+        n_rules = len(self.rules)
+        self.timestamps = np.zeros(self.capacity)
+        self.inputs = np.zeros((self.capacity, len(INPUT_COLUMNS)))
+        self.firing = np.zeros((self.capacity, n_rules), dtype=np.float32)
+        self.outputs = np.full((self.capacity, len(OUTPUT_COLUMNS)), np.nan)
+        self._next = 0  # posisi tulis berikutnya
+        self.total = 0  # jumlah evaluasi sejak reset, termasuk yang sudah tertimpa
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def record(self, inputs: Sequence[float], firing: np.ndarray, flood_val: Optional[float],
+               depth_val: Optional[float], timestamp: Optional[float] = None):
+        """Mencatat satu evaluasi; firing berisi kekuatan semua rule (0 untuk rule tidak aktif)."""
+        i = self._next
+        self.timestamps[i] = time.time() if timestamp is None else timestamp
+        self.inputs[i] = inputs
+        self.firing[i] = firing
+        self.outputs[i, 0] = np.nan if flood_val is None else flood_val
+        self.outputs[i, 1] = np.nan if depth_val is None else depth_val
+        self._next = (i + 1) % self.capacity
+        self.total += 1
+
+    def record_result(self, inputs: Sequence[float], result: Dict, timestamp: Optional[float] = None):
+        """Mencatat hasil FuzzyFloodEngine.infer() (daftar rule aktif diubah ke vektor firing)."""
+        firing = np.zeros(len(self.rules), dtype=np.float32)
+        for r in result["active"]:
+            firing[r["id"] - 1] = r["firing"]
+        self.record(inputs, firing, result["flood_val"], result["depth_val"], timestamp)
+
+    def _order(self) -> np.ndarray:
+        """Indeks baris dalam urutan kronologis."""
+        n = len(self)
+        if self.total <= self.capacity:
+            return np.arange(n)
+        return (np.arange(n) + self._next) % self.capacity
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Salinan kronologis seluruh riwayat."""
+        order = self._order()
+        return {
+            "timestamp": self.timestamps[order],
+            "inputs": self.inputs[order],
+            "firing": self.firing[order],
+            "outputs": self.outputs[order],
+        }
+
+    def rule_columns(self) -> List[str]:
+        return [f"R{i + 1} ({r[0]}/{r[1]}/{r[2]})" for i, r in enumerate(self.rules)]
+
+    def export_csv(self, path: str, chunk_size: int = 8192) -> int:
+        """
+        Menulis riwayat ke CSV per blok `chunk_size` baris; mengembalikan jumlah baris.
+        Timestamp ditulis ISO 8601 UTC, output dan firing dibulatkan 4 desimal;
+        output tanpa rule aktif ditulis sebagai sel kosong.
+        """
+        order = self._order()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp"] + INPUT_COLUMNS + OUTPUT_COLUMNS
+                            + ["flood_status", "depth_status"] + self.rule_columns())
+            for start in range(0, order.size, chunk_size):
+                idx = order[start:start + chunk_size]
+                stamps = np.datetime_as_string((self.timestamps[idx] * 1000).astype("datetime64[ms]"),
+                                               unit="ms", timezone="UTC").tolist()
+                outputs = self.outputs[idx]
+                # NaN (tidak ada rule aktif) ditulis sebagai sel kosong
+                out_cells = np.where(np.isnan(outputs), "", np.round(outputs, 4).astype(str)).tolist()
+                flood_status = classify_array(outputs[:, 0], FLOOD_LEVELS).tolist()
+                depth_status = classify_array(outputs[:, 1], DEPTH_LEVELS).tolist()
+                inputs = self.inputs[idx].tolist()
+                firing = _FIRING_TEXT[np.rint(self.firing[idx] * 10 ** FIRING_DECIMALS).astype(np.intp)].tolist()
+                writer.writerows(
+                    [t] + i + o + [fs, ds] + r
+                    for t, i, o, fs, ds, r in zip(stamps, inputs, out_cells, flood_status, depth_status, firing)
+                )
+        return int(order.size)
+
+    def export_npz(self, path: str) -> int:
+        """Menulis riwayat ke .npz terkompresi (array mentah plus label kolom); mengembalikan jumlah baris."""
+        data = self.arrays()
+        np.savez_compressed(
+            path,
+            timestamp=data["timestamp"],
+            inputs=data["inputs"],
+            firing=data["firing"],
+            outputs=data["outputs"],
+            input_columns=np.array(INPUT_COLUMNS),
+            output_columns=np.array(OUTPUT_COLUMNS),
+            rules=np.array([list(r) for r in self.rules]),
+        )
+        return len(self)
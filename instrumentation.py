@@ -0,0 +1,104 @@
+"""
+Instrumentasi opsional FuzzyFloodEngine: jumlah panggilan dan histogram waktu per tahap
+(fuzzifikasi, evaluasi rule, agregasi, defuzzifikasi), plus jumlah rule aktif per sampel.
+Bila engine tidak diberi instrumentasi, biayanya hanya satu pengecekan `is None` per panggilan.
+"""
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+from metrics import Histogram
+
+STAGES = ("fuzzify", "rules", "aggregate", "defuzz")
+CALL_PATHS = ("infer", "infer_batch")
+
+
+class EngineInstrumentation:
+    """
+    Satu objek boleh dipakai bersama beberapa engine (mis. saat hot reload konfigurasi).
+    Waktu tahap dicatat terpisah per jalur: per panggilan untuk infer(), per blok `chunk_size`
+    (bersama jumlah sampel di blok tersebut) untuk infer_batch().
+    """
+
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stage_seconds = {(p, s): Histogram.exponential(1e-6, 2, 24) for p in CALL_PATHS for s in STAGES}
+            self.stage_samples = dict.fromkeys(self.stage_seconds, 0)
+            self.calls = dict.fromkeys(CALL_PATHS, 0)
+            self.samples = dict.fromkeys(CALL_PATHS, 0)
+            self.active_rules = Histogram(list(range(17)) + [32, 64, 128, 256])
+
+    def record_call(self, path: str, samples: int = 1):
+        with self._lock:
+            self.calls[path] += 1
+            self.samples[path] += samples
+
+    def record_stage(self, path: str, stage: str, seconds: float, samples: int = 1):
+        with self._lock:
+            self.stage_seconds[path, stage].record(seconds)
+            self.stage_samples[path, stage] += samples
+
+    def record_active(self, counts):
+        """Jumlah rule aktif: satu bilangan (jalur skalar) atau array per sampel (jalur batch)."""
+        with self._lock:
+            if np.ndim(counts) == 0:
+                self.active_rules.record(counts)
+            else:
+                self.active_rules.record_array(counts)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "samples": dict(self.samples),
+                "stages": {p: {s: dict(self.stage_seconds[p, s].to_dict(), samples=self.stage_samples[p, s])
+                               for s in STAGES}
+                           for p in CALL_PATHS},
+                "active_rules": self.active_rules.to_dict(),
+            }
+
+    def to_prometheus(self, prefix: str = "fuzzy_engine") -> str:
+        """Ekspor dalam format teks Prometheus (text/plain; version=0.0.4)."""
+        with self._lock:
+            lines: List[str] = [
+                f"# HELP {prefix}_calls_total Jumlah panggilan inferensi per jalur",
+                f"# TYPE {prefix}_calls_total counter",
+            ]
+            lines += [f'{prefix}_calls_total{{path="{p}"}} {self.calls[p]}' for p in CALL_PATHS]
+            lines += [
+                f"# HELP {prefix}_samples_total Jumlah sampel yang dinilai per jalur",
+                f"# TYPE {prefix}_samples_total counter",
+            ]
+            lines += [f'{prefix}_samples_total{{path="{p}"}} {self.samples[p]}' for p in CALL_PATHS]
+            lines += [
+                f"# HELP {prefix}_stage_seconds Waktu per tahap inferensi (per panggilan atau per blok batch)",
+                f"# TYPE {prefix}_stage_seconds histogram",
+            ]
+            for (p, s), h in self.stage_seconds.items():
+                lines += h.prometheus_lines(f"{prefix}_stage_seconds", f'path="{p}",stage="{s}"')
+            lines += [
+                f"# HELP {prefix}_active_rules Jumlah rule aktif per sampel",
+                f"# TYPE {prefix}_active_rules histogram",
+            ]
+            lines += self.active_rules.prometheus_lines(f"{prefix}_active_rules")
+            return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Ringkasan satu baris untuk status bar GUI."""
+        with self._lock:
+            parts = []
+            for s in STAGES:
+                mean = self.stage_seconds["infer", s].mean()
+                parts.append(f"{s} {mean * 1e6:.0f}µs" if mean is not None else f"{s} -")
+            rules = self.active_rules.mean()
+            rules = f"{rules:.1f}" if rules is not None else "-"
+            return (f"Inferensi: {self.calls['infer']} skalar, {self.samples['infer_batch']} sampel batch | "
+                    f"rata-rata {' · '.join(parts)} | rule aktif {rules}")
@@ -0,0 +1,92 @@
+"""Histogram sederhana dengan bucket logaritmik, untuk latensi dan ukuran batch."""
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+class Histogram:
+    """
+    Histogram dengan batas bucket tetap (bucket terakhir +inf).
+    Persentil diperkirakan dari batas atas bucket, cukup untuk p50/p99 operasional.
+    """
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = sorted(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @classmethod
+    def exponential(cls, start: float, factor: float, count: int) -> "Histogram":
+        return cls([start * factor ** i for i in range(count)])
+
+    def record(self, value: float):
+        lo, hi = 0, len(self.bounds)
+        while lo < hi:  # bucket pertama dengan batas >= value
+            mid = (lo + hi) // 2
+            if self.bounds[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.counts[lo] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def record_array(self, values: np.ndarray):
+        """Mencatat banyak nilai sekaligus (bucket sama dengan record())."""
+        values = np.asarray(values, dtype=float).ravel()
+        if not values.size:
+            return
+        idx = np.searchsorted(self.bounds, values, side="left")
+        for i, c in enumerate(np.bincount(idx, minlength=len(self.counts)).tolist()):
+            self.counts[i] += c
+        self.count += values.size
+        self.total += float(values.sum())
+        lo, hi = float(values.min()), float(values.max())
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self.count:
+            return None
+        target = math.ceil(self.count * p / 100.0)
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self.bounds[i] if i < len(self.bounds) else self.max
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.mean(),
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "buckets": [[b, c] for b, c in zip(self.bounds + ["+Inf"], self.counts) if c],
+        }
+
+    def prometheus_lines(self, name: str, labels: str = "") -> List[str]:
+        """Baris sampel format teks Prometheus (bucket kumulatif, _sum, _count); `labels` mis. 'stage="fuzzify"'."""
+        sep = "," if labels else ""
+        lines = []
+        seen = 0
+        for b, c in zip(self.bounds + ["+Inf"], self.counts):
+            seen += c
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{b}"}} {seen}')
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.total}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
@@ -0,0 +1,384 @@
+"""
+Penyetelan parameter MF trapesium (CR_params, WL_params, ..., Flood_params, Depth_params) terhadap CSV
+kejadian historis berlabel, dengan differential evolution (tanpa turunan, cukup NumPy).
+Setiap generasi seluruh populasi dievaluasi sekaligus pada seluruh data (MF sebagai array
+(kandidat, label, sampel)), dan populasi bisa dibagi ke beberapa proses. Hasil ditulis sebagai config JSON
+(format engine_config.py), siap dipakai `python app.py --config hasil.json`.
+
+Kolom target (minimal satu): nilai risiko (--flood-col, 0-100), kedalaman teramati (--depth-col, m)
+atau status AMAN/WASPADA/BAHAYA (--status-col).
+
+Contoh:
+    python mf_tuning.py kejadian.csv tuned.json --depth-col kedalaman --status-col status
+    python mf_tuning.py kejadian.csv tuned.json --flood-col risiko --vars CR WL DU --generations 200 --workers 4
+"""
+import argparse
+import copy
+import csv
+import os
+import sys
+import time
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from engine_config import load_config, save_config
+from fuzzy_engine import FuzzyFloodEngine
+from score_cli import detect_delimiter, parse_column
+from status import FLOOD_LEVELS
+
+
+class EventData:
+    """Input dan target kejadian historis; target berupa {"flood": nilai, "depth": nilai, "status": indeks}."""
+
+    def __init__(self, inputs: List[np.ndarray], targets: Dict[str, np.ndarray]):
+        if not targets:
+            raise ValueError("Butuh minimal satu kolom target (--flood-col, --depth-col atau --status-col)")
+        self.inputs = inputs
+        self.targets = targets
+
+    def __len__(self) -> int:
+        return self.inputs[0].size
+
+    def subset(self, idx: np.ndarray) -> "EventData":
+        return EventData([v[idx] for v in self.inputs], {k: v[idx] for k, v in self.targets.items()})
+
+    def split(self, holdout: float, seed: int = 0) -> Tuple["EventData", Optional["EventData"]]:
+        """(latih, uji); uji None bila holdout 0."""
+        if holdout <= 0:
+            return self, None
+        order = np.random.default_rng(seed).permutation(len(self))
+        cut = len(self) - max(1, int(round(len(self) * holdout)))
+        return self.subset(order[:cut]), self.subset(order[cut:])
+
+
+def load_events(path: str, input_cols: Sequence[str], flood_col: Optional[str] = None,
+                depth_col: Optional[str] = None, status_col: Optional[str] = None,
+                delimiter: Optional[str] = None) -> EventData:
+    """Membaca CSV/TSV kejadian; baris dengan input atau target tidak valid dibuang."""
+    with open(path, newline="") as f:
+        header_line = f.readline()
+        delimiter = delimiter or detect_delimiter(path, header_line)
+        header = next(csv.reader([header_line], delimiter=delimiter))
+        rows = list(csv.reader(f, delimiter=delimiter))
+
+    def column(name: str) -> List[str]:
+        if name not in header:
+            raise ValueError(f"Kolom '{name}' tidak ditemukan di header: {header}")
+        i = header.index(name)
+        return [r[i].strip() if i < len(r) else "" for r in rows]
+
+    inputs = [parse_column(column(c)) for c in input_cols]
+    targets = {}
+    if flood_col:
+        targets["flood"] = parse_column(column(flood_col))
+    if depth_col:
+        targets["depth"] = parse_column(column(depth_col))
+    if status_col:
+        labels = [label.upper() for _, label, _ in FLOOD_LEVELS]
+        targets["status"] = np.array([labels.index(v.upper()) if v.upper() in labels else np.nan
+                                      for v in column(status_col)])
+    data = EventData(inputs, targets)
+    ok = np.logical_and.reduce([np.isfinite(v) for v in inputs + list(targets.values())])
+    if not ok.any():
+        raise ValueError(f"{path}: tidak ada baris valid")
+    return data.subset(np.flatnonzero(ok))
+
+
+class ParameterSpace:
+    """
+    Pemetaan vektor parameter bebas <-> config. Setiap trapesium [a, b, c, d] dibatasi ke rentang variabelnya
+    (input: min a .. max d, output: universe) dan diurutkan agar a <= b <= c <= d. Titik yang berada tepat di
+    batas rentang (bahu seperti [0, 0, 50, 100]) tetap, sehingga MF tepi tetap menutupi ujung domain.
+    """
+
+    def __init__(self, config: Dict[str, Any], variables: Optional[Sequence[str]] = None):
+        self.config = copy.deepcopy(config)
+        engine = FuzzyFloodEngine(config=self.config)
+        names = list(config["inputs"]) + list(config["outputs"])
+        variables = list(variables or names)
+        unknown = [v for v in variables if v not in names]
+        if unknown:
+            raise ValueError(f"Variabel tidak dikenal: {', '.join(unknown)} (pilihan: {', '.join(names)})")
+
+        self.groups: List[Tuple[str, str, str]] = []
+        full, lo, hi, free = [], [], [], []
+        for section in ("inputs", "outputs"):
+            for name, mfs in config[section].items():
+                if section == "inputs":
+                    span = (min(p[0] for p in mfs.values()), max(p[3] for p in mfs.values()))
+                else:
+                    x = engine.universes[name.lower()]
+                    span = (float(x[0]), float(x[-1]))
+                for label, params in mfs.items():
+                    self.groups.append((section, name, label))
+                    full.append([float(v) for v in params])
+                    lo.append([span[0]] * 4)
+                    hi.append([span[1]] * 4)
+                    free.append([name in variables and span[0] < v < span[1] for v in params])
+        self.full0 = np.array(full)
+        self.free = np.array(free)
+        self.lower = np.array(lo)[self.free]
+        self.upper = np.array(hi)[self.free]
+        self.x0 = self.full0[self.free]
+        self.input_groups = [[g for g, (s, n, _) in enumerate(self.groups) if s == "inputs" and n == name]
+                             for name in config["inputs"]]
+        self.output_groups = [[g for g, (s, n, _) in enumerate(self.groups) if s == "outputs" and n == name]
+                              for name in config["outputs"]]
+
+    @property
+    def size(self) -> int:
+        return self.x0.size
+
+    def expand(self, pop: np.ndarray) -> np.ndarray:
+        """Vektor bebas (P, D) -> semua trapesium (P, jumlah MF, 4), sudah dibatasi dan diurutkan."""
+        pop = np.clip(np.atleast_2d(pop), self.lower, self.upper)
+        full = np.broadcast_to(self.full0, (pop.shape[0],) + self.full0.shape).copy()
+        full[:, self.free] = pop
+        return np.sort(full, axis=2)
+
+    def repair(self, pop: np.ndarray) -> np.ndarray:
+        return self.expand(pop)[:, self.free]
+
+    def to_config(self, vector: np.ndarray) -> Dict[str, Any]:
+        config = copy.deepcopy(self.config)
+        for (section, name, label), params in zip(self.groups, self.expand(vector)[0]):
+            config[section][name][label] = [round(float(v), 6) for v in params]
+        return config
+
+
+def trap_population(x: np.ndarray, params: np.ndarray) -> np.ndarray:
+    """Trapesium untuk banyak parameter sekaligus: x (N,), params (..., 4) -> (..., N); tepi sama dengan batch_trapmf."""
+    a, b, c, d = (params[..., i, None] for i in range(4))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y = np.where((x > a) & (x <= b) & (b > a), (x - a) / (b - a), 0.0)
+        np.maximum(y, np.where((x >= c) & (x < d) & (d > c), (d - x) / (d - c), 0.0), out=y)
+    y[(x > b) & (x < c)] = 1.0
+    y[((a == b) & (x == a)) | ((c == d) & (x == d))] = 1.0
+    return y
+
+
+class PopulationEvaluator:
+    """
+    Inferensi Mamdani (centroid analitik) untuk seluruh populasi sekaligus: fuzzifikasi dan firing rule
+    berbentuk (P, ..., N) per blok `chunk_size` pasangan kandidat x sampel, lalu centroid per kandidat.
+    """
+
+    def __init__(self, space: ParameterSpace, data: EventData, chunk_size: int = 16384):
+        self.space = space
+        self.data = data
+        self.chunk_size = chunk_size
+        engine = FuzzyFloodEngine(config=space.config)
+        comp = engine.compiled_rules()
+        self.antecedents = comp.antecedents
+        self.groups = comp.groups
+        self.output_keys = engine.output_keys
+        self.ranges = [(float(engine.universes[k][0]), float(engine.universes[k][-1])) for k in self.output_keys]
+        for key in ("flood", "depth"):
+            if key in data.targets and key not in self.output_keys:
+                raise ValueError(f"Config tidak memiliki output '{key}' untuk target yang diminta")
+        if "status" in data.targets and "flood" not in self.output_keys:
+            raise ValueError("Target status membutuhkan output 'Flood'")
+
+    def predict(self, pop: np.ndarray) -> Dict[str, np.ndarray]:
+        """Output setiap kandidat, {"<output>": (P, N)}; NaN bila tidak ada rule aktif."""
+        full = self.space.expand(pop)
+        p, n = full.shape[0], len(self.data)
+        out = {key: np.full((p, n), np.nan) for key in self.output_keys}
+        step = max(1, self.chunk_size // p)  # blok dibatasi jumlah pasangan kandidat x sampel
+        for start in range(0, n, step):
+            sl = slice(start, min(start + step, n))
+            firing = None
+            for j, (x, groups) in enumerate(zip(self.data.inputs, self.space.input_groups)):
+                mu = trap_population(x[sl], full[:, groups])  # (P, label, m)
+                f = mu[:, self.antecedents[:, j]]
+                firing = f if firing is None else np.minimum(firing, f)
+            for j, (key, groups, (lo, hi)) in enumerate(zip(self.output_keys, self.space.output_groups, self.ranges)):
+                strength = np.zeros((p, sl.stop - sl.start, len(groups)))
+                for k, rule_idx in enumerate(self.groups[j]):
+                    if rule_idx.size:
+                        strength[:, :, k] = firing[:, rule_idx].max(axis=1)
+                for i in range(p):  # centroid sudah tervektorisasi per sampel; loop hanya sepanjang populasi
+                    out[key][i, sl] = FuzzyFloodEngine.analytic_centroid(full[i, groups].tolist(), strength[i], lo, hi)
+        return out
+
+    def loss(self, pop: np.ndarray) -> np.ndarray:
+        """
+        Rata-rata galat kuadrat ternormalisasi (dibagi rentang output) per target, dijumlahkan; status dinilai dari
+        jarak nilai risiko ke interval statusnya. Sampel tanpa rule aktif bernilai galat 1.
+        """
+        pred = self.predict(pop)
+        total = np.zeros(pred[self.output_keys[0]].shape[0])
+        for key in ("flood", "depth"):
+            if key in self.data.targets:
+                lo, hi = self.ranges[self.output_keys.index(key)]
+                err = ((pred[key] - self.data.targets[key]) / (hi - lo)) ** 2
+                total += np.where(np.isnan(err), 1.0, err).mean(axis=1)
+        if "status" in self.data.targets:
+            lo, hi = self.ranges[self.output_keys.index("flood")]
+            upper = np.array([limit for limit, _, _ in FLOOD_LEVELS])
+            lower = np.concatenate([[-np.inf], upper[:-1]])
+            s = self.data.targets["status"].astype(int)
+            dist = np.maximum(lower[s] - pred["flood"], 0) + np.maximum(pred["flood"] - upper[s], 0)
+            err = (dist / (hi - lo)) ** 2
+            total += np.where(np.isnan(err), 1.0, err).mean(axis=1)
+        return total
+
+    def metrics(self, vector: np.ndarray) -> Dict[str, float]:
+        """Galat satu kandidat: loss, RMSE per target numerik dan akurasi status."""
+        pred = {k: v[0] for k, v in self.predict(vector).items()}
+        result = {"loss": float(self.loss(vector)[0])}
+        for key in ("flood", "depth"):
+            if key in self.data.targets:
+                err = pred[key] - self.data.targets[key]
+                result[f"{key}_rmse"] = float(np.sqrt(np.nanmean(err ** 2)))
+        if "status" in self.data.targets:
+            upper = np.array([limit for limit, _, _ in FLOOD_LEVELS])
+            status = np.searchsorted(upper, pred["flood"], side="right")
+            ok = np.isfinite(pred["flood"])
+            result["status_accuracy"] = float((ok & (status == self.data.targets["status"])).mean())
+        result["undefined_fraction"] = float(np.isnan(pred[self.output_keys[0]]).mean())
+        return result
+
+
+# State per proses worker (lihat parallel_scoring.py)
+_evaluator: Optional[PopulationEvaluator] = None
+
+
+def _init_worker(space: ParameterSpace, data: EventData):
+    global _evaluator
+    _evaluator = PopulationEvaluator(space, data)
+
+
+def _loss_block(pop: np.ndarray) -> np.ndarray:
+    return _evaluator.loss(pop)
+
+
+def differential_evolution(space: ParameterSpace, data: EventData, generations: int = 100, population: int = 40,
+                           mutation: float = 0.6, crossover: float = 0.9, spread: float = 0.05, seed: int = 0,
+                           workers: int = 1,
+                           callback: Optional[Callable[[int, float], None]] = None) -> Tuple[np.ndarray, float, List[float]]:
+    """
+    DE/current-to-best/1/bin: tiap kandidat ditarik ke kandidat terbaik (parameter awal biasanya sudah
+    cukup baik) plus selisih dua kandidat acak. Populasi awal: parameter saat ini plus variasi normal selebar `spread` x rentang variabel.
+    Kandidat diperbaiki (dibatasi dan diurutkan) sebelum dievaluasi. workers > 1 membagi populasi ke
+    beberapa proses. Mengembalikan (vektor terbaik, loss terbaik, loss terbaik per generasi).
+    """
+    if population < 4:
+        raise ValueError("Populasi differential evolution minimal 4")
+    rng = np.random.default_rng(seed)
+    dim = space.size
+    span = space.upper - space.lower
+    pool = Pool(workers, initializer=_init_worker, initargs=(space, data)) if workers > 1 else None
+    local = None if pool else PopulationEvaluator(space, data)
+
+    def evaluate(pop: np.ndarray) -> np.ndarray:
+        if pool is None:
+            return local.loss(pop)
+        return np.concatenate(pool.map(_loss_block, np.array_split(pop, min(workers, len(pop)))))
+
+    try:
+        pop = space.repair(space.x0 + rng.normal(0.0, spread, (population, dim)) * span)
+        pop[0] = space.x0
+        fit = evaluate(pop)
+        history = [float(fit.min())]
+        rows = np.arange(population)
+        for gen in range(1, generations + 1):
+            # dua kandidat berbeda per baris, tidak termasuk baris itu sendiri
+            order = np.argsort(rng.random((population, population)) + np.eye(population), axis=1)
+            r1, r2 = order[:, 0], order[:, 1]
+            mutant = pop + mutation * (pop[np.argmin(fit)] - pop) + mutation * (pop[r1] - pop[r2])
+            cross = rng.random((population, dim)) < crossover
+            cross[rows, rng.integers(dim, size=population)] = True
+            trial = space.repair(np.where(cross, mutant, pop))
+            trial_fit = evaluate(trial)
+            better = trial_fit <= fit
+            pop[better] = trial[better]
+            fit[better] = trial_fit[better]
+            history.append(float(fit.min()))
+            if callback is not None:
+                callback(gen, history[-1])
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    best = int(np.argmin(fit))
+    return pop[best], float(fit[best]), history
+
+
+def _format_metrics(m: Dict[str, float]) -> str:
+    parts = [f"loss {m['loss']:.5f}"]
+    for key, label in (("flood_rmse", "RMSE risiko"), ("depth_rmse", "RMSE kedalaman")):
+        if key in m:
+            parts.append(f"{label} {m[key]:.3f}")
+    if "status_accuracy" in m:
+        parts.append(f"akurasi status {m['status_accuracy']:.1%}")
+    parts.append(f"tanpa rule aktif {m['undefined_fraction']:.1%}")
+    return ", ".join(parts)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Setel parameter MF trapesium terhadap data kejadian historis.")
+    parser.add_argument("events", help="CSV/TSV kejadian historis")
+    parser.add_argument("output", help="file config JSON hasil")
+    parser.add_argument("--config", help="config awal (bawaan: parameter engine bawaan)")
+    parser.add_argument("--input-cols", nargs="+", help="kolom input sesuai urutan config (bawaan: cr wl du)")
+    parser.add_argument("--flood-col", help="kolom nilai risiko banjir (0-100)")
+    parser.add_argument("--depth-col", help="kolom kedalaman teramati (m)")
+    parser.add_argument("--status-col", help="kolom status AMAN/WASPADA/BAHAYA")
+    parser.add_argument("--delimiter", help="pemisah kolom; default dideteksi dari file")
+    parser.add_argument("--vars", nargs="+", help="variabel yang disetel (bawaan: semua input dan output)")
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--population", type=int, default=40)
+    parser.add_argument("--mutation", type=float, default=0.6, help="faktor mutasi F")
+    parser.add_argument("--crossover", type=float, default=0.9, help="peluang crossover CR")
+    parser.add_argument("--spread", type=float, default=0.05, help="sebaran populasi awal (fraksi rentang)")
+    parser.add_argument("--holdout", type=float, default=0.2, help="fraksi data uji yang tidak dipakai menyetel")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="jumlah proses evaluasi populasi")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config) if args.config else FuzzyFloodEngine().to_config()
+        input_cols = args.input_cols or [name.lower() for name in config["inputs"]]
+        if len(input_cols) != len(config["inputs"]):
+            raise ValueError(f"Butuh {len(config['inputs'])} kolom input ({', '.join(config['inputs'])})")
+        data = load_events(args.events, input_cols, args.flood_col, args.depth_col, args.status_col, args.delimiter)
+        train, test = data.split(args.holdout, args.seed)
+        space = ParameterSpace(config, args.vars)
+    except (OSError, ValueError) as e:
+        print(f"Kesalahan: {e}", file=sys.stderr)
+        return 1
+
+    print(f"{len(train)} kejadian latih, {len(test) if test else 0} uji; {space.size} parameter bebas, "
+          f"populasi {args.population}, {args.workers} proses")
+    before = {name: PopulationEvaluator(space, d).metrics(space.x0) for name, d in (("latih", train), ("uji", test)) if d}
+    for name, m in before.items():
+        print(f"  awal  {name:<5}: {_format_metrics(m)}")
+
+    t0 = time.perf_counter()
+    step = max(1, args.generations // 10)
+
+    def progress(gen: int, best: float):
+        if gen % step == 0 or gen == args.generations:
+            print(f"  generasi {gen:>4}: loss terbaik {best:.5f} ({time.perf_counter() - t0:.1f} s)")
+
+    best, _, _ = differential_evolution(space, train, args.generations, args.population, args.mutation,
+                                        args.crossover, args.spread, args.seed, args.workers, progress)
+    for name, d in (("latih", train), ("uji", test)):
+        if d:
+            print(f"  akhir {name:<5}: {_format_metrics(PopulationEvaluator(space, d).metrics(best))}")
+
+    tuned = space.to_config(best)
+    try:
+        save_config(tuned, args.output)
+    except (OSError, ValueError) as e:
+        print(f"Kesalahan: {e}", file=sys.stderr)
+        return 1
+    print(f"Config hasil penyetelan tersimpan di {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
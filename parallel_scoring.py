@@ -0,0 +1,175 @@
+"""
+Penilaian batch multi-core. Input dan output berada di `multiprocessing.shared_memory`,
+sehingga worker hanya menerima (nama buffer, rentang indeks) dan tidak ada array besar yang di-pickle.
+Setiap worker memegang satu FuzzyFloodEngine yang dibangun sekali saat pool dibuat.
+
+Contoh:
+    python parallel_scoring.py --bench --samples 4000000
+"""
+import argparse
+import os
+import time
+from multiprocessing import Pool, resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+
+# State per proses worker
+_engine: Optional[FuzzyFloodEngine] = None
+_attached: Dict[Tuple[str, str], Tuple[SharedMemory, SharedMemory]] = {}
+
+
+def _init_worker(config: Optional[Dict[str, Any]], defuzz: str):
+    global _engine
+    _engine = FuzzyFloodEngine(defuzz=defuzz, config=config)
+
+
+def _attach(in_name: str, out_name: str) -> Tuple[SharedMemory, SharedMemory]:
+    key = (in_name, out_name)
+    pair = _attached.get(key)
+    if pair is None:
+        # Buffer dari pemanggilan sebelumnya sudah di-unlink oleh proses induk
+        for old in _attached.values():
+            for shm in old:
+                shm.close()
+        _attached.clear()
+        pair = _attached[key] = (SharedMemory(name=in_name), SharedMemory(name=out_name))
+    return pair
+
+
+def _score_block(task):
+    in_name, out_name, n, start, stop = task
+    shm_in, shm_out = _attach(in_name, out_name)
+    inputs = np.ndarray((3, n), dtype=np.float64, buffer=shm_in.buf)
+    outputs = np.ndarray((2, n), dtype=np.float64, buffer=shm_out.buf)
+    res = _engine.infer_batch(inputs[0, start:stop], inputs[1, start:stop], inputs[2, start:stop])
+    outputs[0, start:stop] = res["flood_val"]
+    outputs[1, start:stop] = res["depth_val"]
+    del inputs, outputs  # lepaskan view sebelum buffer ditutup
+    return stop - start
+
+
+class ParallelScorer:
+    """
+    Pool proses untuk infer_batch pada array besar.
+    Gunakan sebagai context manager agar pool ditutup dengan benar.
+    """
+
+    def __init__(self, workers: Optional[int] = None, config: Optional[Dict[str, Any]] = None,
+                 defuzz: str = "centroid", block_size: int = 65536):
+        self.workers = workers or os.cpu_count() or 1
+        self.block_size = block_size
+        if os.name == "posix":
+            # Worker hasil fork harus berbagi resource tracker dengan proses induk; kalau tidak,
+            # tracker milik worker menganggap buffer bersama bocor dan meng-unlink-nya saat worker berhenti.
+            resource_tracker.ensure_running()
+        self.pool = Pool(self.workers, initializer=_init_worker, initargs=(config, defuzz))
+
+    def score(self, cr, wl, du) -> Dict[str, np.ndarray]:
+        """Sama seperti FuzzyFloodEngine.infer_batch, tetapi dibagi ke semua worker."""
+        cr, wl, du = np.broadcast_arrays(
+            np.asarray(cr, dtype=float), np.asarray(wl, dtype=float), np.asarray(du, dtype=float)
+        )
+        shape = cr.shape
+        n = cr.size
+        if n == 0:
+            return {"flood_val": np.empty(shape), "depth_val": np.empty(shape)}
+
+        shm_in = SharedMemory(create=True, size=3 * n * 8)
+        shm_out = SharedMemory(create=True, size=2 * n * 8)
+        try:
+            inputs = np.ndarray((3, n), dtype=np.float64, buffer=shm_in.buf)
+            inputs[0], inputs[1], inputs[2] = cr.ravel(), wl.ravel(), du.ravel()
+            tasks = [(shm_in.name, shm_out.name, n, start, min(start + self.block_size, n))
+                     for start in range(0, n, self.block_size)]
+            self.pool.map(_score_block, tasks, chunksize=1)
+            outputs = np.ndarray((2, n), dtype=np.float64, buffer=shm_out.buf).copy()
+            del inputs
+        finally:
+            shm_in.close()
+            shm_in.unlink()
+            shm_out.close()
+            shm_out.unlink()
+        return {
+            "flood_val": outputs[0].reshape(shape),
+            "depth_val": outputs[1].reshape(shape)
+        }
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def score_parallel(cr, wl, du, workers: Optional[int] = None, config: Optional[Dict[str, Any]] = None,
+                   defuzz: str = "centroid") -> Dict[str, np.ndarray]:
+    """Pemanggilan sekali pakai; untuk banyak pemanggilan gunakan ParallelScorer agar pool dipakai ulang."""
+    with ParallelScorer(workers, config, defuzz) as scorer:
+        return scorer.score(cr, wl, du)
+
+
+def benchmark(samples: int, worker_counts: List[int], defuzz: str = "centroid", seed: int = 0) -> List[Dict]:
+    """Throughput per jumlah worker; pool dibuat di luar pengukuran agar hanya penilaian yang diukur."""
+    rng = np.random.default_rng(seed)
+    cr = rng.uniform(0, 300, samples)
+    wl = rng.uniform(0, 5, samples)
+    du = rng.uniform(0, 24, samples)
+
+    engine = FuzzyFloodEngine(defuzz=defuzz)
+    t0 = time.perf_counter()
+    reference = engine.infer_batch(cr, wl, du)
+    base = time.perf_counter() - t0
+    rows = [{"workers": 0, "seconds": base, "rate": samples / base, "speedup": 1.0, "efficiency": 1.0}]
+
+    for w in worker_counts:
+        with ParallelScorer(w, defuzz=defuzz) as scorer:
+            scorer.score(cr[:w], wl[:w], du[:w])  # pemanasan: pastikan semua worker sudah siap
+            t0 = time.perf_counter()
+            res = scorer.score(cr, wl, du)
+            sec = time.perf_counter() - t0
+        if not np.allclose(res["flood_val"], reference["flood_val"], equal_nan=True):
+            raise RuntimeError(f"Hasil paralel ({w} worker) berbeda dari jalur tunggal")
+        rows.append({"workers": w, "seconds": sec, "rate": samples / sec,
+                     "speedup": base / sec, "efficiency": base / sec / w})
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Penilaian batch paralel dengan shared memory.")
+    parser.add_argument("--bench", action="store_true", help="jalankan benchmark skala worker")
+    parser.add_argument("--samples", type=int, default=2_000_000)
+    parser.add_argument("--workers", type=int, nargs="*",
+                        help="daftar jumlah worker (default: 1, 2, 4, ... hingga jumlah core)")
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+    args = parser.parse_args()
+
+    if not args.bench:
+        parser.print_help()
+        return
+
+    cores = os.cpu_count() or 1
+    counts = args.workers
+    if not counts:
+        counts = [1]
+        while counts[-1] * 2 <= cores:
+            counts.append(counts[-1] * 2)
+        if counts[-1] != cores:
+            counts.append(cores)
+
+    print(f"{args.samples:,} sampel, {cores} core, defuzz={args.defuzz}")
+    print(f"{'worker':>7} {'detik':>8} {'sampel/detik':>14} {'speedup':>8} {'efisiensi':>10}")
+    for r in benchmark(args.samples, counts, args.defuzz):
+        label = "tunggal" if r["workers"] == 0 else str(r["workers"])
+        print(f"{label:>7} {r['seconds']:>8.2f} {r['rate']:>14,.0f} {r['speedup']:>8.2f} {r['efficiency']:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Kalibrasi profil engine (FuzzyFloodEngine.PROFILES): galat output terhadap profil "reference" pada input acak,
+plus kecepatan dan memori per evaluasi, untuk memilih profil termurah yang memenuhi batas akurasi.
+
+Contoh:
+    python profile_report.py --samples 100000
+    python profile_report.py --defuzz bisector --flood-tol 0.5 --depth-tol 0.02
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+from status import DEPTH_LEVELS, FLOOD_LEVELS, classify_array
+
+REFERENCE = "reference"
+
+
+def _memory_per_eval(engine: FuzzyFloodEngine, cr, wl, du) -> Dict[str, float]:
+    """Puncak alokasi (byte) satu infer() dan satu blok infer_batch, dibagi jumlah sampel blok."""
+    n = min(engine.chunk_size, cr.size)
+    tracemalloc.start()
+    engine.infer(float(cr[0]), float(wl[0]), float(du[0]))
+    _, scalar_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    engine.infer_batch(cr[:n], wl[:n], du[:n])
+    _, batch_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"scalar_bytes": float(scalar_peak), "batch_bytes_per_sample": batch_peak / n}
+
+
+def calibrate(samples: int = 100000, seed: int = 0, defuzz: str = "centroid",
+              profiles: Optional[Sequence[str]] = None, scalar_samples: int = 500) -> dict:
+    """Menjalankan setiap profil dengan metode `defuzz` dan mengembalikan galat, kecepatan dan memori."""
+    rng = np.random.default_rng(seed)
+    cr = rng.uniform(0, 300, samples)
+    wl = rng.uniform(0, 5, samples)
+    du = rng.uniform(0, 24, samples)
+
+    names = list(profiles or FuzzyFloodEngine.PROFILES)
+    results = {}
+    report = {"samples": samples, "defuzz": defuzz, "profiles": {}}
+    for name in [REFERENCE] + [p for p in names if p != REFERENCE]:
+        engine = FuzzyFloodEngine(defuzz=defuzz, profile=name)
+        t0 = time.perf_counter()
+        results[name] = engine.infer_batch(cr, wl, du)
+        batch_sec = time.perf_counter() - t0
+
+        m = min(scalar_samples, samples)
+        t0 = time.perf_counter()
+        for i in range(m):
+            engine.infer(cr[i], wl[i], du[i])
+        scalar_sec = (time.perf_counter() - t0) / m
+
+        entry = {
+            "settings": dict(FuzzyFloodEngine.PROFILES[name]),
+            "batch_samples_per_s": samples / batch_sec,
+            "scalar_us": scalar_sec * 1e6,
+        }
+        entry.update(_memory_per_eval(engine, cr, wl, du))
+        report["profiles"][name] = entry
+
+    order = names if REFERENCE in names else names + [REFERENCE]
+    report["profiles"] = {name: report["profiles"][name] for name in order}
+    ref = results[REFERENCE]
+    for name, entry in report["profiles"].items():
+        for key, levels in (("flood_val", FLOOD_LEVELS), ("depth_val", DEPTH_LEVELS)):
+            diff = np.abs(results[name][key] - ref[key])
+            same = classify_array(results[name][key], levels) == classify_array(ref[key], levels)
+            entry[key] = {
+                "max_abs_err": float(np.nanmax(diff)) if np.isfinite(diff).any() else 0.0,
+                "mean_abs_err": float(np.nanmean(diff)) if np.isfinite(diff).any() else 0.0,
+                "status_agreement": float(same.mean()),
+            }
+    return report
+
+
+def recommend(report: dict, flood_tol: float, depth_tol: float) -> Optional[str]:
+    """Profil tercepat (throughput batch) yang galat maksimumnya berada dalam batas; None bila tidak ada."""
+    ok = [(entry["batch_samples_per_s"], name) for name, entry in report["profiles"].items()
+          if entry["flood_val"]["max_abs_err"] <= flood_tol and entry["depth_val"]["max_abs_err"] <= depth_tol]
+    return max(ok)[1] if ok else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kalibrasi akurasi, kecepatan dan memori profil engine.")
+    parser.add_argument("--samples", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+    parser.add_argument("--profiles", nargs="+", choices=list(FuzzyFloodEngine.PROFILES),
+                        help="profil yang dibandingkan (bawaan: semua)")
+    parser.add_argument("--flood-tol", type=float, default=0.5, help="galat maksimum risiko yang diterima")
+    parser.add_argument("--depth-tol", type=float, default=0.02, help="galat maksimum kedalaman (m) yang diterima")
+    args = parser.parse_args()
+
+    report = calibrate(args.samples, args.seed, args.defuzz, args.profiles)
+    print(f"Sampel acak: {report['samples']}, defuzz: {report['defuzz']}, acuan: profil '{REFERENCE}'")
+    print(f"  {'profil':<10} {'titik':>11} {'dtype':>8} {'sampel/s':>10} {'infer us':>9} {'byte/sampel':>12} "
+          f"{'maks risiko':>12} {'rata2':>8} {'maks kedalaman':>15} {'rata2':>8} {'status sama':>12}")
+    for name, e in report["profiles"].items():
+        s, f, d = e["settings"], e["flood_val"], e["depth_val"]
+        print(f"  {name:<10} {s['flood_points']:>5}/{s['depth_points']:<5} {s['dtype']:>8} "
+              f"{e['batch_samples_per_s']:>10,.0f} {e['scalar_us']:>9.1f} {e['batch_bytes_per_sample']:>12,.0f} "
+              f"{f['max_abs_err']:>12.4f} {f['mean_abs_err']:>8.4f} "
+              f"{d['max_abs_err']:>15.5f} {d['mean_abs_err']:>8.5f} {min(f['status_agreement'], d['status_agreement']):>11.2%}")
+
+    best = recommend(report, args.flood_tol, args.depth_tol)
+    if best is None:
+        print(f"Tidak ada profil dengan galat risiko <= {args.flood_tol} dan kedalaman <= {args.depth_tol}")
+    else:
+        print(f"Profil termurah dalam batas (risiko <= {args.flood_tol}, kedalaman <= {args.depth_tol}): {best}")
+
+
+if __name__ == "__main__":
+    main()
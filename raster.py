@@ -0,0 +1,111 @@
+"""
+Peta risiko banjir dari raster grid (CR, WL, DU) yang diproses per tile.
+Input boleh berupa array 2D, file .npy (dibuka memory-mapped) atau nilai skalar untuk seluruh grid.
+Output ditulis ke file .npy memory-mapped sehingga memori puncak hanya sebesar satu tile.
+
+Contoh:
+    python raster.py hujan.npy tinggi_air.npy 6 --out-flood risiko.npy --out-depth kedalaman.npy
+"""
+import argparse
+import sys
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+
+RasterInput = Union[str, float, np.ndarray]
+
+
+def open_raster(src: RasterInput) -> Union[float, np.ndarray]:
+    """Path .npy dibuka dengan mmap_mode='r'; skalar dikembalikan apa adanya."""
+    if isinstance(src, str):
+        return np.load(src, mmap_mode="r")
+    if np.ndim(src) == 0:
+        return float(src)
+    return src
+
+
+def _tile(src: Union[float, np.ndarray], rows: slice, cols: slice) -> Union[float, np.ndarray]:
+    if isinstance(src, float):
+        return src
+    return np.asarray(src[rows, cols], dtype=float)
+
+
+def generate_risk_map(cr: RasterInput, wl: RasterInput, du: RasterInput,
+                      flood_out: str, depth_out: str,
+                      tile: Tuple[int, int] = (512, 512),
+                      engine: Optional[FuzzyFloodEngine] = None,
+                      score: Optional[Callable[..., Dict[str, np.ndarray]]] = None,
+                      dtype=np.float32) -> Tuple[np.memmap, np.memmap]:
+    """
+    Menilai setiap piksel dan menulis raster risiko banjir dan kedalaman ke `flood_out`/`depth_out` (.npy).
+    Piksel tanpa rule aktif (mis. di luar domain atau NaN/nodata) bernilai NaN.
+    """
+    rasters = [open_raster(src) for src in (cr, wl, du)]
+    shapes = [r.shape for r in rasters if not isinstance(r, float)]
+    if not shapes:
+        raise ValueError("Minimal satu input harus berupa raster 2D")
+    if any(len(s) != 2 for s in shapes) or len(set(shapes)) != 1:
+        raise ValueError(f"Semua raster harus 2D dengan ukuran sama, didapat {shapes}")
+    height, width = shapes[0]
+
+    score = score or (engine or FuzzyFloodEngine()).infer_batch
+    flood = np.lib.format.open_memmap(flood_out, mode="w+", dtype=dtype, shape=(height, width))
+    depth = np.lib.format.open_memmap(depth_out, mode="w+", dtype=dtype, shape=(height, width))
+
+    th, tw = tile
+    for r0 in range(0, height, th):
+        rows = slice(r0, min(r0 + th, height))
+        for c0 in range(0, width, tw):
+            cols = slice(c0, min(c0 + tw, width))
+            res = score(*(_tile(r, rows, cols) for r in rasters))
+            shape = (rows.stop - rows.start, cols.stop - cols.start)
+            flood[rows, cols] = np.broadcast_to(res["flood_val"], shape)
+            depth[rows, cols] = np.broadcast_to(res["depth_val"], shape)
+        flood.flush()
+        depth.flush()
+    return flood, depth
+
+
+def _input_arg(value: str) -> RasterInput:
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Buat raster risiko banjir dan kedalaman per tile.")
+    parser.add_argument("cr", type=_input_arg, help="raster curah hujan (.npy) atau nilai konstan")
+    parser.add_argument("wl", type=_input_arg, help="raster ketinggian air (.npy) atau nilai konstan")
+    parser.add_argument("du", type=_input_arg, help="raster durasi hujan (.npy) atau nilai konstan")
+    parser.add_argument("--out-flood", required=True)
+    parser.add_argument("--out-depth", required=True)
+    parser.add_argument("--tile", type=int, nargs=2, default=[512, 512], metavar=("TINGGI", "LEBAR"))
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+    parser.add_argument("--surface", help="pakai tabel surface.py (.npy) untuk lookup trilinear")
+    args = parser.parse_args(argv)
+
+    engine = FuzzyFloodEngine(defuzz=args.defuzz)
+    score = None
+    if args.surface:
+        from surface import InferenceSurface
+        score = InferenceSurface.load_or_build(engine, args.surface).lookup
+
+    t0 = time.perf_counter()
+    try:
+        flood, _ = generate_risk_map(args.cr, args.wl, args.du, args.out_flood, args.out_depth,
+                                     tuple(args.tile), engine, score)
+    except (OSError, ValueError) as e:
+        print(f"Kesalahan: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - t0
+    print(f"{flood.shape[0]}x{flood.shape[1]} piksel dalam {elapsed:.2f} s "
+          f"({flood.size / elapsed:,.0f} piksel/detik)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Cache LRU untuk hasil engine, dengan kunci input yang dikuantisasi."""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+class ResultCache:
+    """
+    Cache hasil evaluasi berukuran terbatas dengan pengusiran LRU.
+    Input (cr, wl, du) dibulatkan ke kelipatan `resolution` sebelum menjadi kunci,
+    dan engine mengevaluasi nilai yang sudah dibulatkan agar hit dan miss konsisten.
+    Untuk engine dengan jumlah input lain, `resolution` berisi satu nilai per input.
+    """
+
+    def __init__(self, max_size: int = 65536, resolution: Tuple[float, ...] = (0.1, 0.01, 0.1)):
+        if max_size <= 0:
+            raise ValueError("max_size harus lebih dari 0")
+        if any(r <= 0 for r in resolution):
+            raise ValueError("resolution harus positif")
+        self.max_size = max_size
+        self.resolution = tuple(float(r) for r in resolution)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def quantize(self, *values: float) -> Tuple[int, ...]:
+        """Kunci bilangan bulat untuk satu input, mis. quantize(cr, wl, du)."""
+        return tuple(int(round(v / r)) for v, r in zip(values, self.resolution))
+
+    def quantize_array(self, *values: np.ndarray) -> np.ndarray:
+        """Kunci bilangan bulat untuk N input, berbentuk (N, jumlah variabel)."""
+        return np.stack([np.round(np.asarray(v, dtype=float) / r).astype(np.int64)
+                         for v, r in zip(values, self.resolution)], axis=1)
+
+    def dequantize(self, key) -> Tuple[float, ...]:
+        """Nilai input yang diwakili sebuah kunci."""
+        return tuple(k * r for k, r in zip(key, self.resolution))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Mengosongkan cache (wajib dipanggil setelah parameter atau rule engine diubah)."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,142 @@
+"""
+Penilaian headless (tanpa Qt/matplotlib) untuk file CSV/TSV berukuran besar.
+File dibaca dan ditulis per blok baris sehingga memori konstan berapa pun ukurannya.
+
+Contoh:
+    python score_cli.py stasiun.csv hasil.csv --chunk-size 20000
+    python score_cli.py log.tsv hasil.tsv --cr-col curah_hujan --wl-col tinggi_air --du-col durasi
+"""
+import argparse
+import csv
+import itertools
+import sys
+import time
+from typing import List
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+from result_cache import ResultCache
+from status import FLOOD_LEVELS, DEPTH_LEVELS, classify_array
+
+OUTPUT_COLUMNS = ["flood_val", "depth_val", "flood_status", "depth_status"]
+
+
+def detect_delimiter(path: str, header_line: str) -> str:
+    """Tab untuk .tsv/.tab atau bila baris header hanya berisi tab, selain itu koma."""
+    if path.lower().endswith((".tsv", ".tab")):
+        return "\t"
+    if "\t" in header_line and "," not in header_line:
+        return "\t"
+    return ","
+
+
+def parse_column(values: List[str]) -> np.ndarray:
+    """Konversi ke float; nilai kosong atau tidak valid menjadi NaN."""
+    try:
+        return np.asarray(values, dtype=float)
+    except ValueError:
+        out = np.empty(len(values))
+        for i, v in enumerate(values):
+            try:
+                out[i] = float(v)
+            except ValueError:
+                out[i] = np.nan
+        return out
+
+
+def format_values(vals: np.ndarray, digits: int) -> List[str]:
+    return ["" if np.isnan(v) else f"{v:.{digits}f}" for v in vals.tolist()]
+
+
+def score_file(src: str, dst: str, cr_col: str = "cr", wl_col: str = "wl", du_col: str = "du",
+               chunk_size: int = 10000, delimiter: str = None, engine: FuzzyFloodEngine = None,
+               score=None) -> int:
+    """
+    Menilai setiap baris `src` dan menulis kolom aslinya ditambah OUTPUT_COLUMNS ke `dst`.
+    `score(cr, wl, du)` bisa diganti (misalnya lookup permukaan); default `engine.infer_batch`.
+    Mengembalikan jumlah baris yang diproses.
+    """
+    engine = engine or FuzzyFloodEngine()
+    score = score or engine.infer_batch
+
+    with open(src, newline="") as fin, open(dst, "w", newline="") as fout:
+        header_line = fin.readline()
+        delimiter = delimiter or detect_delimiter(src, header_line)
+        header = next(csv.reader([header_line], delimiter=delimiter))
+        try:
+            cols = [header.index(c) for c in (cr_col, wl_col, du_col)]
+        except ValueError:
+            raise ValueError(f"Kolom {cr_col}/{wl_col}/{du_col} tidak ditemukan di header: {header}")
+
+        reader = csv.reader(fin, delimiter=delimiter)
+        writer = csv.writer(fout, delimiter=delimiter, lineterminator="\n")
+        writer.writerow(header + OUTPUT_COLUMNS)
+
+        total = 0
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            inputs = [parse_column([r[c] if c < len(r) else "" for r in rows]) for c in cols]
+            res = score(*inputs)
+            flood = np.asarray(res["flood_val"], dtype=float)
+            depth = np.asarray(res["depth_val"], dtype=float)
+            writer.writerows(
+                row + list(extra)
+                for row, extra in zip(rows, zip(
+                    format_values(flood, 2),
+                    format_values(depth, 3),
+                    classify_array(flood, FLOOD_LEVELS).tolist(),
+                    classify_array(depth, DEPTH_LEVELS).tolist(),
+                ))
+            )
+            total += len(rows)
+        return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Nilai file CSV/TSV pembacaan sensor dengan FuzzyFloodEngine.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--cr-col", default="cr", help="nama kolom curah hujan (default: cr)")
+    parser.add_argument("--wl-col", default="wl", help="nama kolom ketinggian air (default: wl)")
+    parser.add_argument("--du-col", default="du", help="nama kolom durasi (default: du)")
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--delimiter", help="pemisah kolom; default dideteksi dari file")
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+    parser.add_argument("--profile", choices=list(FuzzyFloodEngine.PROFILES),
+                        help="profil resolusi/presisi engine (lihat profile_report.py)")
+    parser.add_argument("--surface", help="pakai tabel surface.py (.npy) untuk lookup trilinear")
+    parser.add_argument("--cache", type=int, default=0, metavar="N",
+                        help="aktifkan cache LRU hasil dengan kapasitas N entri")
+    parser.add_argument("--cache-resolution", type=float, nargs=3, default=[0.1, 0.01, 0.1],
+                        metavar=("CR", "WL", "DU"), help="resolusi kuantisasi kunci cache")
+    args = parser.parse_args(argv)
+
+    cache = ResultCache(args.cache, tuple(args.cache_resolution)) if args.cache else None
+    engine = FuzzyFloodEngine(defuzz=args.defuzz, cache=cache, profile=args.profile)
+    score = None
+    if args.surface:
+        from surface import InferenceSurface
+        score = InferenceSurface.load_or_build(engine, args.surface).lookup
+
+    t0 = time.perf_counter()
+    try:
+        rows = score_file(args.input, args.output, args.cr_col, args.wl_col, args.du_col,
+                          args.chunk_size, args.delimiter, engine, score)
+    except (OSError, ValueError) as e:
+        print(f"Kesalahan: {e}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - t0
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"{rows} baris dalam {elapsed:.2f} s ({rate:,.0f} baris/detik)", file=sys.stderr)
+    if cache is not None:
+        st = cache.stats()
+        print(f"cache: {st['hits']} hit, {st['misses']} miss, {st['evictions']} eviksi "
+              f"(hit rate {st['hit_rate']:.1%})", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
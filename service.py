@@ -0,0 +1,331 @@
+"""
+Layanan HTTP/JSON lokal (asyncio) untuk FuzzyFloodEngine dengan micro-batching.
+Permintaan yang datang bersamaan dikumpulkan selama jendela singkat lalu dinilai dalam satu infer_batch.
+
+Endpoint:
+    POST /score    {"cr": 140, "wl": 2.2, "du": 8}  atau  {"readings": [{"cr": ..., "wl": ..., "du": ...}, ...]}
+    GET  /metrics  histogram latensi, ukuran batch dan penghitung
+    GET  /health
+
+Contoh:
+    python service.py serve --port 8765 --max-batch 512 --max-wait-ms 2
+    python service.py loadgen --port 8765 --concurrency 64 --requests 20000
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+from metrics import Histogram
+from status import flood_status, depth_status
+
+MAX_BODY_BYTES = 8 << 20  # batas ukuran body permintaan
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _latency_histogram() -> Histogram:
+    # 50 us .. ~26 s dalam langkah x1.5
+    return Histogram.exponential(0.00005, 1.5, 33)
+
+
+class MicroBatcher:
+    """Mengumpulkan permintaan hingga `max_batch` baris atau `max_wait` detik, lalu menilai sekaligus."""
+
+    def __init__(self, engine: FuzzyFloodEngine, max_batch: int = 512, max_wait: float = 0.002):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.queue: "asyncio.Queue[Tuple[np.ndarray, asyncio.Future, float]]" = asyncio.Queue()
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024, 2048, 4096])
+        self.queue_wait = _latency_histogram()
+        self.compute_time = _latency_histogram()
+        self.batches = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def submit(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        """rows berbentuk (n, 3); hasilnya dict flood_val/depth_val berpanjang n."""
+        fut = asyncio.get_running_loop().create_future()
+        await self.queue.put((rows, fut, time.perf_counter()))
+        return await fut
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self.queue.get()]
+            size = len(items[0][0])
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                items.append(item)
+                size += len(item[0])
+
+            now = time.perf_counter()
+            for _, _, queued in items:
+                self.queue_wait.record(now - queued)
+            rows = np.concatenate([it[0] for it in items])
+            try:
+                # Dijalankan di thread agar event loop tetap menerima koneksi selama inferensi
+                res = await loop.run_in_executor(None, self.engine.infer_batch, rows[:, 0], rows[:, 1], rows[:, 2])
+            except Exception as e:  # diteruskan ke setiap pemanggil
+                for _, fut, _ in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            self.compute_time.record(time.perf_counter() - now)
+            self.batch_sizes.record(len(rows))
+            self.batches += 1
+
+            start = 0
+            for chunk, fut, _ in items:
+                stop = start + len(chunk)
+                if not fut.done():
+                    fut.set_result({"flood_val": res["flood_val"][start:stop], "depth_val": res["depth_val"][start:stop]})
+                start = stop
+
+
+class ScoringService:
+    def __init__(self, engine: Optional[FuzzyFloodEngine] = None, max_batch: int = 512, max_wait: float = 0.002):
+        self.batcher = MicroBatcher(engine or FuzzyFloodEngine(), max_batch, max_wait)
+        self.latency = _latency_histogram()
+        self.requests = 0
+        self.errors = 0
+        self.started = time.time()
+
+    @staticmethod
+    def _parse_rows(payload: Any) -> Tuple[np.ndarray, bool]:
+        if isinstance(payload, dict) and "readings" in payload:
+            readings, single = payload["readings"], False
+        else:
+            readings, single = [payload], True
+        if not isinstance(readings, list) or not readings:
+            raise ValueError("'readings' harus berupa daftar yang tidak kosong")
+        try:
+            rows = np.array([[float(r["cr"]), float(r["wl"]), float(r["du"])] for r in readings])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Setiap pembacaan membutuhkan field numerik 'cr', 'wl' dan 'du'")
+        return rows, single
+
+    @staticmethod
+    def _format(flood: float, depth: float) -> Dict[str, Any]:
+        flood = None if math.isnan(flood) else flood
+        depth = None if math.isnan(depth) else depth
+        return {
+            "flood_val": flood,
+            "depth_val": depth,
+            "flood_status": flood_status(flood)[0],
+            "depth_status": depth_status(depth)[0],
+        }
+
+    async def score(self, payload: Any) -> Any:
+        rows, single = self._parse_rows(payload)
+        res = await self.batcher.submit(rows)
+        out = [self._format(f, d) for f, d in zip(res["flood_val"].tolist(), res["depth_val"].tolist())]
+        return out[0] if single else {"results": out}
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "uptime_s": time.time() - self.started,
+            "requests": self.requests,
+            "errors": self.errors,
+            "batches": self.batcher.batches,
+            "max_batch": self.batcher.max_batch,
+            "max_wait_ms": self.batcher.max_wait * 1000,
+            "latency_s": self.latency.to_dict(),
+            "queue_wait_s": self.batcher.queue_wait.to_dict(),
+            "compute_s": self.batcher.compute_time.to_dict(),
+            "batch_size": self.batcher.batch_sizes.to_dict(),
+        }
+
+    async def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Any]:
+        if path == "/health":
+            return 200, {"status": "ok"}
+        if path == "/metrics":
+            return (200, self.metrics()) if method == "GET" else (405, {"error": "gunakan GET"})
+        if path != "/score":
+            return 404, {"error": f"path tidak dikenal: {path}"}
+        if method != "POST":
+            return 405, {"error": "gunakan POST"}
+        try:
+            payload = json.loads(body or b"null")
+            return 200, await self.score(payload)
+        except ValueError as e:
+            return 400, {"error": str(e)}
+
+    @staticmethod
+    def _content_length(headers: Dict[str, str]) -> int:
+        raw = headers.get("content-length", "") or "0"
+        try:
+            length = int(raw)
+        except ValueError:
+            raise ValueError(f"Content-Length tidak valid: {raw!r}")
+        if length < 0:
+            raise ValueError("Content-Length tidak boleh negatif")
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"Body melebihi batas {MAX_BODY_BYTES} byte")
+        return length
+
+    async def on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                t0 = time.perf_counter()
+                try:
+                    method, path, _ = line.decode("latin-1").split(" ", 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    h = await reader.readline()
+                    if h in (b"\r\n", b"\n", b""):
+                        break
+                    k, _, v = h.decode("latin-1").partition(":")
+                    headers[k.strip().lower()] = v.strip()
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    length = self._content_length(headers)
+                except ValueError as e:
+                    # Batas body tidak diketahui, jadi koneksi ditutup setelah balasan
+                    status, payload, keep_alive = 400, {"error": str(e)}, False
+                else:
+                    body = await reader.readexactly(length)
+                    try:
+                        status, payload = await self.handle(method, path.split("?", 1)[0], body)
+                    except Exception as e:
+                        status, payload = 500, {"error": str(e)}
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+
+                self.requests += 1
+                if status >= 400:
+                    self.errors += 1
+                if path.startswith("/score"):
+                    self.latency.record(time.perf_counter() - t0)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int):
+        self.batcher.start()
+        server = await asyncio.start_server(self.on_connection, host, port)
+        print(f"Layanan berjalan di http://{host}:{port} (max_batch={self.batcher.max_batch}, "
+              f"max_wait={self.batcher.max_wait * 1000:.1f} ms)", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+
+# --- Load generator ---
+
+async def _client(host: str, port: int, n: int, latencies: List[float], rng: np.random.Generator):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n):
+            body = json.dumps({"cr": float(rng.uniform(0, 300)), "wl": float(rng.uniform(0, 5)),
+                               "du": float(rng.uniform(0, 24))}).encode()
+            t0 = time.perf_counter()
+            writer.write(f"POST /score HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+            length = 0
+            status_line = await reader.readline()
+            while True:
+                h = await reader.readline()
+                if h in (b"\r\n", b""):
+                    break
+                if h.lower().startswith(b"content-length:"):
+                    length = int(h.split(b":")[1])
+            await reader.readexactly(length)
+            if b" 200 " not in status_line:
+                raise RuntimeError(f"Respons tidak terduga: {status_line!r}")
+            latencies.append(time.perf_counter() - t0)
+    finally:
+        writer.close()
+
+
+async def load_generator(host: str, port: int, concurrency: int, requests: int, seed: int = 0) -> Dict[str, float]:
+    """Mengirim `requests` permintaan dari `concurrency` koneksi keep-alive dan mengukur latensinya."""
+    latencies: List[float] = []
+    per_client = [requests // concurrency + (1 if i < requests % concurrency else 0) for i in range(concurrency)]
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, n, latencies, np.random.default_rng(seed + i))
+        for i, n in enumerate(per_client) if n
+    ))
+    elapsed = time.perf_counter() - t0
+    lat = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(lat, 50)),
+        "p90_ms": float(np.percentile(lat, 90)),
+        "p99_ms": float(np.percentile(lat, 99)),
+        "max_ms": float(lat.max()),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan inferensi HTTP/JSON lokal dengan micro-batching.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_serve = sub.add_parser("serve")
+    p_serve.add_argument("--host", default="127.0.0.1")
+    p_serve.add_argument("--port", type=int, default=8765)
+    p_serve.add_argument("--max-batch", type=int, default=512)
+    p_serve.add_argument("--max-wait-ms", type=float, default=2.0)
+    p_serve.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+
+    p_load = sub.add_parser("loadgen")
+    p_load.add_argument("--host", default="127.0.0.1")
+    p_load.add_argument("--port", type=int, default=8765)
+    p_load.add_argument("--concurrency", type=int, default=64)
+    p_load.add_argument("--requests", type=int, default=10000)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "serve":
+        service = ScoringService(FuzzyFloodEngine(defuzz=args.defuzz), args.max_batch, args.max_wait_ms / 1000)
+        try:
+            asyncio.run(service.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+    else:
+        r = asyncio.run(load_generator(args.host, args.port, args.concurrency, args.requests))
+        print(f"{r['requests']} permintaan dalam {r['seconds']:.2f} s ({r['rps']:,.0f} req/detik)")
+        print(f"latensi: p50={r['p50_ms']:.2f} ms  p90={r['p90_ms']:.2f} ms  "
+              f"p99={r['p99_ms']:.2f} ms  maks={r['max_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
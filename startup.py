@@ -0,0 +1,58 @@
+"""
+Pengukuran fase cold start aplikasi. Diimpor paling awal oleh app.py agar waktu impor modul lain ikut terukur;
+laporan ditambahkan ke `<cache>/startup.log` (lihat engine_config.default_cache_dir) dan bisa dicetak
+dengan `python app.py --startup-report`.
+"""
+import json
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+_T0 = time.perf_counter()
+
+
+class StartupProfiler:
+    """Mencatat waktu (detik sejak modul ini diimpor) di akhir setiap fase start."""
+
+    def __init__(self, t0: float = _T0):
+        self.t0 = t0
+        self.phases: List[Tuple[str, float]] = []
+        self._last = t0
+
+    def mark(self, name: str) -> float:
+        """Menutup fase `name` dan mengembalikan durasinya."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.t0))
+        elapsed = now - self._last
+        self._last = now
+        return elapsed
+
+    def elapsed(self, name: str) -> Optional[float]:
+        return next((t for n, t in self.phases if n == name), None)
+
+    def to_dict(self) -> dict:
+        rows, prev = [], 0.0
+        for name, t in self.phases:
+            rows.append({"phase": name, "ms": round((t - prev) * 1000, 1), "total_ms": round(t * 1000, 1)})
+            prev = t
+        return {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "frozen": bool(getattr(sys, "frozen", False)),
+                "phases": rows}
+
+    def summary(self) -> str:
+        lines = ["Fase start:"]
+        for row in self.to_dict()["phases"]:
+            lines.append(f"  {row['phase']:<28} {row['ms']:>8.1f} ms   (kumulatif {row['total_ms']:>8.1f} ms)")
+        return "\n".join(lines)
+
+    def write(self, path: str):
+        """Menambahkan laporan sebagai satu baris JSON; gagal menulis tidak menghentikan aplikasi."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.to_dict()) + "\n")
+        except OSError:
+            pass
+
+
+profiler = StartupProfiler()
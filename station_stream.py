@@ -0,0 +1,173 @@
+"""
+Evaluasi bertahap per stasiun untuk data deret waktu.
+DU (durasi hujan) diturunkan dari interval hujan berturut-turut, dan engine hanya dijalankan ulang
+bila input bergeser melebihi epsilon dari input evaluasi terakhir; selain itu hasil terakhir dipakai.
+"""
+import math
+from datetime import datetime
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+
+Timestamp = Union[float, int, datetime]
+
+
+class StationState:
+    """State bergulir satu stasiun."""
+
+    __slots__ = ("last_time", "rain_start", "inputs", "result")
+
+    def __init__(self):
+        self.last_time: Optional[float] = None
+        self.rain_start: Optional[float] = None
+        self.inputs: Optional[Tuple[float, float, float]] = None  # input evaluasi terakhir
+        self.result: Optional[Dict[str, Any]] = None
+
+
+class StationStreamEvaluator:
+    """
+    engine: FuzzyFloodEngine yang dipakai bersama semua stasiun.
+    epsilon: perubahan minimum (cr, wl, du) yang memicu evaluasi ulang.
+    rain_threshold: curah hujan (mm/jam) di atas nilai ini dianggap hujan.
+    max_gap: jeda (detik) antar pembacaan yang dianggap memutus rangkaian hujan.
+    """
+
+    def __init__(self, engine: Optional[FuzzyFloodEngine] = None,
+                 epsilon: Tuple[float, float, float] = (1.0, 0.01, 0.25),
+                 rain_threshold: float = 0.0, max_gap: float = 3600.0):
+        self.engine = engine or FuzzyFloodEngine()
+        self.epsilon = tuple(float(e) for e in epsilon)
+        self.rain_threshold = rain_threshold
+        self.max_gap = max_gap
+        self.stations: Dict[Hashable, StationState] = {}
+        self.evaluations = 0
+        self.reused = 0
+
+    @staticmethod
+    def _seconds(ts: Timestamp) -> float:
+        return ts.timestamp() if isinstance(ts, datetime) else float(ts)
+
+    def _advance(self, state: StationState, t: float, rainfall: float) -> float:
+        """Memperbarui rangkaian hujan stasiun dan mengembalikan durasi hujan (jam)."""
+        if state.last_time is not None and t < state.last_time:
+            raise ValueError("Timestamp mundur untuk stasiun yang sama")
+        gap_ok = state.last_time is not None and t - state.last_time <= self.max_gap
+
+        if rainfall > self.rain_threshold:
+            if state.rain_start is None or not gap_ok:
+                # Interval sejak pembacaan sebelumnya ikut dihitung sebagai interval hujan
+                state.rain_start = state.last_time if gap_ok else t
+        else:
+            state.rain_start = None
+        state.last_time = t
+        return 0.0 if state.rain_start is None else (t - state.rain_start) / 3600.0
+
+    def _validate(self, readings: Iterable[Tuple[Hashable, Timestamp, float, float]]
+                  ) -> List[Tuple[Hashable, float, float, float]]:
+        """Mengonversi satu tick dan memeriksa urutan timestamp per stasiun sebelum state diubah."""
+        checked = []
+        last: Dict[Hashable, Optional[float]] = {}
+        for station, ts, rainfall, water_level in readings:
+            t = self._seconds(ts)
+            if station not in last:
+                state = self.stations.get(station)
+                last[station] = state.last_time if state else None
+            if last[station] is not None and t < last[station]:
+                raise ValueError(f"Timestamp mundur untuk stasiun {station!r}")
+            last[station] = t
+            checked.append((station, t, float(rainfall), float(water_level)))
+        return checked
+
+    def _needs_eval(self, state: StationState, inputs: Tuple[float, float, float]) -> bool:
+        if state.inputs is None:
+            return True
+        # NaN (sensor putus) tidak pernah "dalam epsilon": selalu dinilai ulang, begitu pula setelahnya
+        if not all(math.isfinite(v) for v in inputs + state.inputs):
+            return True
+        return any(abs(a - b) > e for a, b, e in zip(inputs, state.inputs, self.epsilon))
+
+    @staticmethod
+    def _result(station, t, inputs, flood_val, depth_val, recomputed) -> Dict[str, Any]:
+        return {
+            "station": station,
+            "timestamp": t,
+            "cr": inputs[0], "wl": inputs[1], "du": inputs[2],
+            "flood_val": flood_val,
+            "depth_val": depth_val,
+            "recomputed": recomputed,
+        }
+
+    def update(self, station: Hashable, timestamp: Timestamp, rainfall: float, water_level: float) -> Dict[str, Any]:
+        """Memproses satu pembacaan stasiun."""
+        return self.update_many([(station, timestamp, rainfall, water_level)])[0]
+
+    def update_many(self, readings: Iterable[Tuple[Hashable, Timestamp, float, float]]) -> List[Dict[str, Any]]:
+        """
+        Memproses satu tick berisi banyak pembacaan (station, timestamp, rainfall, water_level).
+        Semua stasiun yang perlu evaluasi ulang dinilai dalam satu panggilan infer_batch.
+        Seluruh tick divalidasi lebih dulu; bila ada pembacaan tidak valid (mis. timestamp mundur),
+        ValueError dilempar tanpa mengubah state stasiun mana pun.
+        """
+        readings = self._validate(readings)
+        results: List[Optional[Dict[str, Any]]] = []
+        pending: List[Tuple[int, StationState, Tuple[float, float, float]]] = []
+        pending_states = set()  # id state yang dievaluasi di tick ini
+        followers: List[Tuple[int, StationState]] = []  # pembacaan yang memakai hasil evaluasi tertunda
+
+        for station, t, rainfall, water_level in readings:
+            state = self.stations.get(station)
+            if state is None:
+                state = self.stations[station] = StationState()
+            du = self._advance(state, t, rainfall)
+            inputs = (rainfall, water_level, du)
+
+            # Stasiun tanpa hasil (dan tidak sedang dievaluasi di tick ini) selalu dinilai ulang
+            stale = state.result is None and id(state) not in pending_states
+            if stale or self._needs_eval(state, inputs):
+                state.inputs = inputs
+                state.result = None  # diisi setelah evaluasi batch
+                pending_states.add(id(state))
+                pending.append((len(results), state, inputs))
+                results.append(self._result(station, t, inputs, None, None, True))
+            else:
+                results.append(self._result(station, t, inputs, None, None, False))
+                if state.result is None:
+                    followers.append((len(results) - 1, state))
+                else:
+                    results[-1]["flood_val"] = state.result["flood_val"]
+                    results[-1]["depth_val"] = state.result["depth_val"]
+                self.reused += 1
+
+        if pending:
+            arr = np.array([p[2] for p in pending])
+            res = self.engine.infer_batch(arr[:, 0], arr[:, 1], arr[:, 2])
+            for (i, state, _), f, d in zip(pending, res["flood_val"].tolist(), res["depth_val"].tolist()):
+                f = None if np.isnan(f) else f
+                d = None if np.isnan(d) else d
+                state.result = {"flood_val": f, "depth_val": d}
+                results[i]["flood_val"] = f
+                results[i]["depth_val"] = d
+            self.evaluations += len(pending)
+
+        for i, state in followers:
+            results[i]["flood_val"] = state.result["flood_val"]
+            results[i]["depth_val"] = state.result["depth_val"]
+        return results
+
+    def reset(self, station: Optional[Hashable] = None):
+        """Menghapus state satu stasiun, atau semua stasiun bila `station` None."""
+        if station is None:
+            self.stations.clear()
+        else:
+            self.stations.pop(station, None)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.evaluations + self.reused
+        return {
+            "stations": len(self.stations),
+            "evaluations": self.evaluations,
+            "reused": self.reused,
+            "reuse_rate": self.reused / total if total else 0.0,
+        }
@@ -0,0 +1,47 @@
+"""Batas status banjir/kedalaman, dipakai bersama oleh GUI dan alat headless (tanpa Qt)."""
+from typing import Optional, Tuple
+
+import numpy as np
+
+UNKNOWN = ("Tidak Diketahui", "#9ca0b0")
+
+# (batas atas eksklusif, label, warna)
+FLOOD_LEVELS = (
+    (30.0, "AMAN", "#40a02b"),
+    (60.0, "WASPADA", "#df8e1d"),
+    (float("inf"), "BAHAYA", "#d20f39"),
+)
+
+DEPTH_LEVELS = (
+    (1.0, "RENDAH", "#40a02b"),
+    (2.0, "SEDANG", "#df8e1d"),
+    (float("inf"), "TINGGI", "#d20f39"),
+)
+
+
+def classify(val: Optional[float], levels) -> Tuple[str, str]:
+    """Label dan warna untuk satu nilai; None berarti tidak diketahui."""
+    if val is None:
+        return UNKNOWN
+    for limit, label, color in levels:
+        if val < limit:
+            return label, color
+    return levels[-1][1], levels[-1][2]
+
+
+def flood_status(val: Optional[float]) -> Tuple[str, str]:
+    return classify(val, FLOOD_LEVELS)
+
+
+def depth_status(val: Optional[float]) -> Tuple[str, str]:
+    return classify(val, DEPTH_LEVELS)
+
+
+def classify_array(vals: np.ndarray, levels) -> np.ndarray:
+    """Versi vektor dari classify; NaN menjadi label tidak diketahui."""
+    limits = np.array([lvl[0] for lvl in levels])
+    labels = np.array([lvl[1] for lvl in levels] + [UNKNOWN[0]], dtype=object)
+    vals = np.asarray(vals, dtype=float)
+    idx = np.minimum(np.searchsorted(limits, vals, side="right"), len(levels) - 1)
+    idx[np.isnan(vals)] = len(levels)
+    return labels[idx]
@@ -0,0 +1,159 @@
+"""
+Permukaan inferensi yang dihitung sekali di grid 3D (CR, WL, DU) lalu disimpan sebagai file .npy.
+Query dijawab dengan interpolasi trilinear dari tabel yang di-memory-map, tanpa inferensi Mamdani.
+
+Contoh:
+    python surface.py build surface.npy --shape 61 51 25
+    python surface.py lookup surface.npy 140 2.2 8
+"""
+import argparse
+import json
+import os
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+
+# Domain input engine: CR (mm/jam), WL (m), DU (jam)
+DOMAIN = ((0.0, 300.0), (0.0, 5.0), (0.0, 24.0))
+DEFAULT_SHAPE = (61, 51, 25)
+
+
+class InferenceSurface:
+    """Tabel flood/depth berbentuk (2, n_cr, n_wl, n_du) beserta metadata di file `<path>.json`."""
+
+    def __init__(self, table: np.ndarray, meta: Dict):
+        self.table = table
+        self.meta = meta
+        self.shape = tuple(meta["shape"])
+        self.domain = tuple(tuple(d) for d in meta["domain"])
+
+    @staticmethod
+    def meta_path(path: str) -> str:
+        return path + ".json"
+
+    @classmethod
+    def build(cls, engine: FuzzyFloodEngine, path: str, shape: Tuple[int, int, int] = DEFAULT_SHAPE,
+              error_samples: int = 20000) -> "InferenceSurface":
+        """Menghitung tabel di seluruh grid, menyimpannya (atomik) dan mengukur galat interpolasi."""
+        if any(n < 2 for n in shape):
+            raise ValueError("Setiap sumbu grid minimal 2 titik")
+        axes = [np.linspace(lo, hi, n) for (lo, hi), n in zip(DOMAIN, shape)]
+        cr, wl, du = np.meshgrid(*axes, indexing="ij")
+        res = engine.infer_batch(cr, wl, du)
+        table = np.stack([res["flood_val"], res["depth_val"]])
+
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp, path)
+
+        meta = {
+            "signature": engine.signature(),
+            "shape": list(shape),
+            "domain": [list(d) for d in DOMAIN],
+        }
+        surface = cls(np.load(path, mmap_mode="r"), meta)
+        if error_samples:
+            meta["max_error"] = surface.max_error(engine, error_samples)
+        with open(cls.meta_path(path) + ".tmp", "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(cls.meta_path(path) + ".tmp", cls.meta_path(path))
+        return surface
+
+    @classmethod
+    def load(cls, path: str) -> "InferenceSurface":
+        """Memory-map tabel yang sudah ada."""
+        with open(cls.meta_path(path)) as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode="r"), meta)
+
+    @classmethod
+    def load_or_build(cls, engine: FuzzyFloodEngine, path: str,
+                      shape: Optional[Tuple[int, int, int]] = None) -> "InferenceSurface":
+        """Memakai tabel di disk bila signature engine dan ukuran grid masih cocok, jika tidak dibangun ulang."""
+        try:
+            surface = cls.load(path)
+        except (OSError, ValueError):
+            return cls.build(engine, path, shape or DEFAULT_SHAPE)
+        stale = surface.meta.get("signature") != engine.signature()
+        if stale or (shape is not None and surface.shape != tuple(shape)):
+            return cls.build(engine, path, shape or surface.shape)
+        return surface
+
+    def lookup(self, cr, wl, du) -> Dict[str, np.ndarray]:
+        """Interpolasi trilinear; input di luar domain menghasilkan NaN (setara None pada engine)."""
+        cr, wl, du = np.broadcast_arrays(
+            np.asarray(cr, dtype=float), np.asarray(wl, dtype=float), np.asarray(du, dtype=float)
+        )
+        out_shape = cr.shape
+        idx = []
+        frac = []
+        inside = np.ones(cr.size, dtype=bool)
+        for v, (lo, hi), n in zip((cr.ravel(), wl.ravel(), du.ravel()), self.domain, self.shape):
+            inside &= (v >= lo) & (v <= hi)
+            v = np.where(inside, v, lo)  # NaN/di luar domain: indeks aman, hasil diganti NaN di akhir
+            t = (v - lo) / (hi - lo) * (n - 1)
+            i0 = np.minimum(np.floor(t).astype(np.intp), n - 2)
+            idx.append(i0)
+            frac.append(t - i0)
+
+        (i, j, k), (fi, fj, fk) = idx, frac
+        result = np.zeros((2, cr.size))
+        for di, wi in ((0, 1 - fi), (1, fi)):
+            for dj, wj in ((0, 1 - fj), (1, fj)):
+                for dk, wk in ((0, 1 - fk), (1, fk)):
+                    result += self.table[:, i + di, j + dj, k + dk] * (wi * wj * wk)
+        result[:, ~inside] = np.nan
+        return {
+            "flood_val": result[0].reshape(out_shape),
+            "depth_val": result[1].reshape(out_shape)
+        }
+
+    def max_error(self, engine: FuzzyFloodEngine, samples: int = 20000, seed: int = 0) -> Dict[str, float]:
+        """Galat interpolasi maksimum terhadap engine eksak pada titik acak di dalam domain."""
+        rng = np.random.default_rng(seed)
+        pts = [rng.uniform(lo, hi, samples) for lo, hi in self.domain]
+        exact = engine.infer_batch(*pts)
+        approx = self.lookup(*pts)
+        return {
+            key: float(np.nanmax(np.abs(exact[key] - approx[key])))
+            for key in ("flood_val", "depth_val")
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangun atau gunakan permukaan inferensi .npy")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_build = sub.add_parser("build", help="hitung ulang tabel (atau pakai yang ada bila masih valid)")
+    p_build.add_argument("path")
+    p_build.add_argument("--shape", type=int, nargs=3, default=list(DEFAULT_SHAPE), metavar=("N_CR", "N_WL", "N_DU"))
+    p_build.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="centroid")
+    p_build.add_argument("--force", action="store_true", help="bangun ulang walaupun signature cocok")
+
+    p_lookup = sub.add_parser("lookup", help="interpolasi satu titik")
+    p_lookup.add_argument("path")
+    p_lookup.add_argument("cr", type=float)
+    p_lookup.add_argument("wl", type=float)
+    p_lookup.add_argument("du", type=float)
+
+    args = parser.parse_args()
+    if args.cmd == "build":
+        engine = FuzzyFloodEngine(defuzz=args.defuzz)
+        if args.force:
+            surface = InferenceSurface.build(engine, args.path, tuple(args.shape))
+        else:
+            surface = InferenceSurface.load_or_build(engine, args.path, tuple(args.shape))
+        err = surface.meta.get("max_error", {})
+        print(f"Tabel {surface.shape} tersimpan di {args.path}")
+        print(f"Galat interpolasi maks: banjir={err.get('flood_val', float('nan')):.4f}, "
+              f"kedalaman={err.get('depth_val', float('nan')):.4f} m")
+    else:
+        res = InferenceSurface.load(args.path).lookup(args.cr, args.wl, args.du)
+        print(f"flood_val={float(res['flood_val']):.4f} depth_val={float(res['depth_val']):.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,380 @@
+"""
+Daemon headless yang mengikuti (tail) file log stasiun di sebuah direktori drop, menilai baris baru dengan
+FuzzyFloodEngine dan mengeluarkan alert saat status banjir stasiun berpindah AMAN/WASPADA/BAHAYA.
+
+Setiap file `<stasiun>.log` berisi satu pembacaan per baris: `[timestamp] cr wl du`, dipisah spasi, tab,
+koma atau titik koma; timestamp (opsional) diteruskan apa adanya ke alert. Baris kosong dan komentar `#`
+dilewati, baris lain yang tidak valid dihitung. Baris terakhir tanpa newline ditunggu sampai lengkap.
+
+Offset byte per file dan status alert per stasiun disimpan secara atomik setelah setiap putaran, sehingga
+daemon yang dijalankan ulang melanjutkan dari posisi terakhir. File yang dirotasi (inode baru) atau
+dipotong dibaca ulang dari awal. Saat tidak ada data, interval polling memanjang hingga `--max-interval`.
+
+Contoh:
+    python tail_daemon.py /data/drop --alerts alerts.jsonl
+    python tail_daemon.py /data/drop --pattern "*.txt" --hysteresis 5 --confirm 2 --stats-interval 60
+"""
+import argparse
+import bisect
+import fnmatch
+import hashlib
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from engine_config import default_cache_dir, load_engine, uses_default_variables
+from fuzzy_engine import FuzzyFloodEngine
+from status import FLOOD_LEVELS
+
+STATE_VERSION = 1
+
+
+def parse_lines(data: bytes) -> Tuple[List[Tuple[float, float, float]], List[Optional[str]], int]:
+    """Mengurai blok baris lengkap; mengembalikan (input, timestamp, jumlah baris tidak valid)."""
+    rows, stamps, invalid = [], [], 0
+    for line in data.replace(b",", b" ").replace(b";", b" ").splitlines():
+        fields = line.split()
+        if not fields or fields[0].startswith(b"#"):
+            continue
+        try:
+            if len(fields) == 3:
+                rows.append((float(fields[0]), float(fields[1]), float(fields[2])))
+                stamps.append(None)
+            elif len(fields) == 4:
+                rows.append((float(fields[1]), float(fields[2]), float(fields[3])))
+                stamps.append(fields[0].decode("utf-8", "replace"))
+            else:
+                invalid += 1
+        except ValueError:
+            invalid += 1
+    return rows, stamps, invalid
+
+
+class AlertTracker:
+    """
+    Status banjir per stasiun dengan histeresis. Status naik begitu nilai mencapai batas level berikutnya,
+    tetapi baru turun bila nilai berada `hysteresis` poin di bawah batas level saat ini. Perpindahan
+    baru dikonfirmasi setelah `confirm` pembacaan berturut-turut menunjuk level yang sama.
+    Stasiun baru dianggap berstatus level terendah (AMAN).
+    """
+
+    def __init__(self, levels=FLOOD_LEVELS, hysteresis: float = 5.0, confirm: int = 1):
+        if hysteresis < 0:
+            raise ValueError("hysteresis tidak boleh negatif")
+        if confirm < 1:
+            raise ValueError("confirm minimal 1")
+        self.labels = [label for _, label, _ in levels]
+        self.limits = [limit for limit, _, _ in levels[:-1]]
+        self.hysteresis = float(hysteresis)
+        self.lowered = [limit - self.hysteresis for limit in self.limits]
+        self.confirm = int(confirm)
+        self.stations: Dict[str, List[int]] = {}  # stasiun -> [level, kandidat, jumlah berturut-turut]
+
+    def _candidate(self, level: int, val: float) -> int:
+        up = bisect.bisect_right(self.limits, val)
+        if up > level:
+            return up
+        down = bisect.bisect_right(self.lowered, val)
+        return down if down < level else level
+
+    def update(self, station: str, values) -> List[Tuple[int, int, int]]:
+        """Memproses nilai berurutan satu stasiun; mengembalikan (indeks nilai, level lama, level baru)."""
+        state = self.stations.get(station)
+        if state is None:
+            state = self.stations[station] = [0, 0, 0]
+        level, pending, count = state
+        changes = []
+        for i, val in enumerate(values):
+            if val != val:  # NaN: tidak ada rule aktif, status dipertahankan
+                continue
+            cand = self._candidate(level, val)
+            if cand == level:
+                count = 0
+                continue
+            count = count + 1 if cand == pending else 1
+            pending = cand
+            if count >= self.confirm:
+                changes.append((i, level, cand))
+                level, count = cand, 0
+        state[:] = [level, pending, count]
+        return changes
+
+    def level(self, station: str) -> str:
+        state = self.stations.get(station)
+        return self.labels[state[0] if state else 0]
+
+    def to_dict(self) -> Dict[str, List[int]]:
+        return {station: list(state) for station, state in self.stations.items()}
+
+    def load(self, data: Dict[str, List[int]]):
+        top = len(self.labels) - 1
+        self.stations = {str(s): [min(int(v[0]), top), min(int(v[1]), top), int(v[2])] for s, v in data.items()}
+
+
+class TailDaemon:
+    """
+    directory: direktori drop yang berisi file log stasiun; nama stasiun = nama file tanpa ekstensi.
+    state_path: file JSON offset/status (default di direktori cache, dikunci oleh path direktori).
+    on_alert: dipanggil dengan dict alert untuk setiap perpindahan status.
+    max_read: batas byte yang dibaca per file per putaran agar satu file besar tidak menahan yang lain.
+    max_batch: jumlah baris maksimum per panggilan infer_batch.
+    """
+
+    def __init__(self, directory: str, engine: Optional[FuzzyFloodEngine] = None, pattern: str = "*.log",
+                 state_path: Optional[str] = None, tracker: Optional[AlertTracker] = None,
+                 on_alert: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 max_read: int = 4 << 20, max_batch: int = 65536):
+        self.directory = os.path.abspath(directory)
+        self.engine = engine or FuzzyFloodEngine(defuzz="analytic")
+        if not uses_default_variables(self.engine.to_config()):
+            raise ValueError("Daemon membutuhkan input CR, WL, DU dan output Flood, Depth")
+        self.pattern = pattern
+        if state_path is None:
+            key = hashlib.sha1(self.directory.encode("utf-8")).hexdigest()[:12]
+            state_path = os.path.join(default_cache_dir(), f"tail-{key}.json")
+        self.state_path = state_path
+        self.tracker = tracker or AlertTracker()
+        self.on_alert = on_alert
+        self.max_read = max_read
+        self.max_batch = max_batch
+        self.offsets: Dict[str, Dict[str, int]] = {}  # nama file -> {"inode", "offset"}
+        self.counters = {"cycles": 0, "lines": 0, "invalid": 0, "batches": 0, "alerts": 0, "rotations": 0}
+        self.load_state()
+
+    def load_state(self):
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != STATE_VERSION:
+            return
+        self.offsets = {name: {"inode": int(v["inode"]), "offset": int(v["offset"])}
+                        for name, v in data.get("files", {}).items()}
+        self.tracker.load(data.get("stations", {}))
+
+    def checkpoint(self):
+        """Menulis offset dan status stasiun secara atomik (file sementara, fsync, lalu rename)."""
+        data = {"version": STATE_VERSION, "directory": self.directory,
+                "files": self.offsets, "stations": self.tracker.to_dict()}
+        os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.state_path)
+
+    def _scan(self) -> List[Tuple[str, int, int]]:
+        """File yang cocok dengan pola beserta (nama, inode, ukuran); offset file yang hilang dibuang."""
+        found = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not fnmatch.fnmatch(entry.name, self.pattern):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    if entry.is_file():
+                        found.append((entry.name, st.st_ino, st.st_size))
+        except FileNotFoundError:
+            return []
+        present = {name for name, _, _ in found}
+        for name in [n for n in self.offsets if n not in present]:
+            del self.offsets[name]
+        return found
+
+    def _read_new(self, name: str, inode: int, size: int) -> Optional[Tuple[bytes, int]]:
+        """Blok baris lengkap yang belum dibaca dan offset sesudahnya, atau None bila tidak ada."""
+        known = self.offsets.get(name)
+        offset = known["offset"] if known else 0
+        if known and (known["inode"] != inode or size < offset):
+            offset = 0  # dirotasi atau dipotong
+            self.counters["rotations"] += 1
+            self.offsets[name] = {"inode": inode, "offset": 0}
+        if size <= offset:
+            return None
+        try:
+            with open(os.path.join(self.directory, name), "rb") as f:
+                f.seek(offset)
+                data = f.read(min(size - offset, self.max_read))
+        except OSError:
+            return None
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            if len(data) < self.max_read:
+                return None  # baris belum lengkap
+            end = len(data)  # satu "baris" melebihi max_read: dibuang
+            self.counters["invalid"] += 1
+            return b"", offset + end
+        return data[:end], offset + end
+
+    def _score(self, rows: List[Tuple[float, float, float]]) -> Dict[str, np.ndarray]:
+        arr = np.array(rows, dtype=float).reshape(-1, 3)
+        parts = []
+        for start in range(0, len(arr), self.max_batch):
+            chunk = arr[start:start + self.max_batch]
+            parts.append(self.engine.infer_batch(chunk[:, 0], chunk[:, 1], chunk[:, 2]))
+            self.counters["batches"] += 1
+        if len(parts) == 1:
+            return parts[0]
+        return {key: np.concatenate([p[key] for p in parts]) for key in ("flood_val", "depth_val")}
+
+    def _alert(self, station: str, name: str, row, stamp, flood: float, depth: float,
+               old: int, new: int) -> Dict[str, Any]:
+        labels = self.tracker.labels
+        return {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "station": station,
+            "file": name,
+            "timestamp": stamp,
+            "from": labels[old],
+            "to": labels[new],
+            "direction": "naik" if new > old else "turun",
+            "cr": row[0], "wl": row[1], "du": row[2],
+            "flood_val": round(flood, 2),
+            "depth_val": None if depth != depth else round(depth, 3),
+        }
+
+    def poll_once(self) -> int:
+        """
+        Satu putaran: baca baris baru semua file, nilai sekaligus, keluarkan alert, simpan state.
+        Mengembalikan jumlah byte baru yang diproses (0 bila tidak ada data).
+        """
+        self.counters["cycles"] += 1
+        before = len(self.offsets)
+        files = []  # (nama, inode, offset baru, input, timestamp)
+        consumed = 0
+        for name, inode, size in self._scan():
+            chunk = self._read_new(name, inode, size)
+            if chunk is None:
+                continue
+            consumed += chunk[1] - self.offsets.get(name, {"offset": 0})["offset"]
+            rows, stamps, invalid = parse_lines(chunk[0])
+            self.counters["invalid"] += invalid
+            files.append((name, inode, chunk[1], rows, stamps))
+
+        if not files:
+            if len(self.offsets) != before:
+                self.checkpoint()
+            return 0
+
+        all_rows = [row for f in files for row in f[3]]
+        alerts = []
+        if all_rows:
+            res = self._score(all_rows)
+            flood, depth = res["flood_val"].tolist(), res["depth_val"].tolist()
+            start = 0
+            for name, _, _, rows, stamps in files:
+                stop = start + len(rows)
+                station = os.path.splitext(name)[0]
+                for i, old, new in self.tracker.update(station, flood[start:stop]):
+                    alerts.append(self._alert(station, name, rows[i], stamps[i],
+                                              flood[start + i], depth[start + i], old, new))
+                start = stop
+
+        # Alert dikirim sebelum offset disimpan: bila daemon mati di antaranya, baris dibaca ulang (at-least-once)
+        for alert in alerts:
+            if self.on_alert:
+                self.on_alert(alert)
+        self.counters["alerts"] += len(alerts)
+        self.counters["lines"] += len(all_rows)
+        for name, inode, offset, _, _ in files:
+            self.offsets[name] = {"inode": inode, "offset": offset}
+        self.checkpoint()
+        return consumed
+
+    def run(self, stop: Optional[threading.Event] = None, min_interval: float = 0.2, max_interval: float = 2.0,
+            on_stats: Optional[Callable[[Dict[str, Any]], None]] = None, stats_interval: float = 0.0):
+        """
+        Polling sampai `stop` di-set. Interval kembali ke `min_interval` setiap ada data dan berlipat dua
+        saat kosong hingga `max_interval`, sehingga CPU nyaris diam ketika stasiun tidak mengirim data.
+        """
+        stop = stop or threading.Event()
+        interval = min_interval
+        next_stats = time.monotonic() + stats_interval
+        try:
+            while not stop.is_set():
+                if self.poll_once():
+                    interval = min_interval
+                else:
+                    interval = min(interval * 2, max_interval)
+                if on_stats and stats_interval > 0 and time.monotonic() >= next_stats:
+                    on_stats(self.stats())
+                    next_stats = time.monotonic() + stats_interval
+                stop.wait(interval)
+        finally:
+            self.checkpoint()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "files": len(self.offsets), "stations": len(self.tracker.stations)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ikuti file log stasiun di direktori drop dan keluarkan alert status banjir.")
+    parser.add_argument("directory")
+    parser.add_argument("--pattern", default="*.log", help="pola nama file stasiun (default: *.log)")
+    parser.add_argument("--state", help="file JSON offset/status (default: di direktori cache)")
+    parser.add_argument("--alerts", help="tambahkan alert (JSON per baris) ke file ini; default stdout")
+    parser.add_argument("--hysteresis", type=float, default=5.0,
+                        help="jarak (poin risiko) di bawah batas sebelum status turun (default: 5)")
+    parser.add_argument("--confirm", type=int, default=1,
+                        help="jumlah pembacaan berturut-turut untuk mengonfirmasi perpindahan status")
+    parser.add_argument("--min-interval", type=float, default=0.2, help="interval polling saat ada data (detik)")
+    parser.add_argument("--max-interval", type=float, default=2.0, help="interval polling maksimum saat diam (detik)")
+    parser.add_argument("--stats-interval", type=float, default=0.0, metavar="DETIK",
+                        help="cetak statistik ke stderr setiap DETIK detik (0 = tidak)")
+    parser.add_argument("--config", help="file konfigurasi engine JSON (lihat engine_config.py)")
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="analytic",
+                        help="metode defuzzifikasi (default: analytic, centroid eksak tanpa grid)")
+    parser.add_argument("--profile", choices=list(FuzzyFloodEngine.PROFILES),
+                        help="profil resolusi/presisi engine (lihat profile_report.py)")
+    parser.add_argument("--once", action="store_true", help="proses data yang ada satu kali lalu keluar")
+    args = parser.parse_args(argv)
+
+    out = open(args.alerts, "a", encoding="utf-8") if args.alerts else sys.stdout
+
+    def emit(alert):
+        out.write(json.dumps(alert, ensure_ascii=False) + "\n")
+        out.flush()
+
+    def report(st):
+        print(f"{st['lines']} baris, {st['invalid']} tidak valid, {st['alerts']} alert, "
+              f"{st['files']} file, {st['batches']} batch", file=sys.stderr)
+
+    try:
+        if args.config:
+            engine = load_engine(args.config, defuzz=args.defuzz, profile=args.profile)
+        else:
+            engine = FuzzyFloodEngine(defuzz=args.defuzz, profile=args.profile)
+        daemon = TailDaemon(args.directory, engine, args.pattern, args.state,
+                            AlertTracker(hysteresis=args.hysteresis, confirm=args.confirm), emit)
+        if args.once:
+            while daemon.poll_once():
+                pass
+            report(daemon.stats())
+            return 0
+        stop = threading.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: stop.set())
+        daemon.run(stop, args.min_interval, args.max_interval, report, args.stats_interval)
+        report(daemon.stats())
+    except (OSError, ValueError) as e:
+        print(f"Kesalahan: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
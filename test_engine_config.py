@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from engine_config import build_engine, config_hash, validate_config
+from fuzzy_engine import FuzzyFloodEngine
+
+
+def test_corrupt_cached_artifacts_are_rebuilt(tmp_path):
+    config = FuzzyFloodEngine().to_config()
+    engine, cached = build_engine(config, str(tmp_path))
+    assert not cached
+    path = os.path.join(str(tmp_path), f"{config_hash(config)}.npz")
+    expected = engine.infer(140, 2.2, 8)["flood_val"]
+
+    for data in (b"", open(path, "rb").read()[:100]):  # kosong (EOFError) dan terpotong (BadZipFile)
+        with open(path, "wb") as f:
+            f.write(data)
+        engine, cached = build_engine(config, str(tmp_path))
+        assert not cached
+        assert engine.infer(140, 2.2, 8)["flood_val"] == expected
+        assert build_engine(config, str(tmp_path))[1]  # artefak sudah ditulis ulang
+
+
+def test_invalid_rule_labels_and_names_raise_value_error():
+    config = FuzzyFloodEngine().to_config()
+    bad = dict(config, rules=[[["rendah"]] + config["rules"][0][1:]])
+    with pytest.raises(ValueError, match="harus berupa teks"):
+        validate_config(bad)
+
+    inputs = dict(config["inputs"])
+    inputs["Flood"] = inputs.pop("DU")
+    with pytest.raises(ValueError, match="inputs dan outputs"):
+        validate_config(dict(config, inputs=inputs))
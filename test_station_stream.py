@@ -0,0 +1,43 @@
+import pytest
+
+from station_stream import StationStreamEvaluator
+
+
+def test_backwards_timestamp_leaves_tick_untouched():
+    ev = StationStreamEvaluator()
+    ev.update_many([("A", 0, 10.0, 1.0), ("B", 0, 5.0, 0.5)])
+    before = {s: (st.last_time, st.inputs, st.result) for s, st in ev.stations.items()}
+
+    # A dan C valid, B mundur: tidak ada state yang boleh berubah
+    with pytest.raises(ValueError):
+        ev.update_many([("A", 60, 150.0, 2.5), ("C", 60, 1.0, 0.1), ("B", -60, 5.0, 0.5)])
+    assert "C" not in ev.stations
+    assert {s: (st.last_time, st.inputs, st.result) for s, st in ev.stations.items()} == before
+
+    results = ev.update_many([("A", 60, 150.0, 2.5), ("B", 60, 5.0, 0.5), ("A", 120, 150.0, 2.5)])
+    assert all(r["flood_val"] is not None for r in results)
+    assert results[0]["recomputed"] and not results[2]["recomputed"]
+
+
+def test_station_without_result_is_reevaluated():
+    ev = StationStreamEvaluator()
+    ev.update("A", 0, 10.0, 1.0)
+    ev.stations["A"].result = None  # mis. infer_batch gagal di tick sebelumnya
+    r = ev.update("A", 60, 10.0, 1.0)
+    assert r["recomputed"] and r["flood_val"] is not None
+
+
+def test_nan_reading_is_recomputed():
+    ev = StationStreamEvaluator()
+    high = ev.update("A", 0, 150.0, 2.5)
+    assert high["flood_val"] is not None
+    r = ev.update("A", 60, 150.0, float("nan"))
+    assert r["recomputed"] and r["flood_val"] != high["flood_val"]
+
+
+def test_station_recovers_after_nan_first_reading():
+    ev = StationStreamEvaluator()
+    first = ev.update("A", 0, float("nan"), 1.0)
+    assert first["flood_val"] is None
+    r = ev.update("A", 60, 10.0, 1.0)
+    assert r["recomputed"] and r["flood_val"] is not None
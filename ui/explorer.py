@@ -0,0 +1,135 @@
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSlider
+from PyQt5.QtCore import Qt
+import numpy as np
+
+from control_surface import ControlSurface, INPUTS
+from ui.widgets import PlotCanvas
+
+INPUT_NAMES = {"cr": "Curah Hujan (mm/jam)", "wl": "Ketinggian Air (m)", "du": "Durasi (jam)"}
+VIEWS = ["Nilai output", "|Gradien| terhadap sumbu X", "|Gradien| terhadap sumbu Y", "|Gradien| terhadap input tetap"]
+SLIDER_STEPS = 240
+
+
+class SurfaceExplorer(QWidget):
+    """
+    Tab permukaan kontrol: dua input disapu di grid padat, input ketiga diatur dengan slider.
+    `engine_getter` dipanggil setiap perhitungan agar engine hasil hot reload langsung dipakai.
+    """
+
+    def __init__(self, engine_getter, parent=None, shape=(300, 500)):
+        super().__init__(parent)
+        self.engine_getter = engine_getter
+        self.shape = shape
+        self.explorer = None
+
+        layout = QVBoxLayout(self)
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Sumbu X:"))
+        self.x_combo = QComboBox()
+        self.x_combo.addItems([INPUT_NAMES[k] for k in INPUTS])
+        controls.addWidget(self.x_combo)
+        controls.addWidget(QLabel("Sumbu Y:"))
+        self.y_combo = QComboBox()
+        self.y_combo.addItems([INPUT_NAMES[k] for k in INPUTS])
+        self.y_combo.setCurrentIndex(1)
+        controls.addWidget(self.y_combo)
+        controls.addWidget(QLabel("Tampilkan:"))
+        self.view_combo = QComboBox()
+        self.view_combo.addItems(VIEWS)
+        controls.addWidget(self.view_combo)
+        layout.addLayout(controls)
+
+        fixed_row = QHBoxLayout()
+        self.fixed_label = QLabel()
+        self.fixed_label.setMinimumWidth(220)
+        self.fixed_slider = QSlider(Qt.Horizontal)
+        self.fixed_slider.setRange(0, SLIDER_STEPS)
+        self.fixed_slider.setValue(SLIDER_STEPS // 3)
+        fixed_row.addWidget(self.fixed_label)
+        fixed_row.addWidget(self.fixed_slider)
+        layout.addLayout(fixed_row)
+
+        plots = QHBoxLayout()
+        self.flood_plot = PlotCanvas(self, width=5, height=3)
+        self.depth_plot = PlotCanvas(self, width=5, height=3)
+        plots.addWidget(self.flood_plot)
+        plots.addWidget(self.depth_plot)
+        layout.addLayout(plots, 1)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setStyleSheet("color: #5c5f77; font-size: 11px;")
+        layout.addWidget(self.summary_label)
+
+        # Slider digeser terus-menerus: hitung setelah jeda singkat, bukan di setiap nilai
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(30)
+        self.timer.timeout.connect(self.refresh)
+        self.x_combo.currentIndexChanged.connect(self._on_axes_changed)
+        self.y_combo.currentIndexChanged.connect(self._on_axes_changed)
+        self.view_combo.currentIndexChanged.connect(self.timer.start)
+        self.fixed_slider.valueChanged.connect(self._on_fixed_changed)
+        self._on_fixed_changed()
+
+    def _axes(self):
+        x, y = INPUTS[self.x_combo.currentIndex()], INPUTS[self.y_combo.currentIndex()]
+        return x, y, next(k for k in INPUTS if k not in (x, y))
+
+    def _fixed_value(self):
+        _, _, z = self._axes()
+        lo, hi = self._explorer().domain[z]
+        return lo + (hi - lo) * self.fixed_slider.value() / SLIDER_STEPS
+
+    def _explorer(self):
+        engine = self.engine_getter()
+        if self.explorer is None or self.explorer.engine is not engine:
+            self.explorer = ControlSurface(engine, self.shape)
+        return self.explorer
+
+    def _on_axes_changed(self, *_):
+        if self.x_combo.currentIndex() == self.y_combo.currentIndex():
+            # pilih sumbu Y lain agar kedua sumbu selalu berbeda
+            self.y_combo.blockSignals(True)
+            self.y_combo.setCurrentIndex((self.x_combo.currentIndex() + 1) % len(INPUTS))
+            self.y_combo.blockSignals(False)
+        self._on_fixed_changed()
+
+    def _on_fixed_changed(self, *_):
+        _, _, z = self._axes()
+        self.fixed_label.setText(f"{INPUT_NAMES[z]} tetap: {self._fixed_value():.2f}")
+        self.timer.start()
+
+    def refresh(self):
+        if not self.isVisible():
+            return  # dihitung saat tab ditampilkan (showEvent)
+        x, y, z = self._axes()
+        explorer = self._explorer()
+        view = self.view_combo.currentIndex()
+        t0 = QtCore.QElapsedTimer()
+        t0.start()
+        sens = explorer.sensitivity(x, y, self._fixed_value())
+        surface = sens["surface"]
+        extent = [surface["x"][0], surface["x"][-1], surface["y"][0], surface["y"][-1]]
+
+        for plot, out, title, unit in ((self.flood_plot, "flood", "Risiko Banjir", "risiko (0-100)"),
+                                       (self.depth_plot, "depth", "Kedalaman Air", "kedalaman (m)")):
+            if view == 0:
+                data, label, cmap = surface[out], unit, "RdYlGn_r"
+            else:
+                wrt = (x, y, z)[view - 1]
+                data, label, cmap = np.abs(sens["gradients"][out][wrt]), f"|d {unit} / d {wrt}|", "magma"
+            plot.show_heatmap(data, extent, title, INPUT_NAMES[x], INPUT_NAMES[y], cmap, label)
+
+        parts = []
+        for out, name in (("flood", "Risiko"), ("depth", "Kedalaman")):
+            ranked = sorted(sens["summary"][out].items(), key=lambda kv: -np.nan_to_num(kv[1]))
+            parts.append(f"{name}: " + ", ".join(f"{k.upper()} {v:.2f}" for k, v in ranked))
+        self.summary_label.setText(
+            "Sensitivitas (rata-rata perubahan output per rentang penuh input) - " + " | ".join(parts)
+            + f"   [{self.shape[0]}x{self.shape[1]} titik, {t0.elapsed()} ms]")
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.timer.start()
@@ -0,0 +1,45 @@
+from PyQt5 import QtCore
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt5.QtCore import Qt
+
+
+class LazyTab(QWidget):
+    """
+    Tab yang isinya baru dibangun saat pertama kali ditampilkan, agar impor berat (matplotlib) dan pembuatan
+    kanvas tidak memperlambat munculnya jendela. Dengan armed=False tab tidak membangun sendiri sampai arm()
+    dipanggil (mis. setelah jendela pertama kali tergambar); ensure() membangun seketika bila isi dibutuhkan.
+    """
+
+    created = QtCore.pyqtSignal(object)
+
+    def __init__(self, factory, parent=None, armed=True):
+        super().__init__(parent)
+        self.factory = factory
+        self.armed = armed
+        self.widget = None
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel("Memuat...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("color: #9ca0b0;")
+        self._layout.addWidget(self._placeholder)
+
+    def ensure(self):
+        if self.widget is None:
+            self.widget = self.factory()
+            self._layout.removeWidget(self._placeholder)
+            self._placeholder.deleteLater()
+            self._layout.addWidget(self.widget)
+            self.created.emit(self.widget)
+        return self.widget
+
+    def arm(self):
+        """Mengizinkan pembangunan otomatis; tab yang sedang tampil dibangun pada putaran event loop berikutnya."""
+        self.armed = True
+        if self.isVisible() and self.widget is None:
+            QtCore.QTimer.singleShot(0, self.ensure)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self.armed and self.widget is None:
+            QtCore.QTimer.singleShot(0, self.ensure)
@@ -0,0 +1,168 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+
+class RuleTableModel(QAbstractTableModel):
+    """
+    Tabel inferensi rule di atas array NumPy (indeks evaluasi, indeks rule, kekuatan firing).
+    View hanya meminta sel yang terlihat, jadi ribuan baris tidak membuat widget per sel.
+
+    Mode:
+    - "active": rule yang aktif pada evaluasi terakhir
+    - "matrix": seluruh rule base untuk evaluasi terakhir, termasuk firing 0
+    - "accumulated": rule aktif dari semua evaluasi sejak dibersihkan (maksimum `max_rows` baris terbaru)
+    """
+
+    MODES = ("active", "matrix", "accumulated")
+    HEADERS = ["ID", "Anteseden (CR, WL, DU)", "Kekuatan Firing", "Konsekuen"]
+    EXPORT_HEADERS = ["ID", "Antecedent", "Firing", "Consequent"]  # nama kolom report.csv
+
+    def __init__(self, parent=None, max_rows=500000):
+        super().__init__(parent)
+        self.mode = "active"
+        self.max_rows = max_rows
+        self._rules = None
+        self._ant_text = []
+        self._cons_text = []
+        self._firing = np.zeros(0)  # firing semua rule pada evaluasi terakhir
+        self.evaluations = 0
+        self._clear_rows()
+
+    def _clear_rows(self):
+        # Buffer dengan kapasitas tumbuh ganda; baris terpakai hanya [:self._n]
+        self._rows_eval = np.zeros(64, dtype=np.int64)
+        self._rows_rule = np.zeros(64, dtype=np.int64)
+        self._rows_firing = np.zeros(64)
+        self._n = 0
+        self._last_start = 0  # baris pertama milik evaluasi terakhir
+        self._refresh_view()
+
+    def _append_rows(self, evaluation, rules, firing):
+        names = ("_rows_eval", "_rows_rule", "_rows_firing")
+        if self._n + rules.size > self.max_rows:
+            # buang baris terlama, sisakan max_rows terbaru (evaluasi terakhir selalu utuh)
+            drop = min(self._n, self._n + rules.size - self.max_rows)
+            for name in names:
+                buf = getattr(self, name)
+                buf[:self._n - drop] = buf[drop:self._n].copy()
+            self._n -= drop
+        if self._n + rules.size > self._rows_rule.size:
+            cap = max(self._rows_rule.size * 2, self._n + rules.size)
+            for name in names:
+                buf = getattr(self, name)
+                grown = np.zeros(cap, dtype=buf.dtype)
+                grown[:self._n] = buf[:self._n]
+                setattr(self, name, grown)
+
+        end = self._n + rules.size
+        self._rows_eval[self._n:end] = evaluation
+        self._rows_rule[self._n:end] = rules
+        self._rows_firing[self._n:end] = firing
+        self._last_start, self._n = self._n, end
+
+    # Data
+    def set_rules(self, rules):
+        """Label rule untuk teks anteseden/konsekuen; akumulasi dibersihkan bila rule base berganti."""
+        if rules is self._rules:
+            return
+        self.beginResetModel()
+        self._rules = rules
+        self._ant_text = [f"CH:{r[0]}, KA:{r[1]}, DR:{r[2]}" for r in rules]
+        self._cons_text = [f"Banjir:{r[3]} / Kedalaman:{r[4]}" for r in rules]
+        self._firing = np.zeros(len(rules))
+        self.evaluations = 0
+        self._clear_rows()
+        self.endResetModel()
+
+    def add_evaluation(self, active):
+        """Mencatat satu hasil evaluasi (daftar rule aktif dari engine) dengan satu reset model."""
+        firing = np.zeros(len(self._ant_text))
+        for r in active:
+            firing[r["id"] - 1] = r["firing"]
+
+        self.beginResetModel()
+        self._firing = firing
+        self.evaluations += 1
+        idx = np.flatnonzero(firing > 0)
+        self._append_rows(self.evaluations, idx, firing[idx])
+        self._refresh_view()
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._firing = np.zeros(len(self._ant_text))
+        self.evaluations = 0
+        self._clear_rows()
+        self.endResetModel()
+
+    def set_mode(self, mode):
+        if mode not in self.MODES:
+            raise ValueError(f"Mode tabel rule tidak dikenal: {mode}")
+        self.beginResetModel()
+        self.mode = mode
+        self._refresh_view()
+        self.endResetModel()
+
+    def _refresh_view(self):
+        """Menyiapkan (indeks evaluasi atau None, indeks rule, firing) untuk mode saat ini; dipanggil tiap reset."""
+        if self.mode == "matrix":
+            self._view = (None, np.arange(self._firing.size), self._firing)
+        elif self.mode == "active":
+            rows = slice(self._last_start, self._n)
+            self._view = (None, self._rows_rule[rows], self._rows_firing[rows])
+        else:
+            rows = slice(0, self._n)
+            self._view = (self._rows_eval[rows], self._rows_rule[rows], self._rows_firing[rows])
+
+    def rows(self):
+        """Baris mode saat ini sebagai nilai mentah (kolom sesuai export_headers()), mis. untuk ekspor CSV."""
+        evals, rules, firing = self._view
+        for i in range(rules.size):
+            k = int(rules[i])
+            row = [k + 1, self._ant_text[k], float(firing[i]), self._cons_text[k]]
+            if evals is not None:
+                row.insert(0, int(evals[i]))
+            yield row
+
+    def headers(self):
+        return (["Evaluasi"] if self.mode == "accumulated" else []) + self.HEADERS
+
+    def export_headers(self):
+        return (["Evaluation"] if self.mode == "accumulated" else []) + self.EXPORT_HEADERS
+
+    # QAbstractTableModel
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return self._view[1].size
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers())
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers()[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        evals, rules, firing = self._view
+        row, col = index.row(), index.column()
+        if evals is not None:
+            col -= 1
+        if role == Qt.DisplayRole:
+            k = int(rules[row])
+            if col == -1:
+                return str(int(evals[row]))
+            if col == 0:
+                return str(k + 1)
+            if col == 1:
+                return self._ant_text[k]
+            if col == 2:
+                return f"{firing[row]:.3f}"
+            return self._cons_text[k]
+        if role == Qt.ForegroundRole and firing[row] == 0:
+            return QColor("#9ca0b0")  # rule tidak aktif pada mode matriks
+        return None
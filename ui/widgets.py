@@ -1,4 +1,5 @@
 from PyQt5 import QtWidgets
+import numpy as np
 import matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
@@ -17,10 +18,87 @@ class PlotCanvas(FigureCanvas):
             'legend.frameon': False,
         }
         matplotlib.rcParams.update(plt_style)
-        
-        fig = Figure(figsize=(width, height), dpi=dpi)
+
+        # tight_layout hanya dijalankan saat gambar penuh (konten statis berubah atau resize), bukan saat blit
+        fig = Figure(figsize=(width, height), dpi=dpi, tight_layout=True)
         self.axes = fig.add_subplot(111)
         super().__init__(fig)
         self.setParent(parent)
         self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
         self.updateGeometry()
+
+        # Artist persisten untuk plot agregasi: kurva MF dan legenda digambar sekali sebagai background,
+        # kurva agregasi dan garis hasil (animated) di-blit di atasnya pada setiap update
+        self._static = None
+        self._background = None
+        self.agg_line = None
+        self.result_line = None
+        self.image = None
+        self.colorbar = None
+        self.mpl_connect("draw_event", self._on_draw)
+
+    def set_static(self, title, x, mfs, color):
+        """Menggambar judul, kurva MF dan legenda; dilewati bila `x` dan `mfs` tetap objek yang sama."""
+        if self._static is not None and self._static[0] is x and self._static[1] is mfs:
+            return
+        ax = self.axes
+        ax.clear()
+        ax.set_title(title, color='#4c4f69')
+        self.agg_line, = ax.plot(x, np.zeros_like(x), label="Teragregasi", color=color, linewidth=2, animated=True)
+        for k, v in mfs.items():
+            ax.plot(x, v, '--', alpha=0.3, label=k)
+        self.result_line = ax.axvline(x=x[0], color='#40a02b', linestyle='-', linewidth=2, label='Hasil',
+                                      animated=True)
+        ax.legend(loc='upper center', bbox_to_anchor=(0.5, -0.12), ncol=3, fontsize='small', facecolor='#e6e9ef', edgecolor='#bcc0cc')
+        self.result_line.set_visible(False)  # disembunyikan setelah legenda dibuat agar entri "Hasil" tetap tampil
+        self._static = (x, mfs)
+        self._background = None
+        self.draw()
+
+    def update_result(self, agg, value):
+        """Mengganti kurva agregasi (None = kosong) dan posisi garis hasil, lalu blit."""
+        x = self._static[0]
+        self.agg_line.set_ydata(np.zeros_like(x) if agg is None else agg)
+        if value is None:
+            self.result_line.set_visible(False)
+        else:
+            self.result_line.set_xdata([value, value])
+            self.result_line.set_visible(True)
+
+        if self._background is None:
+            self.draw()  # draw_event menyimpan background lalu menggambar artist animated
+            return
+        self.restore_region(self._background)
+        self._draw_animated()
+        self.blit(self.figure.bbox)
+
+    def _on_draw(self, _event):
+        if self._static is None:
+            return
+        self._background = self.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.axes.draw_artist(self.agg_line)
+        self.axes.draw_artist(self.result_line)
+
+    def show_heatmap(self, data, extent, title, xlabel, ylabel, cmap="viridis", label=""):
+        """Heatmap dengan AxesImage dan colorbar persisten; panggilan berikutnya hanya mengganti data."""
+        ax = self.axes
+        if self.image is None:
+            self.image = ax.imshow(data, origin="lower", aspect="auto", extent=extent, cmap=cmap,
+                                   interpolation="nearest")
+            self.colorbar = self.figure.colorbar(self.image, ax=ax)
+        else:
+            self.image.set_data(data)
+            self.image.set_extent(extent)
+            self.image.set_cmap(cmap)
+        finite = data[np.isfinite(data)]
+        if finite.size:
+            lo, hi = float(finite.min()), float(finite.max())
+            self.image.set_clim(lo, hi if hi > lo else lo + 1e-9)
+        ax.set_title(title, color='#4c4f69')
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        self.colorbar.set_label(label)
+        self.draw_idle()
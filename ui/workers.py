@@ -0,0 +1,66 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+from uncertainty import propagate
+
+
+class InferenceSignals(QObject):
+    finished = pyqtSignal(int, object, object)  # (token, input, hasil infer)
+    failed = pyqtSignal(int, str)
+
+
+class InferenceTask(QRunnable):
+    """
+    Menjalankan engine.infer() di thread pool.
+    `latest` mengembalikan token permintaan terbaru; tugas yang sudah basi dilewati tanpa menghitung.
+    """
+
+    def __init__(self, token, engine, inputs, latest):
+        super().__init__()
+        self.token = token
+        self.engine = engine
+        self.inputs = inputs
+        self.latest = latest
+        self.signals = InferenceSignals()
+
+    def run(self):
+        if self.token != self.latest():
+            return
+        try:
+            result = self.engine.infer(*self.inputs)
+        except Exception as e:  # error engine dilaporkan ke GUI, bukan mematikan thread pool
+            self.signals.failed.emit(self.token, str(e))
+            return
+        self.signals.finished.emit(self.token, self.inputs, result)
+
+
+class UncertaintySignals(QObject):
+    finished = pyqtSignal(int, object)  # (token, UncertaintyResult)
+    failed = pyqtSignal(int, str)
+
+
+class UncertaintyTask(QRunnable):
+    """
+    Menjalankan uncertainty.propagate() di thread pool.
+    Berhenti di batas blok berikutnya begitu `latest()` tidak lagi sama dengan token tugas ini.
+    """
+
+    def __init__(self, token, engine, inputs, noise, samples, latest):
+        super().__init__()
+        self.token = token
+        self.engine = engine
+        self.inputs = inputs
+        self.noise = noise
+        self.samples = samples
+        self.latest = latest
+        self.signals = UncertaintySignals()
+
+    def run(self):
+        stale = lambda: self.token != self.latest()
+        try:
+            result = propagate(self.engine, self.inputs, self.noise, self.samples, block_size=16384,
+                               should_stop=stale)
+        except Exception as e:  # error engine dilaporkan ke GUI, bukan mematikan thread pool
+            self.signals.failed.emit(self.token, str(e))
+            return
+        if not stale():
+            self.signals.finished.emit(self.token, result)
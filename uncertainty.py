@@ -0,0 +1,304 @@
+"""
+Propagasi ketidakpastian Monte Carlo: setiap input diberi model noise di sekitar satu pembacaan
+(mis. sensor CR, WL, DU), sampel ditarik per blok lalu dilewatkan ke infer_batch, dan distribusi output
+dikumpulkan dalam histogram streaming (memori tetap, tidak bergantung jumlah sampel).
+Hasil: rata-rata, simpangan baku, kuantil/pita kepercayaan dan peluang terlampaui, mis. P(flood_val >= 60).
+
+Contoh:
+    python uncertainty.py 120 2.5 8 --noise normal:10% normal:0.1 uniform:1 --samples 1000000
+    python uncertainty.py 120 2.5 8 --noise lognormal:0.3 none none --threshold flood_val=45
+"""
+import argparse
+import math
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fuzzy_engine import FuzzyFloodEngine
+from status import DEPTH_LEVELS, FLOOD_LEVELS
+
+NOISE_KINDS = ("none", "normal", "uniform", "lognormal")
+
+# Ambang peluang terlampaui bawaan: batas status di status.py
+DEFAULT_THRESHOLDS = {
+    "flood_val": tuple(limit for limit, _, _ in FLOOD_LEVELS if math.isfinite(limit)),
+    "depth_val": tuple(limit for limit, _, _ in DEPTH_LEVELS if math.isfinite(limit)),
+}
+
+
+class NoiseModel:
+    """
+    Model noise satu input di sekitar nilai pembacaan:
+    - "normal": nilai + N(0, scale)
+    - "uniform": nilai + U(-scale, scale)
+    - "lognormal": nilai * exp(N(0, scale)) (median = nilai; cocok untuk prakiraan hujan)
+    - "none": nilai tetap
+    relative: scale dikalikan |nilai| (tidak berlaku untuk lognormal, yang sudah multiplikatif).
+    """
+
+    __slots__ = ("kind", "scale", "relative")
+
+    def __init__(self, kind: str = "none", scale: float = 0.0, relative: bool = False):
+        if kind not in NOISE_KINDS:
+            raise ValueError(f"Model noise tidak dikenal: {kind} (pilihan: {', '.join(NOISE_KINDS)})")
+        if not scale >= 0:
+            raise ValueError(f"Skala noise harus >= 0, didapat {scale}")
+        self.kind = kind
+        self.scale = float(scale)
+        self.relative = relative
+
+    @classmethod
+    def parse(cls, spec: str) -> "NoiseModel":
+        """Dari teks "jenis:skala", mis. "normal:5", "normal:10%" (relatif), "lognormal:0.3" atau "none"."""
+        kind, _, scale = spec.strip().partition(":")
+        relative = scale.endswith("%")
+        try:
+            value = float(scale.rstrip("%")) if scale else 0.0
+        except ValueError:
+            raise ValueError(f"Skala noise tidak valid: '{spec}'")
+        return cls(kind.lower(), value / 100 if relative else value, relative)
+
+    def __repr__(self) -> str:
+        if self.kind == "none":
+            return "none"
+        return f"{self.kind}:{self.scale * 100:g}%" if self.relative else f"{self.kind}:{self.scale:g}"
+
+    def sample(self, value: float, n: int, rng: np.random.Generator) -> np.ndarray:
+        scale = self.scale * abs(value) if self.relative else self.scale
+        if self.kind == "none" or scale == 0:
+            return np.full(n, float(value))
+        if self.kind == "normal":
+            return value + rng.normal(0.0, scale, n)
+        if self.kind == "uniform":
+            return value + rng.uniform(-scale, scale, n)
+        return value * np.exp(rng.normal(0.0, self.scale, n))
+
+
+class StreamingHistogram:
+    """
+    Histogram linear dengan batas tetap [lo, hi] dan `bins` bucket; nilai di luar rentang masuk bucket
+    tepi, NaN dihitung terpisah. Kuantil dan peluang terlampaui diinterpolasi linear di dalam bucket
+    (galat paling besar satu lebar bucket).
+    """
+
+    def __init__(self, lo: float, hi: float, bins: int = 2000):
+        if not lo < hi or bins < 1:
+            raise ValueError("Histogram membutuhkan lo < hi dan bins >= 1")
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.bins = int(bins)
+        self.counts = np.zeros(self.bins, dtype=np.int64)
+        self.count = 0  # nilai terdefinisi (bukan NaN)
+        self.nan_count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.lo, self.hi, self.bins + 1)
+
+    def add(self, values: np.ndarray):
+        values = np.asarray(values, dtype=float).ravel()
+        ok = ~np.isnan(values)
+        self.nan_count += int(values.size - np.count_nonzero(ok))
+        values = values[ok]
+        if not values.size:
+            return
+        idx = ((values - self.lo) * (self.bins / (self.hi - self.lo))).astype(np.int64)
+        np.clip(idx, 0, self.bins - 1, out=idx)
+        self.counts += np.bincount(idx, minlength=self.bins)
+        self.count += values.size
+        self.total += float(values.sum())
+        self.total_sq += float(np.dot(values, values))
+        lo, hi = float(values.min()), float(values.max())
+        self.min = lo if self.min is None else min(self.min, lo)
+        self.max = hi if self.max is None else max(self.max, hi)
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def std(self) -> Optional[float]:
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        return math.sqrt(max(self.total_sq / self.count - mean * mean, 0.0))
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Kuantil q (0..1) dari nilai terdefinisi."""
+        if not self.count:
+            return None
+        cum = np.cumsum(self.counts)
+        target = q * self.count
+        i = int(np.searchsorted(cum, target, side="left"))
+        i = min(i, self.bins - 1)
+        before = cum[i - 1] if i else 0
+        width = (self.hi - self.lo) / self.bins
+        frac = (target - before) / self.counts[i] if self.counts[i] else 0.0
+        value = self.lo + (i + frac) * width
+        return float(min(max(value, self.min), self.max))
+
+    def exceedance(self, threshold: float) -> Optional[float]:
+        """Perkiraan P(nilai >= threshold) di antara nilai terdefinisi."""
+        if not self.count:
+            return None
+        pos = (threshold - self.lo) * self.bins / (self.hi - self.lo)
+        if pos <= 0:
+            return 1.0
+        if pos >= self.bins:
+            return 0.0
+        i = int(pos)
+        above = self.counts[i + 1:].sum() + self.counts[i] * (i + 1 - pos)
+        return float(above / self.count)
+
+
+class UncertaintyResult:
+    """Histogram per output plus hitungan tepat untuk ambang yang diminta."""
+
+    def __init__(self, inputs: Tuple[float, ...], noise: Sequence[NoiseModel],
+                 histograms: Dict[str, StreamingHistogram], thresholds: Dict[str, Tuple[float, ...]]):
+        self.inputs = inputs
+        self.noise = list(noise)
+        self.histograms = histograms
+        self.thresholds = thresholds
+        self.exceed_counts = {key: [0] * len(ts) for key, ts in thresholds.items()}
+        self.samples = 0
+        self.seconds = 0.0
+
+    def _add(self, outputs: Dict[str, np.ndarray]):
+        for key, hist in self.histograms.items():
+            values = outputs[key]
+            hist.add(values)
+            for i, t in enumerate(self.thresholds.get(key, ())):
+                self.exceed_counts[key][i] += int(np.count_nonzero(values >= t))
+        self.samples += next(iter(outputs.values())).size
+
+    def exceedance(self, key: str, threshold: float) -> Optional[float]:
+        """P(key >= threshold) di antara sampel dengan output terdefinisi; tepat untuk ambang yang diminta."""
+        hist = self.histograms[key]
+        if not hist.count:
+            return None
+        if threshold in self.thresholds.get(key, ()):
+            return self.exceed_counts[key][self.thresholds[key].index(threshold)] / hist.count
+        return hist.exceedance(threshold)
+
+    def band(self, key: str, level: float = 0.9) -> Optional[Tuple[float, float]]:
+        """Pita kepercayaan dua sisi (kuantil (1-level)/2 dan (1+level)/2)."""
+        hist = self.histograms[key]
+        if not hist.count:
+            return None
+        return hist.quantile((1 - level) / 2), hist.quantile((1 + level) / 2)
+
+    def to_dict(self, level: float = 0.9) -> Dict:
+        outputs = {}
+        for key, hist in self.histograms.items():
+            outputs[key] = {
+                "mean": hist.mean(),
+                "std": hist.std(),
+                "min": hist.min,
+                "max": hist.max,
+                "p50": hist.quantile(0.5),
+                "band": self.band(key, level),
+                "undefined_fraction": hist.nan_count / self.samples if self.samples else 0.0,
+                "exceedance": {t: self.exceedance(key, t) for t in self.thresholds.get(key, ())},
+            }
+        return {"inputs": list(self.inputs), "noise": [repr(m) for m in self.noise], "samples": self.samples,
+                "seconds": self.seconds, "level": level, "outputs": outputs}
+
+
+def input_domain(engine: FuzzyFloodEngine) -> List[Tuple[float, float]]:
+    """Rentang tiap input menurut MF-nya (min a .. max d); di luar rentang ini tidak ada rule yang aktif."""
+    return [(min(p[0] for p in mfs.values()), max(p[3] for p in mfs.values()))
+            for mfs in engine.input_params.values()]
+
+
+def propagate(engine: FuzzyFloodEngine, inputs: Sequence[float], noise: Sequence[NoiseModel],
+              samples: int = 1000000, seed: Optional[int] = 0, block_size: int = 65536, bins: int = 2000,
+              thresholds: Optional[Dict[str, Sequence[float]]] = None, clip: bool = True,
+              should_stop: Optional[Callable[[], bool]] = None) -> UncertaintyResult:
+    """
+    Menarik `samples` sampel input per blok `block_size`, menjalankan engine.infer_batch dan mengumpulkan
+    distribusi setiap output. clip: sampel dipotong ke rentang MF input (mis. curah hujan tidak negatif).
+    should_stop: dipanggil sebelum tiap blok; True menghentikan lebih awal (hasil berisi sampel yang sudah
+    diproses). Sebaiknya pakai engine tanpa ResultCache agar cache tidak dibanjiri sampel acak.
+    """
+    if len(inputs) != len(engine.input_names) or len(noise) != len(engine.input_names):
+        raise ValueError(f"Butuh {len(engine.input_names)} nilai input dan model noise "
+                         f"({', '.join(engine.input_names)})")
+    thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+    keys = [f"{key}_val" for key in engine.output_keys]
+    histograms = {key: StreamingHistogram(engine.universes[k][0], engine.universes[k][-1], bins)
+                  for key, k in zip(keys, engine.output_keys)}
+    result = UncertaintyResult(tuple(float(v) for v in inputs), noise, histograms,
+                               {k: tuple(float(t) for t in thresholds.get(k, ())) for k in keys})
+
+    rng = np.random.default_rng(seed)
+    domain = input_domain(engine)
+    t0 = time.perf_counter()
+    for start in range(0, samples, block_size):
+        if should_stop is not None and should_stop():
+            break
+        n = min(block_size, samples - start)
+        draws = [model.sample(value, n, rng) for model, value in zip(noise, inputs)]
+        if clip:
+            for d, (lo, hi) in zip(draws, domain):
+                np.clip(d, lo, hi, out=d)
+        result._add(engine.infer_batch(*draws))
+    result.seconds = time.perf_counter() - t0
+    return result
+
+
+def _parse_threshold(text: str) -> Tuple[str, float]:
+    key, _, value = text.partition("=")
+    try:
+        return key.strip(), float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ambang harus berbentuk output=nilai, mis. flood_val=60: '{text}'")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Propagasi ketidakpastian input ke output engine (Monte Carlo).")
+    parser.add_argument("inputs", type=float, nargs="+", help="nilai pembacaan, mis. CR WL DU")
+    parser.add_argument("--noise", nargs="+", required=True,
+                        help="model noise per input: none | normal:s | uniform:s | lognormal:s (s%% = relatif)")
+    parser.add_argument("--samples", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bins", type=int, default=2000)
+    parser.add_argument("--level", type=float, default=0.9, help="tingkat pita kepercayaan (bawaan 0.9)")
+    parser.add_argument("--threshold", type=_parse_threshold, action="append", default=[],
+                        help="ambang tambahan output=nilai (boleh berulang), mis. flood_val=45")
+    parser.add_argument("--defuzz", choices=FuzzyFloodEngine.DEFUZZ_METHODS, default="analytic",
+                        help="bawaan analytic: centroid eksak, ~3x lebih cepat dari centroid grid")
+    parser.add_argument("--profile", choices=list(FuzzyFloodEngine.PROFILES), default=None)
+    args = parser.parse_args()
+
+    try:
+        noise = [NoiseModel.parse(s) for s in args.noise]
+        engine = FuzzyFloodEngine(defuzz=args.defuzz, profile=args.profile)
+        thresholds = {k: list(v) for k, v in DEFAULT_THRESHOLDS.items()}
+        for key, value in args.threshold:
+            thresholds.setdefault(key, []).append(value)
+        result = propagate(engine, args.inputs, noise, args.samples, args.seed, bins=args.bins,
+                           thresholds=thresholds)
+    except ValueError as e:
+        parser.error(str(e))
+
+    report = result.to_dict(args.level)
+    print(f"Input: {report['inputs']}, noise: {' '.join(report['noise'])}")
+    print(f"Sampel: {report['samples']:,} dalam {report['seconds']:.2f} s "
+          f"({report['samples'] / max(report['seconds'], 1e-9):,.0f} sampel/detik)")
+    for key, r in report["outputs"].items():
+        if r["mean"] is None:
+            print(f"\n{key}: tidak ada sampel dengan rule aktif")
+            continue
+        lo, hi = r["band"]
+        print(f"\n{key}: rata2 {r['mean']:.3f}, simpangan baku {r['std']:.3f}, median {r['p50']:.3f}, "
+              f"pita {args.level:.0%} [{lo:.3f}, {hi:.3f}], tanpa rule aktif {r['undefined_fraction']:.2%}")
+        for t, p in r["exceedance"].items():
+            print(f"  P({key} >= {t:g}) = {p:.4f}")
+
+
+if __name__ == "__main__":
+    main()